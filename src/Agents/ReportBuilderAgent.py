@@ -1,89 +1,218 @@
 import os
 import json
-from openai import OpenAI
+import threading
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from tavily import TavilyClient
+
+from Agents.model_router import get_router
+from Agents.base_agent import _json_validator
+from Agents.json_repair import parse_json_lenient
+from Agents.output_schema import from_example
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Template
-ReportTemplatePath = "./util/ReportTemplate.json"
+# Template, resolved from the repository root so it does not depend on the working directory
+ReportTemplatePath = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "utils", "ReportTemplate.json"
+))
+
+# Which parts of the analysis report each detailed_results category is written from.
+# Categories not listed here get every input.
+SECTION_INPUTS = {
+    "Idea and Market": ["market_insights", "competitor_research"],
+    "Technology": ["competitor_research", "document_validation"],
+    "Financials": ["market_insights", "document_validation", "validation_summary"],
+}
+
+_template_cache: dict[str, dict] = {}
+_template_lock = threading.Lock()
+
 
 class ReportBuilderAgent:
     """
      Our Agent that summarizes the found results and puts it into a report form.
+
+     Every detailed_results category of the template is written by its own LLM call,
+     concurrently and from only the inputs it needs; the overall grade and recommendation
+     are then derived from the finished categories.
     """
 
-    def __init__(self, model="openrouter/sonoma-sky-alpha", site_url=None, site_name=None):
+    def __init__(self, model="openrouter/sonoma-sky-alpha", site_url=None, site_name=None, max_workers: int = 4):
         openrouter_api_key = os.getenv("API_KEY")
         if not openrouter_api_key:
             raise ValueError("OpenRouter API key not found in .env file.")
 
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=openrouter_api_key,
-        )
+        self.router = get_router()
+        self.api_key = openrouter_api_key
         self.model = model
+        self.max_workers = max_workers
         self.extra_headers = {}
         if site_url: self.extra_headers["HTTP-Referer"] = site_url
         if site_name: self.extra_headers["X-Title"] = site_name
 
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_api_key:
-            raise ValueError("Tavily API key not found in .env file.")
-        self.tavily_client = TavilyClient(api_key=tavily_api_key)
-
-    def _send_llm_request(self, messages):
-        """A standardized way to call the LLM and parse JSON."""
+    def _send_llm_request(self, messages, schema: dict | None = None, max_tokens: int = 1000):
+        """
+        A standardized way to call the LLM and parse (and if needed repair) JSON in the given layout.
+        Answers missing the layout's keys are retried by the router like BaseAgent's, in JSON mode
+        and then on the next route.
+        """
+        response = None
         try:
-            response = self.client.chat.completions.create(
+            response = self.router.complete(
+                "ReportBuilderAgent",
+                messages,
+                default_model=self.model,
+                api_key=self.api_key,
+                max_output_tokens=max_tokens,
+                validate=_json_validator(schema),
+                schema=schema,
                 extra_headers=self.extra_headers,
-                model=self.model,
-                messages=messages,
                 response_format={"type": "json_object"}
             ).choices[0].message.content
-            return json.loads(response)
-        except (json.JSONDecodeError, TypeError) as e:
-            print(f"Error decoding LLM response: {e}\nRaw response: {response}")
+            parsed, _ = parse_json_lenient(response)
+            if not isinstance(parsed, dict):
+                raise TypeError("Response is not a JSON object")
+            return parsed
+        except TypeError as e:
+            logger.warning("Error decoding LLM response: %s", e)
+            logger.debug("Raw response: %s", response)
             return None
         except Exception as e:
-            print(f"An unexpected error occurred during LLM request: {e}")
+            logger.warning("An unexpected error occurred during LLM request: %s", e)
             return None
 
+    # --- INPUTS ---
+
+    @staticmethod
+    def _compact_validation(pages: list) -> list:
+        """Reduces page reports to their claim verdicts, which is all the report sections need."""
+        compact = []
+        for page in pages or []:
+            results = (page.get("validation_results") or {}).get("validation_results") or []
+            verdicts = [
+                {"claim": r.get("claim"), "conclusion": r.get("conclusion")}
+                for r in results if isinstance(r, dict)
+            ]
+            if verdicts:
+                compact.append({"page": page.get("page_number"), "verdicts": verdicts})
+        return compact
+
+    def _section_inputs(self, results, category: str):
+        """Selects the parts of the results a category needs; unstructured results are passed through."""
+        if not isinstance(results, dict):
+            return results
+        keys = SECTION_INPUTS.get(category) or list(results.keys())
+        inputs = {}
+        for key in keys:
+            if results.get(key) is None:
+                continue
+            inputs[key] = self._compact_validation(results[key]) if key == "document_validation" else results[key]
+        return inputs or results
+
     # --- AGENT IMPLEMENTATIONS ---
 
-    def combine_results(self, results: list):
-        print("Agent [Combiner]: Putting results together.")
+    def _write_category(self, results, category_template: dict) -> dict:
+        category = category_template["category"]
+        logger.info("Agent [Combiner]: Writing section '%s'.", category)
+        layout = {k: category_template[k] for k in ("score_percent", "reasoning_bullets", "explanation")}
         messages = [
             {"role": "system",
              "content": "You are an professional investor bot used in the process of evaluating startups. It is critical that you work precise and fact based."},
-            {"role": "user", "content": f"Summarize the provided results from your collegues into a pdf using the provided layout\n\n-"
+            {"role": "user", "content": f"Assess the startup in the category '{category}' from the provided results "
+                                        f"of your collegues. Answer with a JSON object using the provided layout.\n\n-"
                                         f"RESULTS"
-                                        f"--\n{results}\n---"
+                                        f"--\n{json.dumps(self._section_inputs(results, category), ensure_ascii=False)}\n---"
                                         f"LAYOUT"
-                                        f"--\n{self.load_template(ReportTemplatePath)}\n---"
+                                        f"--\n{json.dumps(layout)}\n---"
              }
-
         ]
-        return self._send_llm_request(messages)
-
-    def create_report_file(self, resultText):
-        print("Agent [Reporter]: Creating report file.")
-        return
+        response = self._send_llm_request(messages, schema=from_example(layout), max_tokens=800) or {}
+        # Missing keys stay empty rather than falling back to the template's example values
+        section = dict(category_template, **{k: response.get(k) for k in layout})
+        missing = [k for k in layout if response.get(k) is None]
+        if not response:
+            section.update({"score_percent": None, "reasoning_bullets": [], "explanation": "Section could not be generated."})
+        elif missing:
+            logger.warning("Agent [Combiner]: Section '%s' is missing %s.", category, ", ".join(missing))
+        return section
+
+    def _write_overview(self, results, sections: list[dict], overview_template: dict) -> dict:
+        logger.info("Agent [Combiner]: Writing overall assessment.")
+        summary = results.get("validation_summary") if isinstance(results, dict) else None
+        messages = [
+            {"role": "system",
+             "content": "You are an professional investor bot used in the process of evaluating startups. It is critical that you work precise and fact based."},
+            {"role": "user", "content": f"Derive the overall assessment of the startup from the category results below. "
+                                        f"Answer with a JSON object using the provided layout.\n\n-"
+                                        f"CATEGORIES"
+                                        f"--\n{json.dumps(sections, ensure_ascii=False)}\n---"
+                                        f"VALIDATION SUMMARY"
+                                        f"--\n{json.dumps(summary)}\n---"
+                                        f"LAYOUT"
+                                        f"--\n{json.dumps(overview_template)}\n---"
+             }
+        ]
+        response = self._send_llm_request(messages, schema=from_example(overview_template), max_tokens=600) or {}
+        # Missing keys stay empty rather than falling back to the template's example values
+        return {k: response.get(k) for k in overview_template}
+
+    def combine_results(self, results):
+        """Builds the report in the template's layout, one concurrent LLM call per category."""
+        logger.info("Agent [Combiner]: Putting results together.")
+        template = self.load_template(ReportTemplatePath)
+        if template is None:
+            return None
+        layout = template["analysis_result"]
+        overview_template = {k: v for k, v in layout.items() if k != "detailed_results"}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            sections = list(pool.map(lambda c: self._write_category(results, c), layout["detailed_results"]))
+        overview = self._write_overview(results, sections, overview_template)
+        return {"analysis_result": {**overview, "detailed_results": sections}}
+
+    def create_report_file(self, resultText, file_path: str | None = None) -> str | None:
+        """Streams the assembled report to disk (atomically, via a temp file) and returns its path."""
+        logger.info("Agent [Reporter]: Creating report file.")
+        if resultText is None:
+            return None
+        if file_path is None:
+            name = str((resultText.get("analysis_result") or {}).get("startup_name") or "startup") \
+                if isinstance(resultText, dict) else "startup"
+            safe_name = "".join(ch if ch.isalnum() else "_" for ch in name).strip("_") or "startup"
+            file_path = os.path.join("reports", f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_summary.json")
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(resultText):
+                    f.write(chunk)
+            os.replace(tmp_path, file_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Error: Der Bericht konnte nicht geschrieben werden: %s", e)
+            return None
+        return file_path
 
     def load_template(self, file_path):
-        """Lädt eine JSON-Datei und gibt deren Inhalt zurück."""
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+        """Lädt eine JSON-Datei (einmal pro Prozess) und gibt deren Inhalt zurück."""
+        with _template_lock:
+            if file_path in _template_cache:
+                return _template_cache[file_path]
+            try:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                logger.warning("Error: Die Datei %s wurde nicht gefunden.", file_path)
+                return None
+            except json.JSONDecodeError:
+                logger.warning("Error: Die Datei %s enthält kein gültiges JSON.", file_path)
+                return None
+            _template_cache[file_path] = data
             return data
-        except FileNotFoundError:
-            print(f"Error: Die Datei {file_path} wurde nicht gefunden.")
-            return None
-        except json.JSONDecodeError:
-            print(f"Error: Die Datei {file_path} enthält kein gültiges JSON.")
-            return None
 
 
 
@@ -101,5 +230,6 @@ if __name__ == '__main__':
     print("\n--- FINAL COMPREHENSIVE REPORT ---")
     if final_analysis:
         print(json.dumps(final_analysis, indent=2))
+        print(f"Saved to: {agent.create_report_file(final_analysis)}")
     else:
-        print("The analysis could not be completed.")
\ No newline at end of file
+        print("The analysis could not be completed.")
@@ -1,32 +1,151 @@
 # Agents/base_agent.py
 import json
-from openai import OpenAI
+import logging
+from contextlib import closing
+
+from Agents.model_router import get_router
+from Agents.json_stream import IncrementalJsonArrayParser
+from Agents.json_repair import parse_json_lenient
+from Agents.output_schema import missing_keys
+from Agents.rate_limiter import RateLimitedError
+from Agents.result_cache import get_cache, content_key
+
+logger = logging.getLogger(__name__)
+
+def _json_validator(schema: dict | None):
+    """Accepts a response whose content parses as JSON (after local repair) and has the schema's top-level keys."""
+    def validate(response) -> bool:
+        try:
+            value, _ = parse_json_lenient(response.choices[0].message.content)
+        except (TypeError, AttributeError, IndexError):
+            return False
+        return isinstance(value, (dict, list)) and not missing_keys(schema, value)
+    return validate
 
 class BaseAgent:
-    """A base class for Agents that use an LLM, providing a shared client."""
+    """
+    A base class for Agents that use an LLM, routed per agent through the shared model router.
+
+    Subclasses declare the JSON Schema of their answer (output_schema, built with
+    Agents.output_schema) and a cap on its length (max_output_tokens). The schema is
+    sent as a strict structured-output request where the route supports it.
+    """
+    output_schema: dict | None = None
+    max_output_tokens: int = 1000
+
     def __init__(self, model: str, api_key: str, site_url: str = None, site_name: str = None):
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.router = get_router()
         self.model = model
+        self.api_key = api_key
+        self.agent_name = type(self).__name__
         self.extra_headers = {}
         if site_url: self.extra_headers["HTTP-Referer"] = site_url
         if site_name: self.extra_headers["X-Title"] = site_name
 
-    def _send_llm_request(self, messages: list[dict]) -> dict | None:
-        """Sends a request to the LLM and returns a parsed JSON object."""
+    def _cache_key(self, messages: list[dict]) -> str:
+        return content_key(self.agent_name, self.model, messages)
+
+    def _send_llm_request(self, messages: list[dict], usage_callback=None,
+                          schema: dict | None = None, max_tokens: int | None = None) -> dict | None:
+        """
+        Sends a request to the LLM and returns a parsed JSON object.
+        schema and max_tokens override the agent's output_schema and max_output_tokens for this call.
+        Truncated output, trailing commas and code fences are repaired locally before a
+        response counts as failed. If given, usage_callback receives the response's token usage.
+        With the shared caches enabled, identical requests are answered from the "llm" cache.
+        Raises RateLimitedError when the provider is still throttling after the limiter's retries,
+        so callers can tell throttling apart from an unusable answer (None).
+        """
+        schema = schema or self.output_schema
+        cache = get_cache("llm")
+        if cache is not None:
+            cached = cache.get(self._cache_key(messages))
+            if cached is not None:
+                return cached
+        response_content = None
         try:
-            response_content = self.client.chat.completions.create(
+            response = self.router.complete(
+                self.agent_name,
+                messages,
+                default_model=self.model,
+                api_key=self.api_key,
+                max_output_tokens=max_tokens or self.max_output_tokens,
+                validate=_json_validator(schema),
+                schema=schema,
                 extra_headers=self.extra_headers,
-                model=self.model,
-                messages=messages,
                 response_format={"type": "json_object"}
-            ).choices[0].message.content
-            return json.loads(response_content)
+            )
+            if usage_callback and response.usage:
+                usage_callback(response.usage)
+            response_content = response.choices[0].message.content
+            parsed, repaired = parse_json_lenient(response_content)
+            if parsed is None:
+                raise TypeError("Response is not valid JSON")
+            if repaired:
+                logger.warning("[%s] Repaired malformed JSON response (finish reason: %s)", self.agent_name,
+                               response.choices[0].finish_reason)
+            if cache is not None:
+                cache.set(self._cache_key(messages), parsed)
+            return parsed
         except (json.JSONDecodeError, TypeError) as e:
-            print(f"Error decoding LLM response: {e}\nRaw response: {response_content}")
+            logger.warning("Error decoding LLM response: %s", e)
+            logger.debug("Raw response: %s", response_content)
             return None
+        except RateLimitedError:
+            raise
         except Exception as e:
-            print(f"An unexpected error occurred during LLM request: {e}")
+            logger.warning("An unexpected error occurred during LLM request: %s", e)
             return None
+
+    def _stream_llm_list(self, messages: list[dict], key: str):
+        """
+        Streams the LLM response and yields the elements of the JSON list under `key`
+        as soon as each one is complete. Falls back to a regular request if streaming fails
+        before anything was produced.
+        """
+        cache = get_cache("llm")
+        if cache is not None:
+            cached = cache.get(self._cache_key(messages))
+            if isinstance(cached, dict):
+                yield from cached.get(key, [])
+                return
+
+        parser = IncrementalJsonArrayParser(key)
+        items = []
+        try:
+            with closing(self.router.stream(
+                self.agent_name,
+                messages,
+                default_model=self.model,
+                api_key=self.api_key,
+                max_output_tokens=self.max_output_tokens,
+                schema=self.output_schema,
+                extra_headers=self.extra_headers,
+                response_format={"type": "json_object"}
+            )) as deltas:
+                for delta in deltas:
+                    for item in parser.feed(delta):
+                        items.append(item)
+                        yield item
+                    if parser.done:
+                        break
+        except Exception as e:
+            logger.warning("Streaming LLM request failed after %s item(s): %s", len(items), e)
+            if items:
+                return
+            response = self._send_llm_request(messages)
+            yield from (response.get(key, []) if response else [])
+            return
+
+        if parser.found:
+            if cache is not None and parser.done:
+                cache.set(self._cache_key(messages), {key: items})
+            return
+
+        # The model answered, but not in the expected shape; salvage it if it is (repairable) JSON
+        response, _ = parse_json_lenient(parser.text)
+        if isinstance(response, dict):
+            yield from response.get(key, [])
+        elif response is None:
+            logger.warning("Error decoding streamed LLM response.")
+            logger.debug("Raw response: %s", parser.text)
@@ -0,0 +1,155 @@
+# src/Agents/content_cleaner.py
+import os
+import re
+import random
+import hashlib
+
+# Short blocks matching these are navigation, consent banners, footers and share widgets.
+BOILERPLATE_RE = re.compile(
+    r"cookie|accept all|reject all|consent|privacy policy|terms of (use|service)|all rights reserved|"
+    r"©|subscribe|newsletter|sign in|sign up|log ?in|create an account|skip to (main )?content|"
+    r"follow us|share (this|on)|read more|related articles|advertisement|back to top|main menu",
+    re.IGNORECASE,
+)
+MARKDOWN_LINK_RE = re.compile(r"!?\[[^\]]*\]\([^)]*\)|https?://\S+")
+WORD_RE = re.compile(r"\w+")
+
+DEFAULT_MAX_CHARS_PER_SOURCE = int(os.getenv("SOURCE_CHAR_BUDGET", 8000))
+
+
+class ContentCleaner:
+    """
+    Local cleaning stage for search results before they become LLM context.
+
+    Removes boilerplate blocks, drops paragraphs that are near-duplicates of ones
+    already kept (MinHash/LSH over word shingles to find candidates, exact Jaccard to confirm),
+    and caps every source at a character budget, cutting at block boundaries.
+    A block only counts as a near-duplicate if all of its numbers also appear in the
+    block it matched, so differing statistics are never merged away.
+    One instance is meant to be used for one consolidated context.
+    """
+
+    def __init__(self, max_chars_per_source: int = DEFAULT_MAX_CHARS_PER_SOURCE,
+                 similarity_threshold: float = 0.7, shingle_size: int = 3,
+                 num_perm: int = 32, bands: int = 16, max_bucket_size: int = 64):
+        self.max_chars_per_source = max_chars_per_source
+        self.similarity_threshold = similarity_threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket_size = max_bucket_size
+        rng = random.Random(1234)
+        self._masks = [rng.getrandbits(64) for _ in range(num_perm)]
+        self._buckets: list[dict] = [{} for _ in range(bands)]
+        self._entries: list[tuple[set, frozenset]] = []
+        self._exact: set[bytes] = set()
+        self.stats = {"chars_in": 0, "chars_out": 0, "boilerplate": 0, "duplicates": 0, "truncated": 0}
+
+    # --- BLOCK LEVEL ---
+
+    @staticmethod
+    def _split_blocks(text: str) -> list[str]:
+        blocks = []
+        for block in re.split(r"\n\s*\n", text):
+            block = block.strip()
+            if not block:
+                continue
+            # Sources without blank lines arrive as one huge block; fall back to lines
+            if len(block) > 1500 and "\n" in block:
+                blocks.extend(line.strip() for line in block.split("\n") if line.strip())
+            else:
+                blocks.append(block)
+        return blocks
+
+    @staticmethod
+    def _is_boilerplate(block: str) -> bool:
+        words = WORD_RE.findall(block)
+        link_chars = sum(len(m) for m in MARKDOWN_LINK_RE.findall(block))
+        if link_chars > 0.5 * len(block):
+            return True
+        has_digit = any(ch.isdigit() for ch in block)
+        if len(words) < 5 and not has_digit:
+            return True
+        return len(words) < 40 and BOILERPLATE_RE.search(block) is not None
+
+    # --- NEAR-DUPLICATES ---
+
+    def _shingles(self, words: list[str]) -> set[str]:
+        k = self.shingle_size
+        return {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+
+    def _signature(self, shingles: set[str]) -> list[int]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+        return [min(h ^ mask for h in hashes) for mask in self._masks]
+
+    def _fingerprint(self, block: str) -> dict:
+        """Exact hash, shingles, numbers and LSH bands of a block (the last three only for longer blocks)."""
+        words = [w.lower() for w in WORD_RE.findall(block)]
+        fingerprint = {"exact": hashlib.blake2b(" ".join(words).encode(), digest_size=16).digest()}
+        if len(words) >= self.shingle_size * 2:
+            shingles = self._shingles(words)
+            signature = self._signature(shingles)
+            fingerprint.update(
+                shingles=shingles,
+                numbers=frozenset(w for w in words if any(ch.isdigit() for ch in w)),
+                bands=[tuple(signature[b * self.rows:(b + 1) * self.rows]) for b in range(self.bands)],
+            )
+        return fingerprint
+
+    def _is_duplicate(self, fingerprint: dict) -> bool:
+        if fingerprint["exact"] in self._exact:
+            return True
+        if "shingles" not in fingerprint:
+            return False
+        shingles, numbers = fingerprint["shingles"], fingerprint["numbers"]
+        candidates = set()
+        for bucket, band in zip(self._buckets, fingerprint["bands"]):
+            candidates.update(bucket.get(band, ()))
+        for entry_id in candidates:
+            other, other_numbers = self._entries[entry_id]
+            jaccard = len(shingles & other) / len(shingles | other)
+            if jaccard >= self.similarity_threshold and numbers <= other_numbers:
+                return True
+        return False
+
+    def _remember(self, fingerprint: dict):
+        """Registers a block that was kept, so later copies of it are dropped."""
+        self._exact.add(fingerprint["exact"])
+        if "shingles" not in fingerprint:
+            return
+        entry_id = len(self._entries)
+        self._entries.append((fingerprint["shingles"], fingerprint["numbers"]))
+        for bucket, band in zip(self._buckets, fingerprint["bands"]):
+            ids = bucket.setdefault(band, [])
+            ids.append(entry_id)
+            if len(ids) > self.max_bucket_size:
+                del ids[0]
+
+    # --- PUBLIC ---
+
+    def clean(self, text: str) -> str:
+        """Returns the cleaned, de-duplicated and budget-capped text of one source."""
+        self.stats["chars_in"] += len(text)
+        kept, size = [], 0
+        for block in self._split_blocks(text):
+            if self._is_boilerplate(block):
+                self.stats["boilerplate"] += 1
+                continue
+            fingerprint = self._fingerprint(block)
+            if self._is_duplicate(fingerprint):
+                self.stats["duplicates"] += 1
+                continue
+            if size + len(block) > self.max_chars_per_source:
+                # A block cut by the cap is not remembered, so a later source can still contribute it in full
+                remaining = self.max_chars_per_source - size
+                if remaining > 200:
+                    kept.append(block[:remaining].rsplit(" ", 1)[0] + " ...")
+                    size = self.max_chars_per_source
+                self.stats["truncated"] += 1
+                break
+            self._remember(fingerprint)
+            kept.append(block)
+            size += len(block) + 2
+        cleaned = "\n\n".join(kept)
+        self.stats["chars_out"] += len(cleaned)
+        return cleaned
@@ -1,42 +1,167 @@
 # src/document_agents/document_conclusion_agent.py
-import fitz  # PyMuPDF
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import obj, string
+from Agents.result_cache import ResultCache, content_key
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the prompts change, so cached summaries from older prompts are not reused
+PROMPT_VERSION = 1
+
 
 class DocumentConclusionAgent(BaseAgent):
-    """Generates a conclusion based on the entire PDF document."""
+    """
+    Generates a conclusion based on the entire PDF document.
+
+    Short documents are concluded in a single call. Longer ones go through map-reduce:
+    pages are read one at a time and grouped into page-aligned chunks, each chunk is
+    summarized as soon as it is complete (concurrently with reading the rest), and the
+    chunk summaries are merged in rounds until they fit into one final call.
+    Every summary is cached by a hash of its input, so a re-run only redoes changed chunks.
+    The keys never go stale, so this cache is on by default, independent of AGENT_CACHE;
+    use_cache=False (or CONCLUSION_CACHE=0) turns it off.
+    """
 
-    def _read_whole_pdf(self, pdf_path: str) -> str:
-        """Extracts all text from the PDF."""
+    def __init__(self, model: str, api_key: str, site_url: str = None, site_name: str = None,
+                 chunk_chars: int = 24000, single_pass_chars: int = 60000,
+                 reduce_fan_in: int = 8, max_workers: int = int(os.getenv("CONCLUSION_WORKERS", 6)),
+                 cache: ResultCache | None = None, use_cache: bool | None = None):
+        super().__init__(model, api_key, site_url, site_name)
+        self.chunk_chars = chunk_chars
+        self.single_pass_chars = single_pass_chars
+        self.reduce_fan_in = reduce_fan_in
+        self.max_workers = max_workers
+        if use_cache is None:
+            use_cache = os.getenv("CONCLUSION_CACHE", "1") != "0"
+        self.cache = (cache or ResultCache("conclusion_summaries")) if use_cache else None
+
+    # --- READING ---
+
+    def _iter_pages(self, pdf_path: str):
+        """Yields (page_number, text) for every page with text, reading one page at a time."""
+        import fitz  # PyMuPDF
         doc = fitz.open(pdf_path)
-        parts = []
-        for i in range(doc.page_count):
-            page = doc.load_page(i)
-            t = page.get_text("text") or ""
-            if t.strip():
-                parts.append(t.strip())
-        doc.close()
-        return "\n\n".join(parts).strip()
+        try:
+            for i in range(doc.page_count):
+                t = (doc.load_page(i).get_text("text") or "").strip()
+                if t:
+                    yield i + 1, t
+        finally:
+            doc.close()
 
-    def conclude(self, pdf_path: str, target_words: int) -> str:
-        """Generate a conclusion from the entire PDF."""
-        print(f"Agent [Conclusion]: Reading full PDF '{pdf_path}'...")
+    def _iter_chunks(self, pdf_path: str):
+        """Groups pages into chunks of up to chunk_chars; a page is only split if it alone is too long."""
+        pages, size = [], 0
+        for page_number, text in self._iter_pages(pdf_path):
+            if pages and size + len(text) > self.chunk_chars:
+                yield self._make_chunk(pages)
+                pages, size = [], 0
+            while len(text) > self.chunk_chars:
+                yield self._make_chunk([(page_number, text[:self.chunk_chars])])
+                text = text[self.chunk_chars:]
+            pages.append((page_number, text))
+            size += len(text) + 2
+        if pages:
+            yield self._make_chunk(pages)
 
-        full_text = self._read_whole_pdf(pdf_path)
-        if not full_text:
-            print("No extractable text found in the document.")
-            return ""
+    @staticmethod
+    def _make_chunk(pages: list[tuple[int, str]]) -> dict:
+        return {
+            "first_page": pages[0][0],
+            "last_page": pages[-1][0],
+            "text": "\n\n".join(f"[Page {n}]\n{t}" for n, t in pages)
+        }
+
+    # --- LLM STEPS ---
 
+    def _cached_request(self, kind: str, key_parts: tuple, messages: list[dict], field: str,
+                        target_words: int) -> str:
+        key = content_key(PROMPT_VERSION, self.model, kind, *key_parts)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        # About two tokens per requested word leaves room for the JSON wrapper and some overshoot
+        response = self._send_llm_request(messages, schema=obj({field: string()}), max_tokens=2 * target_words + 100)
+        text = str(response.get(field) or "").strip() if isinstance(response, dict) else ""
+        if text and self.cache is not None:
+            self.cache.set(key, text)
+        return text
+
+    def _summarize_chunk(self, chunk: dict, target_words: int) -> str:
+        logger.info("Agent [Conclusion]: Summarizing pages %s-%s...", chunk['first_page'], chunk['last_page'])
+        messages = [
+            {"role": "system", "content": (
+                f"You summarize one part of a longer document in about {target_words} words. "
+                "Keep every concrete figure, claim, name and date; drop filler and repetition. "
+                'Output a JSON object: {"summary": "<summary>"}'
+            )},
+            {"role": "user", "content": chunk["text"]}
+        ]
+        return self._cached_request("chunk", (target_words, chunk["text"]), messages, "summary", target_words)
+
+    def _merge_summaries(self, summaries: list[str], target_words: int) -> str:
+        messages = [
+            {"role": "system", "content": (
+                f"You merge consecutive partial summaries of one document into a single summary of about "
+                f"{target_words} words, in document order. Keep the most important figures and claims. "
+                'Output a JSON object: {"summary": "<summary>"}'
+            )},
+            {"role": "user", "content": "\n\n".join(f"[Part {i + 1}]\n{s}" for i, s in enumerate(summaries))}
+        ]
+        return self._cached_request("merge", (target_words, *summaries), messages, "summary", target_words)
+
+    def _final_conclusion(self, text: str, target_words: int) -> str:
         system_prompt = (
             f"You are a concise summarizer. Write a clear CONCLUSION of about {target_words} words "
             "based on the following document. Summarize the purpose, main findings, and overall takeaway. "
-            "Output plain text only."
+            'Output a JSON object: {"conclusion": "<plain text conclusion>"}'
         )
-
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": full_text[:120000]}  # truncate if doc is huge
+            {"role": "user", "content": text}
         ]
+        return self._cached_request("conclusion", (target_words, text), messages, "conclusion", target_words)
+
+    # --- PUBLIC ---
+
+    def conclude(self, pdf_path: str, target_words: int) -> str:
+        """Generate a conclusion from the entire PDF."""
+        logger.info("Agent [Conclusion]: Reading '%s' page by page...", pdf_path)
+        chunk_words = max(150, target_words)
 
-        response = self._send_llm_request(messages)
-        return str(response).strip() if response else ""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Map: once the document is known to be long, chunks are summarized while later pages are still read
+            chunks, futures, total_chars = [], [], 0
+            for chunk in self._iter_chunks(pdf_path):
+                chunks.append(chunk)
+                total_chars += len(chunk["text"])
+                if total_chars > self.single_pass_chars:
+                    while len(futures) < len(chunks):
+                        futures.append(pool.submit(self._summarize_chunk, chunks[len(futures)], chunk_words))
+
+            if not chunks:
+                logger.info("No extractable text found in the document.")
+                return ""
+
+            if not futures:
+                # Short enough to conclude in a single call
+                return self._final_conclusion("\n\n".join(c["text"] for c in chunks), target_words)
+
+            summaries = [s for s in (f.result() for f in futures) if s]
+            logger.info("Agent [Conclusion]: Summarized %s chunk(s); reducing...", len(chunks))
+
+            # Reduce: merge groups of summaries concurrently until one round fits a single call
+            while len(summaries) > self.reduce_fan_in:
+                groups = [summaries[i:i + self.reduce_fan_in] for i in range(0, len(summaries), self.reduce_fan_in)]
+                merged = list(pool.map(lambda g: self._merge_summaries(g, chunk_words), groups))
+                summaries = [s for s in merged if s]
+
+        if not summaries:
+            return ""
+        return self._final_conclusion(
+            "\n\n".join(f"[Part {i + 1}]\n{s}" for i, s in enumerate(summaries)), target_words
+        )
@@ -0,0 +1,103 @@
+# src/Agents/evidence_store.py
+
+SOURCE_HEADER = "--- Source (URL: {url}) ---\n"
+
+
+class EvidenceRecord:
+    """One source in an EvidenceStore: its metadata and the span of its block in the store's text."""
+    __slots__ = ("url", "title", "queries", "metadata", "offset", "length", "content_offset", "content_length")
+
+    def __init__(self, url: str, title: str | None, query: str | None):
+        self.url = url
+        self.title = title
+        self.queries = [query] if query else []
+        self.metadata = {}
+        self.offset = self.length = self.content_offset = self.content_length = 0
+
+    def to_source(self) -> dict:
+        return {'title': self.title, 'url': self.url, **self.metadata}
+
+
+class EvidenceStore:
+    """
+    Search evidence kept as per-source records over one append-only list of text parts.
+
+    Every source with content is rendered as a block in the usual
+    "--- Source (URL: ...) ---" format, and its record stores the block's offsets, so
+    the full context, a single source's text or any subset of sources can be rendered
+    without rebuilding strings. The full text is only joined when it is first needed
+    and then reused until more evidence is added.
+
+    str(store) and len(store) give the rendered context and its length, so the store can
+    be passed wherever the consolidated context string used to go.
+    """
+
+    def __init__(self):
+        self.records: list[EvidenceRecord] = []
+        self._by_url: dict[str, EvidenceRecord] = {}
+        self._parts: list[str] = []
+        self._length = 0
+        self._text: str | None = None
+
+    def add(self, url: str, title: str | None, content: str | None, query: str | None = None) -> EvidenceRecord:
+        """Adds a source (once per URL; repeats only record the extra query). Empty content adds no block."""
+        record = self._by_url.get(url)
+        if record is not None:
+            if query and query not in record.queries:
+                record.queries.append(query)
+            return record
+        record = EvidenceRecord(url, title, query)
+        self._by_url[url] = record
+        self.records.append(record)
+        if content:
+            header = SOURCE_HEADER.format(url=url)
+            record.offset = self._length
+            record.content_offset = self._length + len(header)
+            record.content_length = len(content)
+            self._parts.extend((header, content, "\n\n"))
+            record.length = len(header) + len(content) + 2
+            self._length += record.length
+            self._text = None
+        return record
+
+    def annotate(self, sources: list[dict]):
+        """Merges per-source metadata (e.g. reputability scores) into the matching records."""
+        for source in sources:
+            record = self._by_url.get(source.get('url'))
+            if record is not None:
+                record.metadata.update({k: v for k, v in source.items() if k not in ('url', 'title')})
+
+    def get(self, url: str) -> EvidenceRecord | None:
+        return self._by_url.get(url)
+
+    def text(self) -> str:
+        """The full rendered context, joined once and cached."""
+        if self._text is None:
+            self._text = "".join(self._parts)
+        return self._text
+
+    def source_text(self, record: EvidenceRecord) -> str:
+        """The cleaned content of one source."""
+        return self.text()[record.content_offset:record.content_offset + record.content_length]
+
+    def select(self, predicate) -> list[EvidenceRecord]:
+        """Records with content for which predicate(record) is true."""
+        return [r for r in self.records if r.length and predicate(r)]
+
+    def render(self, records: list[EvidenceRecord]) -> str:
+        """Renders a subset of sources as context, in the order given."""
+        text = self.text()
+        return "".join(text[r.offset:r.offset + r.length] for r in records if r.length)
+
+    def sources(self) -> list[dict]:
+        """Every unique source, with or without content, as {'title', 'url', **metadata}."""
+        return [r.to_source() for r in self.records]
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
@@ -0,0 +1,160 @@
+# src/Agents/hedging.py
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies for one agent."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, pct: float, min_samples: int) -> float | None:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class HedgingPolicy:
+    """
+    Opt-in request hedging for LLM calls.
+
+    When a call has not returned by the agent's latency percentile, a duplicate is
+    sent and whichever succeeds first wins. Hedges are capped at `budget` times the
+    number of calls. The losing request cannot be aborted mid-flight by the sync
+    client, so its result is simply discarded when it arrives.
+
+    The policy wraps only the network request, inside the provider limiter's slot, so
+    queueing, Retry-After pauses and backoff never count as latency; and no hedge is
+    sent while the provider is throttling (see ProviderLimiter.throttled()). Requests run
+    on a pool per provider with room for a primary and a hedge for every call its limiter
+    admits, and the latency clock starts when the request does, not when it is queued.
+
+    Configured from env (LLM_HEDGING=1, LLM_HEDGE_PERCENTILE, LLM_HEDGE_BUDGET) or
+    from the "hedging" section of the model routing table, which may also carry
+    per-agent overrides: {"enabled": true, "agents": {"ValidationAgent": {"percentile": 90}}}.
+    """
+
+    def __init__(self, config: dict | None = None):
+        config = config or {}
+        self.enabled = bool(config.get("enabled", os.getenv("LLM_HEDGING", "0") == "1"))
+        self.percentile = float(config.get("percentile", os.getenv("LLM_HEDGE_PERCENTILE", 95)))
+        self.budget = float(config.get("budget", os.getenv("LLM_HEDGE_BUDGET", 0.05)))
+        self.min_samples = int(config.get("min_samples", 20))
+        self.agents = config.get("agents") or {}
+        self._trackers: dict[str, LatencyTracker] = {}
+        self._stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+
+    def _agent_setting(self, agent_name: str, key: str, default):
+        return (self.agents.get(agent_name) or {}).get(key, default)
+
+    def _tracker(self, agent_name: str) -> LatencyTracker:
+        with self._lock:
+            if agent_name not in self._trackers:
+                self._trackers[agent_name] = LatencyTracker()
+                self._stats[agent_name] = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+            return self._trackers[agent_name]
+
+    def _executor_for(self, limiter) -> ThreadPoolExecutor:
+        name, size = (limiter.name, 2 * limiter.concurrency.maximum) if limiter is not None else ("default", 32)
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"llm-hedge-{name}")
+                self._executors[name] = executor
+            return executor
+
+    def _take_budget(self, agent_name: str) -> bool:
+        with self._lock:
+            stats = self._stats[agent_name]
+            total_calls = sum(s["calls"] for s in self._stats.values())
+            total_hedged = sum(s["hedged"] for s in self._stats.values())
+            if total_hedged + 1 > self.budget * total_calls:
+                return False
+            stats["hedged"] += 1
+            return True
+
+    def call(self, agent_name: str, fn, limiter=None):
+        """
+        Runs fn(), hedging it once if it is slower than the agent's latency percentile.
+        limiter is the provider's ProviderLimiter, if any: it sizes the request pool, and
+        while it is throttled no hedge is sent.
+        """
+        tracker = self._tracker(agent_name)
+        with self._lock:
+            self._stats[agent_name]["calls"] += 1
+        enabled = self._agent_setting(agent_name, "enabled", self.enabled)
+        threshold = None
+        if enabled:
+            pct = self._agent_setting(agent_name, "percentile", self.percentile)
+            threshold = tracker.percentile(pct, self.min_samples)
+
+        started = time.monotonic()
+        if threshold is None:
+            result = fn()
+            tracker.add(time.monotonic() - started)
+            return result
+
+        executor = self._executor_for(limiter)
+        running = threading.Event()
+
+        def run_primary():
+            nonlocal started
+            started = time.monotonic()
+            running.set()
+            return fn()
+
+        primary = executor.submit(run_primary)
+        running.wait()
+        done, _ = wait([primary], timeout=max(0.0, threshold - (time.monotonic() - started)))
+        if done or (limiter is not None and limiter.throttled()) or not self._take_budget(agent_name):
+            result = primary.result()
+            tracker.add(time.monotonic() - started)
+            return result
+
+        logger.info("[%s] hedging request after %.1fs", agent_name, threshold)
+        hedge = executor.submit(fn)
+        pending = {primary, hedge}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                for other in pending:
+                    other.cancel()
+                if future is hedge:
+                    with self._lock:
+                        self._stats[agent_name]["hedge_wins"] += 1
+                tracker.add(time.monotonic() - started)
+                return future.result()
+        raise last_error
+
+    def stats(self) -> dict:
+        """Per-agent hedge rate and win rate."""
+        with self._lock:
+            report = {}
+            for agent_name, s in self._stats.items():
+                report[agent_name] = dict(
+                    s,
+                    hedge_rate=round(s["hedged"] / s["calls"], 3) if s["calls"] else 0.0,
+                    win_rate=round(s["hedge_wins"] / s["hedged"], 3) if s["hedged"] else 0.0,
+                )
+            return report
@@ -0,0 +1,109 @@
+# src/Agents/json_repair.py
+import re
+import json
+
+_FENCE_RE = re.compile(r"^\s*```[a-zA-Z0-9_-]*\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_code_fences(text: str) -> str:
+    """Removes a Markdown code fence (```json ... ```) around the whole text, if there is one."""
+    match = _FENCE_RE.match(text)
+    if match:
+        return match.group(1)
+    # An opening fence whose closing fence was cut off
+    stripped = text.lstrip()
+    if stripped.startswith("```"):
+        return stripped.split("\n", 1)[1] if "\n" in stripped else ""
+    return text
+
+
+def repair_json(text: str) -> str | None:
+    """
+    Rewrites common faults of model-written JSON into parseable JSON text:
+    surrounding code fences and prose, trailing commas, and output truncated
+    mid-value (the unfinished last element or member is dropped and the open
+    containers are closed). A cut-off string or number is never kept, since it may
+    read as a complete but wrong value ("$4" from "$40M"). Returns None if no JSON
+    value starts in the text.
+    """
+    text = strip_code_fences(text)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None
+
+    out: list[str] = []
+    stack: list[str] = []
+    # Positions in `out` where the value could be cut and closed, with the open containers at that point
+    cut_points: list[tuple[int, tuple]] = []
+    in_string = escaped = False
+    for ch in text[min(starts):]:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                # A complete string; the cut is only accepted if it ends a value rather than a key
+                cut_points.append((len(out), tuple(stack)))
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+            out.append(ch)
+            cut_points.append((len(out), tuple(stack)))
+            continue
+        elif ch in "}]":
+            # Trailing comma before a closing bracket
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if not stack:
+                break
+            stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+            cut_points.append((len(out), tuple(stack)))
+            continue
+        elif ch == ",":
+            cut_points.append((len(out), tuple(stack)))
+        out.append(ch)
+
+    if not stack:
+        return "".join(out)
+
+    # Truncated: close the containers at the last point where every value was complete
+    for position, open_stack in reversed(cut_points):
+        candidate = "".join(out[:position]).rstrip().rstrip(",") + "".join(_CLOSERS[c] for c in reversed(open_stack))
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def parse_json_lenient(text) -> tuple[object, bool]:
+    """
+    Parses model output as JSON, repairing it locally if needed.
+
+    Returns (value, repaired); value is None if the text cannot be parsed even after repair.
+    """
+    if not isinstance(text, str):
+        return None, False
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+    repaired = repair_json(text)
+    if repaired is None:
+        return None, False
+    try:
+        return json.loads(repaired), True
+    except json.JSONDecodeError:
+        return None, False
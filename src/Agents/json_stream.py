@@ -0,0 +1,114 @@
+# src/Agents/json_stream.py
+import json
+
+
+class IncrementalJsonArrayParser:
+    """
+    Incrementally parses streamed JSON text and returns the elements of one array
+    as soon as each element is complete.
+
+    With key=None the first top-level array is used; otherwise the array stored
+    under `key` in the top-level object, e.g. {"queries": ["a", "b"]}.
+    """
+
+    def __init__(self, key: str | None = None):
+        self.key = key
+        self.done = False
+        self.found = False
+        self._chunks = []
+        # Scanner state outside the target array
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_chars = []
+        self._key_pending = False
+        # State inside the target array
+        self._element = []
+        self._element_depth = 0
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> list:
+        """Consumes the next chunk and returns the array elements it completed."""
+        self._chunks.append(chunk)
+        completed = []
+        for ch in chunk:
+            if self.done:
+                break
+            if self.found:
+                self._feed_array_char(ch, completed)
+            else:
+                self._feed_seek_char(ch)
+        return completed
+
+    def _feed_seek_char(self, ch: str):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+                self._string_chars.append(ch)
+            elif ch == "\\":
+                self._escape = True
+                self._string_chars.append(ch)
+            elif ch == '"':
+                self._in_string = False
+                if self._depth == 1 and self.key is not None:
+                    try:
+                        self._key_pending = json.loads('"' + "".join(self._string_chars) + '"') == self.key
+                    except json.JSONDecodeError:
+                        self._key_pending = False
+            else:
+                self._string_chars.append(ch)
+            return
+        if ch == '"':
+            self._in_string = True
+            self._string_chars = []
+        elif ch == "[" and ((self.key is None and self._depth == 0) or self._key_pending):
+            self.found = True
+        elif ch in "{[":
+            self._depth += 1
+            self._key_pending = False
+        elif ch in "}]":
+            self._depth -= 1
+            self._key_pending = False
+        elif ch == ":" or ch.isspace():
+            return
+        else:
+            self._key_pending = False
+
+    def _feed_array_char(self, ch: str, completed: list):
+        element = self._element
+        if self._in_string:
+            element.append(ch)
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+            return
+        if ch == '"':
+            self._in_string = True
+            element.append(ch)
+        elif self._element_depth == 0 and ch in ",]":
+            self._emit(completed)
+            if ch == "]":
+                self.done = True
+        else:
+            if ch in "{[":
+                self._element_depth += 1
+            elif ch in "}]":
+                self._element_depth -= 1
+            element.append(ch)
+
+    def _emit(self, completed: list):
+        raw = "".join(self._element).strip()
+        self._element = []
+        if not raw:
+            return
+        try:
+            completed.append(json.loads(raw))
+        except json.JSONDecodeError:
+            pass
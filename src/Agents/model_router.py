@@ -0,0 +1,231 @@
+# src/Agents/model_router.py
+import os
+import json
+import logging
+import threading
+from contextlib import closing
+
+from Agents.rate_limiter import get_limiter, estimate_tokens, status_code
+from Agents.hedging import HedgingPolicy
+from Agents.output_schema import response_format
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "openrouter/sonoma-sky-alpha"
+
+# Endpoints are OpenAI-compatible servers. Each one gets its own client and provider limiter.
+# "structured_outputs" marks endpoints that accept json_schema response formats.
+DEFAULT_ENDPOINTS = {
+    "openrouter": {"base_url": "https://openrouter.ai/api/v1", "api_key_env": "API_KEY", "structured_outputs": True},
+    "local": {"base_url": "http://localhost:8000/v1", "api_key_env": None, "structured_outputs": False},
+}
+DEFAULT_OUTPUT_TOKENS = 1000
+
+# Classification-style steps only need a small, low-latency model.
+DEFAULT_AGENT_TIERS = {
+    "TriageAgent": "fast",
+    "DecomposerAgent": "fast",
+    "PlannerAgent": "fast",
+    "ReputabilityAgent": "fast",
+    "FusedAnalysisAgent": "fast",
+}
+
+
+class ModelRouter:
+    """
+    Routing table that picks the endpoint and model for each agent, with fallback chains.
+
+    Loaded from the JSON file named by MODEL_ROUTES_PATH, if set:
+
+        {
+            "endpoints": {"local": {"base_url": "http://localhost:11434/v1"}},
+            "tiers": {"fast": [{"endpoint": "local", "model": "qwen2.5:7b"},
+                               {"endpoint": "openrouter", "model": "openai/gpt-4o-mini"}]},
+            "agents": {"ValidationAgent": [{"endpoint": "openrouter", "model": "openrouter/sonoma-sky-alpha"}]},
+            "hedging": {"enabled": true, "percentile": 95, "budget": 0.05}
+        }
+
+    An agent entry is either a tier name or an explicit chain. Without a config,
+    every agent uses the model it was constructed with on OpenRouter, and the
+    "fast" tier uses FAST_MODEL when that env var is set.
+
+    Requests that carry an output schema ask for strict structured output on endpoints
+    with "structured_outputs"; a model that rejects it is remembered and asked for a
+    plain JSON object from then on.
+    """
+
+    def __init__(self, config: dict | None = None):
+        config = config or {}
+        self.endpoints = {name: dict(ep) for name, ep in DEFAULT_ENDPOINTS.items()}
+        # Resolved here rather than at import, so a .env loaded after importing this module applies
+        local = self.endpoints["local"]
+        local["base_url"] = os.getenv("LOCAL_LLM_BASE_URL", local["base_url"])
+        local["structured_outputs"] = os.getenv("LOCAL_LLM_STRUCTURED_OUTPUTS", "0") == "1"
+        for name, ep in (config.get("endpoints") or {}).items():
+            self.endpoints[name] = {**self.endpoints.get(name, {"api_key_env": None}), **ep}
+        self.tiers = config.get("tiers") or {}
+        self.agents = {**DEFAULT_AGENT_TIERS, **(config.get("agents") or {})}
+        self.hedging = HedgingPolicy(config.get("hedging"))
+        self._clients: dict[tuple, object] = {}
+        self._no_structured_outputs: set[tuple] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        path = os.getenv("MODEL_ROUTES_PATH")
+        if not path:
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def routes_for(self, agent_name: str, default_model: str = DEFAULT_MODEL) -> list[dict]:
+        """Returns the ordered fallback chain of {"endpoint", "model"} for an agent."""
+        entry = self.agents.get(agent_name, "default")
+        if isinstance(entry, list):
+            return entry
+        if entry in self.tiers:
+            return self.tiers[entry]
+        if entry == "fast" and os.getenv("FAST_MODEL"):
+            return [{"endpoint": "openrouter", "model": os.getenv("FAST_MODEL")},
+                    {"endpoint": "openrouter", "model": default_model}]
+        return [{"endpoint": "openrouter", "model": default_model}]
+
+    def client_for(self, endpoint: str, api_key: str | None = None):
+        """Returns a shared OpenAI client per endpoint (and key); retries are left to the provider limiter."""
+        from openai import OpenAI
+        ep = self.endpoints[endpoint]
+        key = (ep.get("api_key_env") and os.getenv(ep["api_key_env"])) or api_key or "not-needed"
+        with self._lock:
+            client = self._clients.get((endpoint, key))
+            if client is None:
+                client = OpenAI(base_url=ep["base_url"], api_key=key, max_retries=0)
+                self._clients[(endpoint, key)] = client
+            return client
+
+    def _formats(self, endpoint: str, model: str, schema: dict | None, schema_name: str) -> list[dict | None]:
+        """Response formats to try on a route, best first (None keeps the caller's own response_format)."""
+        if schema is None:
+            return [None]
+        formats = [{"type": "json_object"}]
+        if self.endpoints[endpoint].get("structured_outputs") and (endpoint, model) not in self._no_structured_outputs:
+            formats.insert(0, response_format(schema_name, schema))
+        return formats
+
+    def _structured_output_rejected(self, endpoint: str, model: str, fmt: dict | None, error: Exception) -> bool:
+        """Remembers (and reports) a route that refused a json_schema response format."""
+        if not fmt or fmt.get("type") != "json_schema" or status_code(error) not in (400, 422):
+            return False
+        with self._lock:
+            self._no_structured_outputs.add((endpoint, model))
+        logger.warning("%s/%s rejected structured output, falling back to JSON mode: %s", endpoint, model, error)
+        return True
+
+    @staticmethod
+    def _request_params(params: dict, fmt: dict | None, max_output_tokens: int | None) -> dict:
+        request = dict(params)
+        if fmt is not None:
+            request["response_format"] = fmt
+        if max_output_tokens is not None:
+            request.setdefault("max_tokens", max_output_tokens)
+        return request
+
+    def complete(self, agent_name: str, messages: list[dict], default_model: str = DEFAULT_MODEL,
+                 api_key: str | None = None, max_output_tokens: int | None = None, validate=None,
+                 schema: dict | None = None, schema_name: str | None = None, **params):
+        """
+        Sends a chat completion along the agent's fallback chain, hedged if enabled.
+
+        The next route is tried when a route raises (after its limiter's retries) or when
+        `validate(response)` returns False; a structured-output answer that fails validation
+        is first retried on the same route in JSON mode. Returns the first accepted response.
+        With a schema, strict structured output is requested where the route supports it.
+        max_output_tokens caps the completion (as max_tokens) and sizes the token reservation.
+        """
+        last_error = None
+        for route in self.routes_for(agent_name, default_model):
+            endpoint = route["endpoint"]
+            client = self.client_for(endpoint, api_key)
+            limiter = get_limiter(endpoint)
+            for fmt in self._formats(endpoint, route["model"], schema, schema_name or agent_name):
+                request = self._request_params(params, fmt, max_output_tokens)
+                try:
+                    # Hedging sits inside the limiter, so it only times (and duplicates) the network request
+                    response = limiter.call(
+                        lambda client=client, model=route["model"], limiter=limiter, request=request: self.hedging.call(
+                            agent_name,
+                            lambda: client.chat.completions.create(model=model, messages=messages, **request),
+                            limiter=limiter,
+                        ),
+                        estimated_tokens=estimate_tokens(messages, max_output_tokens or DEFAULT_OUTPUT_TOKENS),
+                        usage_tokens=lambda r: r.usage.total_tokens if r.usage else None,
+                    )
+                except Exception as e:
+                    if self._structured_output_rejected(endpoint, route["model"], fmt, e):
+                        continue
+                    logger.warning("[%s] %s/%s failed: %s", agent_name, endpoint, route['model'], e)
+                    last_error = e
+                    break
+                if validate is not None and not validate(response):
+                    logger.warning("[%s] %s/%s returned an unusable response", agent_name, endpoint, route['model'])
+                    last_error = ValueError("Unusable response")
+                    if fmt and fmt.get("type") == "json_schema":
+                        # Ask the same route again in plain JSON mode before moving down the chain
+                        continue
+                    break
+                return response
+        raise last_error or RuntimeError(f"No routes configured for {agent_name}")
+
+    def stream(self, agent_name: str, messages: list[dict], default_model: str = DEFAULT_MODEL,
+               api_key: str | None = None, max_output_tokens: int | None = None,
+               schema: dict | None = None, schema_name: str | None = None, **params):
+        """
+        Streams a chat completion along the agent's fallback chain, yielding content deltas.
+
+        A route is only abandoned for the next one if it fails before its first delta.
+        Streams are not hedged. Close the generator (or drain it) to free the limiter's slot.
+        """
+        last_error = None
+        for route in self.routes_for(agent_name, default_model):
+            endpoint = route["endpoint"]
+            client = self.client_for(endpoint, api_key)
+            for fmt in self._formats(endpoint, route["model"], schema, schema_name or agent_name):
+                request = self._request_params(params, fmt, max_output_tokens)
+                started = False
+                try:
+                    # The limiter holds the concurrency slot until the stream is drained or closed
+                    with closing(get_limiter(endpoint).stream(
+                        lambda: client.chat.completions.create(
+                            model=route["model"], messages=messages, stream=True, **request
+                        ),
+                        estimated_tokens=estimate_tokens(messages, max_output_tokens or DEFAULT_OUTPUT_TOKENS),
+                    )) as stream:
+                        for chunk in stream:
+                            if not chunk.choices:
+                                continue
+                            delta = chunk.choices[0].delta.content
+                            if delta:
+                                started = True
+                                yield delta
+                    return
+                except Exception as e:
+                    if started:
+                        raise
+                    if self._structured_output_rejected(endpoint, route["model"], fmt, e):
+                        continue
+                    logger.warning("[%s] streaming from %s/%s failed: %s", agent_name, endpoint, route['model'], e)
+                    last_error = e
+                    break
+        raise last_error or RuntimeError(f"No routes configured for {agent_name}")
+
+
+_router: ModelRouter | None = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """Returns the process-wide router, loading the routing table on first use."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter.from_env()
+        return _router
@@ -0,0 +1,79 @@
+# src/Agents/output_schema.py
+"""
+Small builders for the JSON Schemas agents declare for their output.
+
+Schemas are written in the strict subset that providers' structured-output modes accept:
+every object lists all of its properties as required and allows no others. A field that
+may be missing is declared nullable instead.
+"""
+
+
+def string(description: str | None = None) -> dict:
+    return {"type": "string", **({"description": description} if description else {})}
+
+
+def number() -> dict:
+    return {"type": "number"}
+
+
+def integer() -> dict:
+    return {"type": "integer"}
+
+
+def boolean() -> dict:
+    return {"type": "boolean"}
+
+
+def enum(*values: str) -> dict:
+    return {"type": "string", "enum": list(values)}
+
+
+def array(items: dict) -> dict:
+    return {"type": "array", "items": items}
+
+
+def nullable(schema: dict) -> dict:
+    types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+    result = {**schema, "type": [*types, "null"]}
+    if "enum" in result:
+        result["enum"] = [*result["enum"], None]
+    return result
+
+
+def obj(properties: dict[str, dict]) -> dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def from_example(example) -> dict:
+    """Infers a schema from an example value, e.g. a report template's layout."""
+    if isinstance(example, bool):
+        return boolean()
+    if isinstance(example, (int, float)):
+        return nullable(number())
+    if isinstance(example, str):
+        return string()
+    if isinstance(example, list):
+        return array(from_example(example[0]) if example else string())
+    if isinstance(example, dict):
+        return obj({key: from_example(value) for key, value in example.items()})
+    return nullable(string())
+
+
+def missing_keys(schema: dict | None, value) -> list[str]:
+    """Required top-level keys of an object schema that the value lacks (all of them if it is not an object)."""
+    if not schema or schema.get("type") != "object":
+        return []
+    required = schema.get("required", [])
+    if not isinstance(value, dict):
+        return list(required)
+    return [key for key in required if key not in value]
+
+
+def response_format(name: str, schema: dict) -> dict:
+    """The OpenAI-compatible response_format requesting strict structured output."""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
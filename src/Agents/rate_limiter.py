@@ -0,0 +1,368 @@
+# src/Agents/rate_limiter.py
+import os
+import time
+import random
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Per-provider defaults, overridable via <PROVIDER>_RPM, <PROVIDER>_TPM and <PROVIDER>_MAX_CONCURRENCY.
+PROVIDER_DEFAULTS = {
+    "openrouter": {"rpm": 120, "tpm": None, "max_concurrency": 16},
+    "tavily": {"rpm": 100, "tpm": None, "max_concurrency": 8},
+}
+
+
+class RateLimitedError(Exception):
+    """Raised when a call is still rate limited after all retries."""
+
+
+class TokenMeter:
+    """Counts the tokens of the calls made while it is active (see metered()), e.g. for one analysis."""
+
+    def __init__(self):
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, tokens: int):
+        with self._lock:
+            self.tokens += tokens
+
+
+_current_meter: ContextVar[TokenMeter | None] = ContextVar("token_meter", default=None)
+
+
+@contextmanager
+def metered(meter: TokenMeter):
+    """Charges every limited call made in this context (and in functions wrapped by bind_meter) to meter."""
+    token = _current_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _current_meter.reset(token)
+
+
+def bind_meter(fn):
+    """Wraps fn so it charges the caller's meter when run on another thread (e.g. a thread pool)."""
+    meter = _current_meter.get()
+    if meter is None:
+        return fn
+
+    def run(*args, **kwargs):
+        with metered(meter):
+            return fn(*args, **kwargs)
+    return run
+
+
+class TokenBucket:
+    """Thread-safe token bucket. `rate` tokens are added per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0):
+        """Blocks until `amount` tokens are available, then takes them."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                # The epsilon absorbs float residue from refilling; the floored wait guarantees progress
+                # when the deficit is below the clock's float resolution
+                if self._tokens >= amount - 1e-9:
+                    self._tokens -= amount
+                    return
+                wait = max((amount - self._tokens) / self.rate, 1e-3)
+            time.sleep(wait)
+
+    def adjust(self, delta: float):
+        """Corrects the balance once the real cost is known (negative delta refunds)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    AIMD concurrency limit. The limit grows by ~1 per window of successful calls
+    and is cut multiplicatively on rate limits, errors or latency well above the
+    observed baseline.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 64,
+                 latency_tolerance: float = 2.0, backoff: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._baseline_latency = None
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, outcome: str):
+        """outcome is one of 'ok', 'rate_limited' or 'error'."""
+        with self._cond:
+            self._in_flight -= 1
+            if outcome == "rate_limited":
+                self._limit = max(self.minimum, self._limit * self.backoff)
+            elif outcome == "error":
+                self._limit = max(self.minimum, self._limit * 0.9)
+            else:
+                if self._baseline_latency is None:
+                    self._baseline_latency = latency
+                else:
+                    # Track the fastest recent latency, drifting up slowly so the baseline can recover
+                    self._baseline_latency = min(latency, self._baseline_latency * 1.05)
+                if latency > self._baseline_latency * self.latency_tolerance:
+                    self._limit = max(self.minimum, self._limit * 0.9)
+                else:
+                    self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+
+class ProviderLimiter:
+    """Process-wide limiter for one provider: request and token buckets, Retry-After and adaptive concurrency."""
+
+    def __init__(self, name: str, rpm: float | None, tpm: float | None, max_concurrency: int):
+        self.name = name
+        self.requests = TokenBucket(rpm / 60.0, max(1.0, rpm / 6.0)) if rpm else None
+        self.tokens = TokenBucket(tpm / 60.0, tpm / 6.0) if tpm else None
+        self.concurrency = AdaptiveConcurrencyLimit(
+            initial=max(1, max_concurrency // 2), maximum=max_concurrency
+        )
+        self._blocked_until = 0.0
+        self._last_rate_limited = None
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "rate_limited": 0, "errors": 0, "retries": 0, "wait_seconds": 0.0, "tokens": 0}
+
+    def block_for(self, seconds: float):
+        """Pauses every caller of this provider, e.g. after a Retry-After header."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def throttled(self, window: float = 60.0) -> bool:
+        """True while callers are paused, or if the provider rate limited a call within the last `window` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            recent = self._last_rate_limited is not None and now - self._last_rate_limited < window
+            return recent or self._blocked_until > now
+
+    def _wait_unblocked(self):
+        while True:
+            with self._lock:
+                wait = self._blocked_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def call(self, fn, estimated_tokens: int = 0, max_retries: int = 6, usage_tokens=None):
+        """
+        Runs fn() under this provider's limits, retrying rate limits and transient
+        failures with Retry-After or exponential backoff instead of dropping the call.
+
+        Args:
+            fn: Zero-argument callable performing the request.
+            estimated_tokens (int): Tokens reserved from the token bucket before the call.
+            usage_tokens: Optional callable mapping fn's result to the real token count.
+        """
+        result, latency = self._run(fn, estimated_tokens, max_retries)
+        self.concurrency.release(latency, "ok")
+        actual = None
+        if usage_tokens:
+            try:
+                actual = usage_tokens(result)
+            except Exception:
+                pass
+        self._charge(actual, estimated_tokens)
+        return result
+
+    def stream(self, fn, estimated_tokens: int = 0, max_retries: int = 6):
+        """
+        Opens a streaming request with fn() like call() does, and yields its chunks. The
+        concurrency slot is held until the stream is exhausted, fails or is closed, so
+        open streams count against the provider's concurrency limit.
+        """
+        stream, latency = self._run(fn, estimated_tokens, max_retries)
+        # Streams report no usage; their reservation stands in for the real count
+        self._charge(None, estimated_tokens)
+        outcome = "error"
+        try:
+            yield from stream
+            outcome = "ok"
+        except GeneratorExit:
+            outcome = "ok"
+            raise
+        except Exception as e:
+            if classify_error(e) == "rate_limited":
+                outcome = "rate_limited"
+            raise
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+            # Time to open the stream, not to drain it, so long answers do not read as a slow provider
+            self.concurrency.release(latency, outcome)
+
+    def _run(self, fn, estimated_tokens: int, max_retries: int) -> tuple:
+        """The retry loop of call(); returns (result, latency) with the concurrency slot still held."""
+        for attempt in range(max_retries + 1):
+            started = time.monotonic()
+            self._wait_unblocked()
+            if self.requests:
+                self.requests.acquire(1)
+            if self.tokens and estimated_tokens:
+                self.tokens.acquire(estimated_tokens)
+            self.concurrency.acquire()
+            call_started = time.monotonic()
+            with self._lock:
+                self.stats["wait_seconds"] += call_started - started
+                self.stats["calls"] += 1
+            try:
+                result = fn()
+            except Exception as e:
+                latency = time.monotonic() - call_started
+                kind = classify_error(e)
+                self.concurrency.release(latency, "rate_limited" if kind == "rate_limited" else "error")
+                with self._lock:
+                    self.stats["rate_limited" if kind == "rate_limited" else "errors"] += 1
+                    if kind == "rate_limited":
+                        self._last_rate_limited = time.monotonic()
+                if kind == "fatal" or attempt == max_retries:
+                    if kind == "rate_limited":
+                        raise RateLimitedError(f"{self.name}: still rate limited after {attempt + 1} attempts") from e
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(60.0, 2 ** attempt) * (0.5 + random.random())
+                if kind == "rate_limited":
+                    self.block_for(delay)
+                with self._lock:
+                    self.stats["retries"] += 1
+                logger.warning("[%s] %s error on attempt %s/%s, retrying in %.1fs: %s", self.name, kind, attempt + 1,
+                               max_retries + 1, delay, e)
+                time.sleep(delay)
+                continue
+            return result, time.monotonic() - call_started
+
+    def _charge(self, actual: int | None, estimated_tokens: int):
+        """Books a finished call's tokens: corrects the token bucket and counts them in stats and the active meter."""
+        if self.tokens and actual:
+            self.tokens.adjust(actual - estimated_tokens)
+        with self._lock:
+            self.stats["tokens"] += actual or estimated_tokens
+        meter = _current_meter.get()
+        if meter is not None:
+            meter.add(actual or estimated_tokens)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, concurrency_limit=self.concurrency.limit)
+
+
+def status_code(exc: Exception) -> int | None:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(exc: Exception) -> str:
+    """Returns 'rate_limited', 'transient' or 'fatal' for a provider exception."""
+    status = status_code(exc)
+    message = str(exc).lower()
+    if status == 429 or "rate limit" in message or "too many requests" in message:
+        return "rate_limited"
+    if status is not None and status >= 500:
+        return "transient"
+    name = type(exc).__name__
+    if "Timeout" in name or "Connection" in name:
+        return "transient"
+    return "fatal"
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """Reads a Retry-After header (seconds) from the exception's HTTP response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """Returns the shared limiter for a provider, creating it from env config on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            defaults = PROVIDER_DEFAULTS.get(provider, {"rpm": None, "tpm": None, "max_concurrency": 8})
+            prefix = provider.upper()
+            rpm = os.getenv(f"{prefix}_RPM")
+            tpm = os.getenv(f"{prefix}_TPM")
+            max_concurrency = os.getenv(f"{prefix}_MAX_CONCURRENCY")
+            limiter = ProviderLimiter(
+                name=provider,
+                rpm=float(rpm) if rpm else defaults["rpm"],
+                tpm=float(tpm) if tpm else defaults["tpm"],
+                max_concurrency=int(max_concurrency) if max_concurrency else defaults["max_concurrency"],
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def limiter_stats() -> dict:
+    """Snapshot of every provider limiter created in this process."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def estimate_tokens(messages: list[dict], max_output_tokens: int = 1000) -> int:
+    """Rough token estimate (~4 chars per token) for reserving token-bucket capacity."""
+    chars = 0
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                # Images are billed roughly like ~1k tokens of text at the DPI we render
+                chars += len(part.get("text", "")) if part.get("type") == "text" else 4000
+    return chars // 4 + max_output_tokens
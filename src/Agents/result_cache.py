@@ -0,0 +1,117 @@
+# src/Agents/result_cache.py
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("RESULT_CACHE_DIR", os.path.join("reports", "cache"))
+
+# The shared LLM, search and reputability caches are opt-in (AGENT_CACHE=1, or set_caching_enabled):
+# interactive runs should see fresh results, batch runs over many decks benefit from reuse.
+_caching_enabled = os.getenv("AGENT_CACHE", "0") == "1"
+_caches: dict[str, "ResultCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def content_key(*parts) -> str:
+    """Stable SHA-256 key over the given parts (strings or JSON-serializable values)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, separators=(',', ':'))
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of agent results, one JSON file per key under <cache_dir>/<namespace>/.
+
+    Keys are content hashes, so an entry never has to be invalidated: changed input
+    simply produces a different key. Caches of results that age (e.g. web searches)
+    pass ttl_seconds, after which entries are treated as missing. Writes go through a
+    temp file and os.replace, which makes the cache safe to share between threads and processes.
+    """
+
+    def __init__(self, namespace: str, cache_dir: str = CACHE_DIR, ttl_seconds: float | None = None):
+        self.namespace = namespace
+        self.dir = os.path.join(cache_dir, namespace)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, f"{key}.json")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            if self.ttl_seconds is not None and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self._count(False)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            self._count(False)
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            self._count(False)
+            return None
+        self._count(True)
+        return value
+
+    def set(self, key: str, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+def set_caching_enabled(enabled: bool):
+    """Turns the shared agent caches (see get_cache) on or off for this process."""
+    global _caching_enabled
+    _caching_enabled = enabled
+
+
+def get_cache(namespace: str, ttl_seconds: float | None = None) -> ResultCache | None:
+    """Returns the process-wide shared cache for a namespace, or None while caching is disabled."""
+    if not _caching_enabled:
+        return None
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = ResultCache(namespace, ttl_seconds=ttl_seconds)
+            _caches[namespace] = cache
+        return cache
+
+
+def cache_stats() -> dict:
+    """Hit/miss counts of every shared cache used in this process."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
@@ -1,52 +1,91 @@
 # src/validation_agents/search_agent.py
-from tavily import TavilyClient
-import time
+import os
+import logging
+
+from Agents.rate_limiter import get_limiter
+from Agents.result_cache import get_cache, content_key
+from Agents.content_cleaner import ContentCleaner, DEFAULT_MAX_CHARS_PER_SOURCE
+from Agents.evidence_store import EvidenceStore
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL_HOURS", 24)) * 3600
 
 class SearchAgent:
     """An agent dedicated to executing search queries using the Tavily API."""
-    def __init__(self, api_key: str):
-        self.client = TavilyClient(api_key=api_key)
+    def __init__(self, api_key: str, max_chars_per_source: int = DEFAULT_MAX_CHARS_PER_SOURCE):
+        self.api_key = api_key
+        self._client = None
+        self.max_chars_per_source = max_chars_per_source
+        self.limiter = get_limiter("tavily")
 
-    def search(self, queries: list[str]) -> tuple[str, list[dict]]:
+    @property
+    def client(self):
+        """The Tavily client, created (and the SDK imported) on first search."""
+        if self._client is None:
+            from tavily import TavilyClient
+            self._client = TavilyClient(api_key=self.api_key)
+        return self._client
+
+    def search(self, queries: list[str]) -> tuple[EvidenceStore, list[dict]]:
         """Executes searches, consolidates content, and de-duplicates sources."""
-        print(f"Agent [Search]: Executing {len(queries)} search(es)...")
-        consolidated_context = ""
-        unique_sources = {}
-        
+        logger.info("Agent [Search]: Executing %s search(es)...", len(queries))
+        results = []
         for i, query in enumerate(queries):
-            print(f"\n--- Searching Query {i+1}/{len(queries)}: '{query}' ---")
-            attempts = 0
-            max_attempts = 3
-            wait_time = 2
-
-            while attempts < max_attempts:
-                try:
-                    search_result = self.client.search(
-                        query=query, search_depth="advanced", max_results=5, include_raw_content=True
-                    )
-                    
-                    # --- LOGGING: Show search results for the query ---
-                    print(f"Found {len(search_result.get('results', []))} results for query.")
-
-                    for res in search_result.get('results', []):
-                        if res.get('url') and res['url'] not in unique_sources:
-                            unique_sources[res['url']] = {'title': res.get('title'), 'url': res.get('url')}
-                            if res.get('raw_content'):
-                                consolidated_context += f"--- Source (URL: {res['url']}) ---\n{res['raw_content']}\n\n"
-                    break 
-                except Exception as e:
-                    attempts += 1
-                    print(f"Warning: Search for query '{query}' failed on attempt {attempts}/{max_attempts}. Error: {e}")
-                    if attempts < max_attempts:
-                        print(f"Retrying in {wait_time} seconds...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"Error: All search attempts for query '{query}' failed.")
+            logger.info("Searching Query %s/%s: '%s'", i+1, len(queries), query)
+            results.append(self.search_query(query))
+        return self.consolidate(results, queries)
+
+    def search_query(self, query: str) -> list[dict]:
+        """Runs a single query and returns its raw results (empty if every attempt failed)."""
+        cache = get_cache("search", ttl_seconds=SEARCH_CACHE_TTL)
+        cache_key = content_key(" ".join(query.lower().split()), "advanced", 5)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("Found %s cached results for query '%s'.", len(cached), query)
+                return cached
+        try:
+            # Retries, Retry-After and concurrency are handled by the shared Tavily limiter
+            search_result = self.limiter.call(lambda: self.client.search(
+                query=query, search_depth="advanced", max_results=5, include_raw_content=True
+            ))
+        except Exception as e:
+            logger.warning("Error: All search attempts for query '%s' failed. Error: %s", query, e)
+            return []
+
+        # --- LOGGING: Show search results for the query ---
+        logger.info("Found %s results for query '%s'.", len(search_result.get('results', [])), query)
+        if cache is not None:
+            cache.set(cache_key, search_result.get('results', []))
+        return search_result.get('results', [])
+
+    def consolidate(self, results_per_query: list[list[dict]],
+                    queries: list[str] | None = None) -> tuple[EvidenceStore, list[dict]]:
+        """
+        De-duplicates sources across queries and collects them into an EvidenceStore, in query order.
+        Each source's raw content is cleaned of boilerplate and near-duplicate paragraphs and capped
+        at max_chars_per_source before it is added. str(store) is the consolidated context.
+        """
+        store = EvidenceStore()
+        cleaner = ContentCleaner(max_chars_per_source=self.max_chars_per_source)
+
+        for i, results in enumerate(results_per_query):
+            query = queries[i] if queries and i < len(queries) else None
+            for res in results:
+                if not res.get('url'):
+                    continue
+                if store.get(res['url']) is None:
+                    content = cleaner.clean(res['raw_content']) if res.get('raw_content') else ""
+                else:
+                    content = None
+                store.add(res['url'], res.get('title'), content, query)
         
         # --- LOGGING: Show final search output ---
-        print("\n--- Search Agent FINAL OUTPUT ---")
-        print(f"Retrieved content from {len(unique_sources)} unique sources.")
-        print(f"Total consolidated context length: {len(consolidated_context)} characters.")
-        print("---------------------------------\n")
+        logger.info("Retrieved content from %s unique sources.", len(store.records))
+        logger.info("Cleaning: %s -> %s characters (%s boilerplate, %s duplicate blocks dropped, %s sources capped).",
+                    cleaner.stats['chars_in'], cleaner.stats['chars_out'], cleaner.stats['boilerplate'],
+                    cleaner.stats['duplicates'], cleaner.stats['truncated'])
+        logger.info("Total consolidated context length: %s characters.", len(store))
         
-        return consolidated_context, list(unique_sources.values())
\ No newline at end of file
+        return store, store.sources()
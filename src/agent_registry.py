@@ -0,0 +1,56 @@
+# src/agent_registry.py
+import threading
+
+
+class AgentRegistry:
+    """
+    Process-wide, thread-safe registry of shared agents and orchestrators.
+
+    Every component is built on first use by the factory passed to get() and then
+    reused by all callers, so API requests do not pay for constructing clients and
+    agents again. Each key has its own lock: concurrent first requests for the same
+    component build it once, while different components can be built in parallel
+    (and factories may themselves fetch other components from the registry).
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = factory()
+                self._instances[key] = instance
+            return instance
+
+    def clear(self):
+        """Drops every shared instance, e.g. after the environment or routing table changed."""
+        with self._lock:
+            self._instances.clear()
+            self._locks.clear()
+
+    def __contains__(self, key) -> bool:
+        return key in self._instances
+
+
+_registry = AgentRegistry()
+
+
+def get_registry() -> AgentRegistry:
+    return _registry
+
+
+def get_document_orchestrator(fused: bool | None = None):
+    """Returns the shared DocumentAnalysisOrchestrator, importing the analysis stack on first use."""
+    def _build():
+        from main_document_analysis import DocumentAnalysisOrchestrator
+        return DocumentAnalysisOrchestrator(fused=fused)
+    return _registry.get(("DocumentAnalysisOrchestrator", fused), _build)
@@ -0,0 +1,161 @@
+# src/analysis_budget.py
+import re
+import time
+import threading
+
+from Agents.rate_limiter import TokenMeter, metered
+
+_NUMBER_RE = re.compile(r"\d[\d,.]*")
+_MONEY_RE = re.compile(r"[$€£¥]|\b(?:usd|eur|gbp)\b", re.IGNORECASE)
+_SCALE_RE = re.compile(r"\d\s*(?:%|k\b|m\b|bn?\b|x\b|million|billion|thousand|percent)", re.IGNORECASE)
+_FINANCIAL_RE = re.compile(
+    r"\b(?:revenue|arr|mrr|sales|profit\w*|margin|ebitda|burn|runway|cash|valuation|funding|raised|"
+    r"round|investors?|customers?|users|growth|cagr|tam|sam|som|market size|market share|"
+    r"retention|churn|cac|ltv|unit economics|pricing|contracts?|pipeline)\b",
+    re.IGNORECASE
+)
+
+
+def materiality_score(text: str) -> float:
+    """
+    How much an investor's decision hinges on a claim or page: financial terms, amounts
+    of money, scaled figures (%, M, bn, x) and plain numbers, in that order of weight.
+    A cheap, local score, so ordering never costs an LLM call.
+    """
+    if not text:
+        return 0.0
+    return (3.0 * len(_FINANCIAL_RE.findall(text)) + 2.0 * len(_MONEY_RE.findall(text))
+            + 2.0 * len(_SCALE_RE.findall(text)) + 1.0 * len(_NUMBER_RE.findall(text)))
+
+
+class AnalysisBudget:
+    """
+    Wall-clock and/or LLM-token budget of one analysis, and the degradation it calls for.
+
+    The share of the budget already spent (the larger of time and tokens) sets a level:
+
+        0  full analysis
+        1  pages rendered at a lower DPI, fewer search queries per plan
+        2  additionally only the most material claims of each page are validated
+        3  exhausted: remaining pages, claims and research steps are not checked
+
+    Everything skipped is recorded, and report() lists it, so a report produced under
+    a budget says what it did not check. Tokens are counted per analysis: the calls
+    made inside metering() (and in pool tasks wrapped with bind_meter) are charged to
+    this budget only, so analyses sharing a process do not spend each other's budget.
+    """
+
+    LEVEL_THRESHOLDS = (0.5, 0.7, 0.85)
+    DEGRADED_DPI = (None, 110, 80, 80)
+    MAX_QUERIES = (None, 4, 2, 0)
+    MAX_CLAIMS_PER_PAGE = 3
+
+    def __init__(self, seconds: float | None = None, tokens: int | None = None):
+        self.seconds = seconds
+        self.tokens = tokens
+        self._started = time.monotonic()
+        self._meter = TokenMeter()
+        self._max_level = 0
+        self._not_checked: list[dict] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_params(cls, params) -> "AnalysisBudget | None":
+        """Accepts a budget, {"seconds", "tokens"} or None (no budget)."""
+        if params is None or isinstance(params, AnalysisBudget):
+            return params
+        seconds, tokens = params.get("seconds"), params.get("tokens")
+        if not seconds and not tokens:
+            return None
+        return cls(seconds=float(seconds) if seconds else None, tokens=int(tokens) if tokens else None)
+
+    # --- SPENDING ---
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def metering(self):
+        """Context manager that charges the LLM calls made within it to this budget."""
+        return metered(self._meter)
+
+    def tokens_used(self) -> int:
+        return self._meter.tokens
+
+    def spent(self) -> float:
+        """Share of the budget used so far (1.0 = used up)."""
+        shares = []
+        if self.seconds:
+            shares.append(self.elapsed() / self.seconds)
+        if self.tokens:
+            shares.append(self.tokens_used() / self.tokens)
+        return max(shares, default=0.0)
+
+    def level(self) -> int:
+        spent = self.spent()
+        level = sum(1 for threshold in self.LEVEL_THRESHOLDS if spent >= threshold)
+        with self._lock:
+            self._max_level = max(self._max_level, level)
+        return level
+
+    def exhausted(self) -> bool:
+        return self.level() >= 3
+
+    # --- DEGRADATION ---
+
+    def render_dpi(self, default: int) -> int:
+        dpi = self.DEGRADED_DPI[self.level()]
+        return min(dpi, default) if dpi else default
+
+    def max_queries(self) -> int | None:
+        """Cap on search queries per plan, or None for no cap."""
+        return self.MAX_QUERIES[self.level()]
+
+    def select_claims(self, claims: list[str], page_number: int | None = None) -> tuple[list[str], list[str]]:
+        """
+        Splits claims into (to validate, skipped), keeping the input order of the kept ones.
+        From level 2 only the most material claims of a page are kept; at level 3 none.
+        """
+        level = self.level()
+        if level < 2:
+            return list(claims), []
+        if level >= 3:
+            kept = []
+        else:
+            ranked = sorted(range(len(claims)), key=lambda i: -materiality_score(claims[i]))
+            keep = {i for i in ranked[:self.MAX_CLAIMS_PER_PAGE] if materiality_score(claims[i]) > 0}
+            kept = [c for i, c in enumerate(claims) if i in keep]
+        skipped = [c for c in claims if c not in kept]
+        for claim in skipped:
+            self.mark_not_checked("claim", claim, page_number=page_number)
+        return kept, skipped
+
+    def mark_not_checked(self, kind: str, item, page_number: int | None = None):
+        """Records a page, claim or analysis step that was skipped to stay within the budget."""
+        entry = {"kind": kind, "item": item, "level": self.level()}
+        if page_number is not None:
+            entry["page_number"] = page_number
+        with self._lock:
+            self._not_checked.append(entry)
+
+    @staticmethod
+    def not_checked_result(claim: str) -> dict:
+        """Verdict placeholder for a claim that was skipped to stay within the budget."""
+        return {
+            "claim": claim,
+            "conclusion": "NOT_CHECKED",
+            "summary": "This claim was not validated because the analysis budget ran short; "
+                       "claims with more financial or numeric weight were checked first.",
+            "evidence": []
+        }
+
+    def report(self) -> dict:
+        with self._lock:
+            not_checked = list(self._not_checked)
+            max_level = self._max_level
+        return {
+            "limits": {"seconds": self.seconds, "tokens": self.tokens},
+            "spent": {"seconds": round(self.elapsed(), 1), "tokens": self.tokens_used(),
+                      "share": round(self.spent(), 3)},
+            "max_degradation_level": max_level,
+            "not_checked": not_checked,
+        }
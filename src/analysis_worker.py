@@ -0,0 +1,190 @@
+# src/analysis_worker.py
+"""
+Worker processes that run document analyses from the job queue.
+
+    python src/analysis_worker.py --processes 4            # run a local worker fleet
+    python src/analysis_worker.py --enqueue deck.pdf       # add a job (and exit)
+
+Each process claims one job at a time, renews its lease with a heartbeat thread while
+the analysis runs, and resumes from the job's journal, so a job picked up again after a
+crash only redoes the units that were not finished. More workers can be started on other
+hosts that share the queue database.
+"""
+import os
+import sys
+import time
+import socket
+import signal
+import logging
+import argparse
+import threading
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from job_queue import JobQueue, DEFAULT_QUEUE_PATH
+from logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """Claims jobs from the queue and runs them until stopped."""
+
+    def __init__(self, queue: JobQueue, worker_id: str | None = None, poll_seconds: float = 2.0):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Finishes the current job, then exits the loop."""
+        self._stop.set()
+
+    def _heartbeat(self, job_id: str, done: threading.Event, lost: threading.Event):
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                # Keep trying after a lost lease: a worker that found the job locked defers it back to us
+                if self.queue.heartbeat(job_id, self.worker_id):
+                    if lost.is_set():
+                        logger.info("[%s] Took back the lease on job %s", self.worker_id, job_id)
+                        lost.clear()
+                elif not lost.is_set():
+                    logger.warning("[%s] Lost the lease on job %s", self.worker_id, job_id)
+                    lost.set()
+            except Exception as e:
+                logger.warning("[%s] Heartbeat for job %s failed: %s", self.worker_id, job_id, e)
+
+    def run_job(self, job: dict):
+        # Imported here so the parent process of a fleet never loads the analysis stack
+        from agent_registry import get_document_orchestrator
+        from main_document_analysis import save_report_to_file
+
+        done, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["job_id"], done, lost), daemon=True)
+        heartbeat.start()
+        try:
+            params = job["params"]
+            report = get_document_orchestrator().run_full_document_analysis(
+                job["pdf_path"],
+                competitors=params.get("competitors"),
+                job_id=job["job_id"],
+                resume=True,
+                validation_mode=params.get("validation_mode"),
+                budget=params.get("budget"),
+                context=params.get("context")
+            )
+            if report and report.get("locked"):
+                # Another run (e.g. the worker whose lease was reclaimed) is still on this job; let it finish
+                logger.warning("[%s] Job %s is still being analyzed elsewhere; deferring it", self.worker_id,
+                               job['job_id'])
+                self.queue.defer(job["job_id"], self.worker_id, report["error"])
+                return
+            if not report or "error" in report:
+                # A missing or unreadable PDF will not get better on retry
+                self.queue.fail(job["job_id"], self.worker_id, (report or {}).get("error", "No report"), retry=False)
+                return
+            report_path = save_report_to_file(report, job["pdf_path"])
+            if lost.is_set():
+                logger.warning("[%s] Job %s finished after its lease was lost", self.worker_id, job['job_id'])
+            if not self.queue.complete(job["job_id"], self.worker_id, report_path):
+                logger.warning("[%s] Job %s was taken over by another worker; its result was not recorded",
+                               self.worker_id, job['job_id'])
+        except Exception as e:
+            logger.error("[%s] Job %s failed: %s", self.worker_id, job['job_id'], e)
+            self.queue.fail(job["job_id"], self.worker_id, str(e))
+        finally:
+            done.set()
+
+    def _warm_up(self):
+        """Builds the analysis orchestrator before the first claim, so no job's lease pays for it."""
+        from agent_registry import get_document_orchestrator
+        try:
+            get_document_orchestrator()
+            logger.info("[%s] Document analysis orchestrator warmed up", self.worker_id)
+        except Exception as e:
+            logger.error("[%s] Could not warm up the document analysis orchestrator: %s", self.worker_id, e)
+
+    def run(self):
+        logger.info("[%s] Worker started on %s", self.worker_id, self.queue.db_path)
+        if os.getenv("WARM_START") == "1":
+            self._warm_up()
+        while not self._stop.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                self._stop.wait(self.poll_seconds)
+                continue
+            logger.info("[%s] Running job %s (attempt %s/%s): %s", self.worker_id, job['job_id'],
+                        job['attempts'], job['max_attempts'], job['pdf_path'])
+            self.run_job(job)
+        logger.info("[%s] Worker stopped", self.worker_id)
+
+
+def _worker_main(db_path: str, lease_seconds: float):
+    """Entry point of one worker process."""
+    configure_logging()
+    worker = AnalysisWorker(JobQueue(db_path, lease_seconds))
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run()
+
+
+def run_fleet(processes: int, db_path: str = DEFAULT_QUEUE_PATH, lease_seconds: float | None = None):
+    """Starts worker processes and restarts any that die until interrupted."""
+    lease_seconds = lease_seconds or JobQueue(db_path).lease_seconds
+    ctx = multiprocessing.get_context("spawn")
+    workers = []
+    stopping = threading.Event()
+
+    def start():
+        p = ctx.Process(target=_worker_main, args=(db_path, lease_seconds), daemon=False)
+        p.start()
+        return p
+
+    def shutdown(*_):
+        stopping.set()
+        for p in workers:
+            if p.is_alive():
+                p.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    workers.extend(start() for _ in range(processes))
+    while not stopping.is_set():
+        for i, p in enumerate(workers):
+            if not p.is_alive() and not stopping.is_set():
+                logger.warning("Worker process %s exited with %s; restarting", p.pid, p.exitcode)
+                workers[i] = start()
+        stopping.wait(5)
+    for p in workers:
+        p.join()
+
+
+def main():
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Run document analysis workers on the job queue.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("ANALYSIS_WORKERS", 2)))
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Path of the queue database")
+    parser.add_argument("--lease-seconds", type=float, default=None)
+    parser.add_argument("--enqueue", nargs="+", metavar="PDF", help="Add jobs for these PDFs and exit")
+    parser.add_argument("--competitors", nargs="*", default=None)
+    parser.add_argument("--deadline-seconds", type=float, default=None, help="Wall-clock budget per enqueued deck")
+    parser.add_argument("--token-budget", type=int, default=None, help="LLM token budget per enqueued deck")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        queue = JobQueue(args.queue)
+        params = {"competitors": args.competitors}
+        if args.deadline_seconds or args.token_budget:
+            params["budget"] = {"seconds": args.deadline_seconds, "tokens": args.token_budget}
+        for pdf_path in args.enqueue:
+            job_id = queue.enqueue(os.path.abspath(pdf_path), params)
+            print(f"{job_id}  {pdf_path}")
+        return
+
+    run_fleet(args.processes, args.queue, args.lease_seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# src/batch_analysis.py
+"""
+Batch analysis of many pitch decks with shared workers and caches.
+
+    python src/batch_analysis.py decks/                      # every PDF in a directory
+    python src/batch_analysis.py manifest.json --workers 6   # ["a.pdf", {"path": "b.pdf", "competitors": [...]}]
+    python src/batch_analysis.py manifest.txt --resume       # one PDF path per line
+
+All decks share one orchestrator (and with it the rasterizer pool, provider limiters
+and model router) and the on-disk LLM, search and reputability caches. One report per
+deck is written to reports/, followed by a throughput summary.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent_registry import get_document_orchestrator
+from main_document_analysis import save_report_to_file
+from logging_config import configure_logging
+from Agents.rate_limiter import limiter_stats
+from Agents.result_cache import set_caching_enabled, cache_stats
+
+logger = logging.getLogger(__name__)
+
+LLM_PROVIDERS = ("openrouter", "local")
+
+
+def load_decks(source: str, default_competitors: list[str] | None = None) -> list[dict]:
+    """Reads a directory of PDFs or a .json/.txt manifest into [{"path", "competitors"}]."""
+    if os.path.isdir(source):
+        return [{"path": os.path.join(source, name), "competitors": default_competitors}
+                for name in sorted(os.listdir(source)) if name.lower().endswith(".pdf")]
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        if source.lower().endswith(".json"):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+    decks = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        path = entry["path"] if os.path.isabs(entry["path"]) else os.path.join(base_dir, entry["path"])
+        decks.append({"path": path, "competitors": entry.get("competitors", default_competitors)})
+    return decks
+
+
+def _calls(stats: dict, providers) -> int:
+    return sum(stats.get(p, {}).get("calls", 0) for p in providers)
+
+
+def run_batch(decks: list[dict], workers: int = 4, resume: bool = False, budget: dict | None = None) -> dict:
+    """
+    Analyzes every deck on a shared worker pool and returns per-deck results plus a throughput summary.
+    budget ({"seconds", "tokens"}) applies to each deck; every deck spends only its own token budget.
+    """
+    orchestrator = get_document_orchestrator()
+    stats_before = limiter_stats()
+    started = time.monotonic()
+
+    def analyze(deck: dict) -> dict:
+        deck_started = time.monotonic()
+        report = orchestrator.run_full_document_analysis(
+            deck["path"], competitors=deck.get("competitors"), resume=resume, budget=budget
+        )
+        if not report or "error" in report:
+            return {"path": deck["path"], "status": "failed",
+                    "error": (report or {}).get("error", "No report produced"),
+                    "seconds": round(time.monotonic() - deck_started, 1)}
+        report_path = save_report_to_file(report, deck["path"])
+        return {"path": deck["path"], "status": "ok" if report_path else "failed", "report": report_path,
+                "seconds": round(time.monotonic() - deck_started, 1)}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze, deck): deck for deck in decks}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"path": futures[future]["path"], "status": "failed", "error": str(e)}
+            logger.info("[%s/%s] %s: %s", len(results) + 1, len(decks), result['status'], result['path'])
+            results.append(result)
+
+    elapsed = time.monotonic() - started
+    stats_after = limiter_stats()
+    done = sum(1 for r in results if r["status"] == "ok")
+    summary = {
+        "decks": len(decks),
+        "succeeded": done,
+        "failed": len(decks) - done,
+        "wall_seconds": round(elapsed, 1),
+        "decks_per_hour": round(done / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+        "llm_calls_per_deck": round(
+            (_calls(stats_after, LLM_PROVIDERS) - _calls(stats_before, LLM_PROVIDERS)) / max(1, len(decks)), 1),
+        "search_calls_per_deck": round(
+            (_calls(stats_after, ("tavily",)) - _calls(stats_before, ("tavily",))) / max(1, len(decks)), 1),
+        "cache_hit_rates": {name: s["hit_rate"] for name, s in cache_stats().items()},
+    }
+    return {"results": results, "summary": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a directory or manifest of pitch decks.")
+    parser.add_argument("source", help="Directory of PDFs, or a .json/.txt manifest")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", 4)),
+                        help="Decks analyzed concurrently")
+    parser.add_argument("--competitors", nargs="*", default=None,
+                        help="Competitors for decks whose manifest entry names none")
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted decks from their journals")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the shared LLM/search/reputability caches")
+    parser.add_argument("--deadline-seconds", type=float, default=None, help="Wall-clock budget per deck")
+    parser.add_argument("--token-budget", type=int, default=None, help="LLM token budget per deck")
+    args = parser.parse_args()
+    configure_logging()
+
+    decks = load_decks(args.source, args.competitors)
+    if not decks:
+        logger.error("No PDF decks found in %s", args.source)
+        sys.exit(1)
+    set_caching_enabled(not args.no_cache)
+    logger.info("Analyzing %s deck(s) with %s worker(s)", len(decks), args.workers)
+
+    budget = {"seconds": args.deadline_seconds, "tokens": args.token_budget}
+    batch = run_batch(decks, workers=args.workers, resume=args.resume, budget=budget)
+    for result in sorted(batch["results"], key=lambda r: r["path"]):
+        print(f"{result['status']:>6}  {result['path']}  ->  {result.get('report') or result.get('error')}")
+    summary = batch["summary"]
+    print("\n--- BATCH SUMMARY ---")
+    print(f"{summary['succeeded']}/{summary['decks']} decks in {summary['wall_seconds']}s "
+          f"({summary['decks_per_hour']} decks/hour)")
+    print(f"LLM calls/deck: {summary['llm_calls_per_deck']}, search calls/deck: {summary['search_calls_per_deck']}")
+    for name, rate in summary["cache_hit_rates"].items():
+        print(f"Cache '{name}': {rate:.0%} hit rate")
+    sys.exit(0 if summary["failed"] == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
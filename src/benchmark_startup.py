@@ -0,0 +1,104 @@
+# src/benchmark_startup.py
+"""
+Startup benchmark for the API and the analysis stack.
+
+Every measurement runs in a fresh interpreter, so module caches are cold:
+
+    python src/benchmark_startup.py --runs 5
+
+- import main_app               time until the API module is importable
+- import main_document_analysis time until the orchestrator module is importable
+- first orchestrator            first get_document_orchestrator() plus touching every component,
+                                i.e. the setup the first analysis request pays
+- warm orchestrator             the same lookup again, i.e. what every later request pays
+- first request                 GET /reports/search through FastAPI's TestClient, if available
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SNIPPETS = {
+    "import main_app": """
+import time
+t = time.perf_counter()
+import main_app
+print(time.perf_counter() - t)
+""",
+    "import main_document_analysis": """
+import time
+t = time.perf_counter()
+import main_document_analysis
+print(time.perf_counter() - t)
+""",
+    "first orchestrator": """
+import time
+from agent_registry import get_document_orchestrator
+t = time.perf_counter()
+o = get_document_orchestrator()
+for name in ("extractor", "analyzer", "triage", "fused_analyzer", "validator",
+             "market_insight_orchestrator", "competitor_research_orchestrator"):
+    getattr(o, name)
+print(time.perf_counter() - t)
+""",
+    "warm orchestrator": """
+import time
+from agent_registry import get_document_orchestrator
+o = get_document_orchestrator()
+o.validator
+t = time.perf_counter()
+o = get_document_orchestrator()
+o.validator
+print(time.perf_counter() - t)
+""",
+    "first request": """
+import time
+t = time.perf_counter()
+from fastapi.testclient import TestClient
+import main_app
+client = TestClient(main_app.app)
+client.get("/reports/search", params={"limit": 1})
+print(time.perf_counter() - t)
+""",
+}
+
+
+def _run_once(snippet: str) -> float | None:
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=SRC_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+def run_benchmark(runs: int = 5) -> dict:
+    """Returns {measurement: {"median_ms", "min_ms", "runs"}}; failed measurements report an error."""
+    results = {}
+    for name, snippet in SNIPPETS.items():
+        timings = [t for t in (_run_once(snippet) for _ in range(runs)) if t is not None]
+        if not timings:
+            results[name] = {"error": "failed (missing dependency or API keys?)"}
+            continue
+        results[name] = {
+            "median_ms": round(statistics.median(timings) * 1000, 2),
+            "min_ms": round(min(timings) * 1000, 2),
+            "runs": len(timings),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first request.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.runs), indent=2))
+
+
+if __name__ == '__main__':
+    main()
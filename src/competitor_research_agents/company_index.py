@@ -0,0 +1,204 @@
+# src/competitor_research_agents/company_index.py
+import os
+import re
+import csv
+import json
+import zlib
+import math
+import threading
+
+DEFAULT_CORPUS_PATH = os.getenv("COMPANY_CORPUS_PATH", os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "utils", "companyCorpus.json"
+)))
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our that the their this to "
+    "we with which who will your you platform company companies solution solutions based provides".split()
+)
+# Fields besides name and description that describe a company and are indexed with it
+TEXT_FIELDS = ("sector", "tags", "keywords", "category", "industry")
+
+
+def _numpy():
+    """Imports NumPy, which the index needs for search; a missing install is an error, not an empty result."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("The company similarity index requires numpy (pip install numpy).") from e
+    return numpy
+
+
+def _features(text: str, dim_mask: int) -> dict[int, float]:
+    """Hashed word unigrams, word bigrams and in-word character 4-grams with log-scaled counts."""
+    words = [w for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS and len(w) > 1]
+    counts: dict[int, float] = {}
+    grams = list(words) + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        if len(w) > 5:
+            grams.extend(f"#{w[i:i + 4]}" for i in range(len(w) - 3))
+    for gram in grams:
+        h = zlib.crc32(gram.encode('utf-8')) & dim_mask
+        counts[h] = counts.get(h, 0.0) + 1.0
+    return counts
+
+
+def _company_text(record: dict) -> str:
+    parts = [str(record.get("name") or ""), str(record.get("description") or "")]
+    for field in TEXT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, list):
+            parts.append(" ".join(map(str, value)))
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+class CompanyIndex:
+    """
+    In-memory TF-IDF similarity index over a company corpus, using hashed n-gram features.
+
+    Documents are stored as flat, CSR-style NumPy arrays; a query walks an inverted view
+    of those arrays, so top-k cosine search touches only the postings of the query's
+    features and answers in milliseconds without any LLM call. add() is incremental: new
+    companies are appended and the arrays, IDF weights and norms are rebuilt lazily on the
+    next query.
+    """
+
+    def __init__(self, hash_bits: int = 20):
+        self.dim_mask = (1 << hash_bits) - 1
+        self.records: list[dict] = []
+        self._names: set[str] = set()
+        self._doc_feature_counts: list[dict[int, float]] = []
+        self._lock = threading.Lock()
+        self._arrays = None
+
+    # --- CORPUS ---
+
+    def add(self, records: list[dict]) -> int:
+        """Adds companies ({"name", "description", ...}); names already indexed are skipped."""
+        added = 0
+        with self._lock:
+            for record in records:
+                name = str(record.get("name") or "").strip()
+                if not name or name.lower() in self._names:
+                    continue
+                self._names.add(name.lower())
+                self.records.append(dict(record, name=name))
+                self._doc_feature_counts.append({
+                    h: 1.0 + math.log(c) for h, c in _features(_company_text(record), self.dim_mask).items()
+                })
+                added += 1
+            if added:
+                self._arrays = None
+        return added
+
+    def load(self, path: str) -> int:
+        """Adds the companies from a .json (list of objects) or .csv (with a header row) file."""
+        if path.lower().endswith(".csv"):
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                records = list(csv.DictReader(f))
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            if isinstance(records, dict):
+                records = records.get("companies", [])
+        return self.add(records)
+
+    def save(self, path: str):
+        """Writes the corpus (including incremental additions) as JSON, atomically."""
+        tmp_path = path + ".tmp"
+        with self._lock:
+            records = list(self.records)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # --- SEARCH ---
+
+    def _build(self):
+        """Flattens the documents into arrays and computes IDF, document norms and the inverted order."""
+        np = _numpy()
+        docs = self._doc_feature_counts
+        n_docs = len(docs)
+        lengths = np.fromiter((len(d) for d in docs), dtype=np.int64, count=n_docs)
+        nnz = int(lengths.sum())
+        doc_ids = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+        feats = np.fromiter((h for d in docs for h in d), dtype=np.int64, count=nnz)
+        tfs = np.fromiter((v for d in docs for v in d.values()), dtype=np.float64, count=nnz)
+
+        unique_feats, inverse, df = np.unique(feats, return_inverse=True, return_counts=True)
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        weights = tfs * idf[inverse]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=n_docs))
+        norms[norms == 0] = 1.0
+
+        order = np.argsort(feats, kind="stable")
+        self._arrays = {
+            "n_docs": n_docs,
+            "feats_sorted": feats[order],
+            "docs_sorted": doc_ids[order],
+            "weights_sorted": weights[order],
+            "unique_feats": unique_feats,
+            "idf": idf,
+            "norms": norms,
+        }
+
+    def search(self, text: str, top_k: int = 5, min_score: float = 0.0) -> list[tuple[dict, float]]:
+        """Returns up to top_k (company, cosine similarity) pairs, best first."""
+        np = _numpy()
+        with self._lock:
+            if not self.records:
+                return []
+            if self._arrays is None:
+                self._build()
+            a = self._arrays
+            records = self.records
+
+        query = _features(text, self.dim_mask)
+        if not query:
+            return []
+        q_feats = np.fromiter(query.keys(), dtype=np.int64, count=len(query))
+        q_tfs = 1.0 + np.log(np.fromiter(query.values(), dtype=np.float64, count=len(query)))
+
+        # Only features that occur in the corpus contribute to a dot product
+        pos = np.searchsorted(a["unique_feats"], q_feats)
+        pos = np.minimum(pos, len(a["unique_feats"]) - 1)
+        known = a["unique_feats"][pos] == q_feats
+        idf_q = np.where(known, a["idf"][pos], np.log(1.0 + a["n_docs"]) + 1.0)
+        q_weights = q_tfs * idf_q
+        q_norm = float(np.sqrt((q_weights ** 2).sum())) or 1.0
+
+        starts = np.searchsorted(a["feats_sorted"], q_feats[known], side="left")
+        ends = np.searchsorted(a["feats_sorted"], q_feats[known], side="right")
+        if not len(starts) or not (ends - starts).sum():
+            return []
+        spans = [np.arange(s, e) for s, e in zip(starts, ends)]
+        entry_idx = np.concatenate(spans)
+        entry_q = np.repeat(q_weights[known], ends - starts)
+        scores = np.bincount(a["docs_sorted"][entry_idx],
+                             weights=a["weights_sorted"][entry_idx] * entry_q, minlength=a["n_docs"])
+        scores /= a["norms"] * q_norm
+
+        k = min(top_k, a["n_docs"])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(records[i], float(scores[i])) for i in top if scores[i] > min_score]
+
+
+_index: CompanyIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_company_index(path: str = DEFAULT_CORPUS_PATH) -> CompanyIndex:
+    """Returns the process-wide index, loading the corpus file on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CompanyIndex()
+            if os.path.exists(path):
+                _index.load(path)
+        return _index
@@ -1,7 +1,21 @@
+import logging
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, integer, obj, string
+
+logger = logging.getLogger(__name__)
 
 class CompetitorRankAgent(BaseAgent):
     """Agent to rank competitors based on their strengths and weaknesses."""
+    output_schema = obj({
+        "ranked_competitors": array(obj({
+            "rank": integer(),
+            "name": string(),
+            "strengths": array(string()),
+            "weaknesses": array(string()),
+        })),
+        "explanation": string(),
+    })
+    max_output_tokens = 1200
 
     def rank_competitors(self, competitors: list[dict]) -> dict:
         """
@@ -13,7 +27,7 @@ class CompetitorRankAgent(BaseAgent):
         Returns:
             dict: A JSON object containing the ranked competitors and an explanation of the ranking process.
         """
-        print(f"Agent [CompetitorRank]: Ranking competitors: {competitors}")
+        logger.info("Agent [CompetitorRank]: Ranking competitors: %s", competitors)
 
         try:
             # Prompt construction
@@ -44,12 +58,12 @@ class CompetitorRankAgent(BaseAgent):
 
             # Validate and return response
             if response:
-                print(f"Agent [CompetitorRank]: Successfully ranked competitors: {response}")
+                logger.debug("Agent [CompetitorRank]: Successfully ranked competitors: %s", response)
                 return response
             else:
                 raise ValueError("No response from LLM.")
         except Exception as e:
-            print(f"Agent [CompetitorRank] Error: {e}")
+            logger.warning("Agent [CompetitorRank] Error: %s", e)
             return {
                 "ranked_competitors": [],
                 "explanation": "An error occurred while ranking competitors."
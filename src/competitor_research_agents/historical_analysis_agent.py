@@ -1,7 +1,80 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, obj, string
+from Agents.rate_limiter import bind_meter
+from Agents.result_cache import ResultCache, content_key, get_cache
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the prompt changes, so cached histories from older prompts are not reused
+PROMPT_VERSION = 1
+HISTORICAL_CACHE_TTL = float(os.getenv("HISTORICAL_CACHE_TTL_DAYS", 30)) * 86400
+
 
 class HistoricalAnalysisAgent(BaseAgent):
-    """Agent to analyze historical trends and key events of competitors."""
+    """
+    Agent to analyze historical trends and key events of competitors.
+
+    Every company is asked about in its own request, run concurrently, so one slow or
+    failed answer only loses that company. With the shared caches enabled (AGENT_CACHE=1), or
+    a cache passed in, answers are cached per company and year range, so competitors that
+    were already analyzed for an earlier deck cost no call.
+    """
+    output_schema = obj({
+        "company": string(),
+        "last_x_years_revenue_growth": string(),
+        "notable_events": array(string()),
+        "explanation": string(),
+    })
+    max_output_tokens = 500
+
+    def __init__(self, model: str, api_key: str, site_url: str = None, site_name: str = None,
+                 max_workers: int = int(os.getenv("HISTORICAL_WORKERS", 4)), cache: ResultCache | None = None):
+        super().__init__(model, api_key, site_url, site_name)
+        self.max_workers = max_workers
+        self.cache = cache
+
+    def _company_history(self, company: str, years: int) -> dict | None:
+        """Returns {"company", "last_x_years_revenue_growth", "notable_events", "explanation"} or None."""
+        cache = self.cache or get_cache("historical_insights", ttl_seconds=HISTORICAL_CACHE_TTL)
+        key = content_key(PROMPT_VERSION, self.model, " ".join(company.lower().split()), years)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            return cached
+
+        prompt = f"""
+        You are an expert market researcher. Analyze the key historical trends (revenue growth, events, etc.) of the company '{company}' over the past {years} years.
+
+        Provide your response as a JSON object:
+        {{
+            "company": "{company}",
+            "last_x_years_revenue_growth": "<percentage>",
+            "notable_events": ["<list of important events>"],
+            "explanation": "Summarize how the historical insights were derived."
+        }}
+        """
+        messages = [
+            {"role": "system", "content": "You are assisting with historical trend analysis."},
+            {"role": "user", "content": prompt}
+        ]
+        response = self._send_llm_request(messages)
+        if not response or not isinstance(response, dict):
+            return None
+        insight = {
+            "company": company,
+            "last_x_years_revenue_growth": response.get("last_x_years_revenue_growth"),
+            "notable_events": response.get("notable_events") or [],
+            "explanation": response.get("explanation") or "",
+        }
+        if not insight["last_x_years_revenue_growth"]:
+            # A partial answer is still reported, but not cached, so it is asked again next time
+            logger.warning("Agent [HistoricalAnalysis]: No revenue growth reported for '%s'", company)
+        elif cache is not None:
+            cache.set(key, insight)
+        return insight
 
     def find_historical_similar_companies(self, companies: list[str], years: int) -> dict:
         """
@@ -14,43 +87,43 @@ class HistoricalAnalysisAgent(BaseAgent):
         Returns:
             dict: Insights and explanation on historical trends of competitors.
         """
-        print(f"Agent [HistoricalAnalysis]: Analyzing historical data for companies: {companies} over the last {years} years.")
-
-        try:
-            # Prompt construction
-            prompt = f"""
-            You are an expert market researcher. Analyze the following companies' key historical trends (revenue growth, events, etc.) over the past {years} years:
-
-            Companies:
-            {", ".join(companies)}
-
-            Provide your response as a JSON object:
-            {{
-                "historical_insights": [
-                    {{
-                        "company": "<company name>",
-                        "last_x_years_revenue_growth": "<percentage>",
-                        "notable_events": ["<list of important events>"]
-                    }}
-                ],
-                "explanation": "Summarize how the historical insights were derived."
-            }}
-            """
-            messages = [
-                {"role": "system", "content": "You are assisting with historical trend analysis."},
-                {"role": "user", "content": prompt}
-            ]
-            response = self._send_llm_request(messages)
-
-            # Validate and return response
-            if response:
-                print(f"Agent [HistoricalAnalysis]: Successfully retrieved historical insights: {response}")
-                return response
-            else:
-                raise ValueError("No response from LLM.")
-        except Exception as e:
-            print(f"Agent [HistoricalAnalysis] Error: {e}")
-            return {
-                "historical_insights": [],
-                "explanation": "An error occurred while fetching historical trends."
-            }
\ No newline at end of file
+        logger.info("Agent [HistoricalAnalysis]: Analyzing historical data for companies: %s over the last %s years.",
+                    companies, years)
+
+        # Case-insensitive de-duplication, keeping the first spelling and the input order
+        unique, seen = [], set()
+        for company in companies or []:
+            name = " ".join((company or "").lower().split())
+            if name and name not in seen:
+                seen.add(name)
+                unique.append(company.strip())
+        if not unique:
+            return {"historical_insights": [], "explanation": "No companies were given for historical analysis."}
+
+        def analyze(company: str) -> dict | None:
+            try:
+                return self._company_history(company, years)
+            except Exception as e:
+                logger.warning("Agent [HistoricalAnalysis] Error for '%s': %s", company, e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(unique)))) as pool:
+            results = list(pool.map(bind_meter(analyze), unique))
+
+        insights, explanations, failed = [], [], []
+        for company, result in zip(unique, results):
+            if result is None:
+                failed.append(company)
+                continue
+            insights.append({key: result[key] for key in ("company", "last_x_years_revenue_growth", "notable_events")})
+            if result.get("explanation"):
+                explanations.append(f"{company}: {result['explanation']}")
+        if failed:
+            explanations.append(f"No historical data could be retrieved for: {', '.join(failed)}.")
+
+        logger.info("Agent [HistoricalAnalysis]: Retrieved historical insights for %s of %s companies.",
+                    len(insights), len(unique))
+        return {
+            "historical_insights": insights,
+            "explanation": " ".join(explanations) or "An error occurred while fetching historical trends."
+        }
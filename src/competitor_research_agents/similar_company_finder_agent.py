@@ -1,18 +1,28 @@
 # src/competitor_research_agents/similar_company_finder_agent.py
+import logging
+from competitor_research_agents.company_index import get_company_index
+
+logger = logging.getLogger(__name__)
+
 
 class SimilarCompanyFinderAgent:
-    """Agent to find similar companies based on input text."""
+    """Agent to find similar companies based on input text, using the local company similarity index."""
 
-    def __init__(self, model: str, api_key: str):
+    def __init__(self, model: str, api_key: str, top_k: int = 5, min_score: float = 0.05):
         """
         Initialize the agent with the required LLM model and API Key.
 
         Args:
             model (str): The LLM model to use.
             api_key (str): API key for the LLM provider.
+            top_k (int): Maximum number of similar companies to return.
+            min_score (float): Minimum cosine similarity for a company to count as similar.
         """
         self.model = model
         self.api_key = api_key
+        self.top_k = top_k
+        self.min_score = min_score
+        self.index = get_company_index()
 
     def find_similar_companies(self, text: str) -> list[str]:
         """
@@ -23,40 +33,33 @@ class SimilarCompanyFinderAgent:
 
         Returns:
             list[str]: A list of similar companies (names), or an empty list if no matches are found.
-        """
-        print(f"[SimilarCompanyFinderAgent] Finding similar companies for input text: {text}")
 
-        # Placeholder logic for utilizing LLM or search
-        # Replace this with actual API call logic for your model
+        Raises:
+            ImportError: If numpy, which the similarity index needs, is not installed.
+        """
+        logger.info("[SimilarCompanyFinderAgent] Finding similar companies for input text: %s", text)
         try:
-            response = self._mock_response(text)  # Simulated response for demonstration
-            similar_companies = response.get("similar_companies", [])
-            print(f"[SimilarCompanyFinderAgent] Found companies: {similar_companies}")
+            matches = self.index.search(text, top_k=self.top_k, min_score=self.min_score)
+            similar_companies = [company["name"] for company, _ in matches]
+            logger.info("[SimilarCompanyFinderAgent] Found companies: %s",
+                        [(company['name'], round(score, 3)) for company, score in matches])
             return similar_companies
+        except ImportError as e:
+            # A missing dependency must not read as "no competitors found"
+            logger.error("[SimilarCompanyFinderAgent] %s", e)
+            raise
         except Exception as e:
-            print(f"[SimilarCompanyFinderAgent] Error occurred: {e}")
+            logger.warning("[SimilarCompanyFinderAgent] Error occurred: %s", e)
             return []
 
-    def _mock_response(self, text: str) -> dict:
+    def add_companies(self, companies: list[dict]) -> int:
         """
-        Mock response simulating the LLM model's similar company search.
+        Adds companies to the shared index without a rebuild of the corpus file.
 
         Args:
-            text (str): The input text describing a company, industry, or context.
+            companies (list[dict]): Records with at least "name" and "description".
 
         Returns:
-            dict: A mocked response containing a list of similar companies.
+            int: The number of companies that were new to the index.
         """
-        # Simulated logic based on keywords in the text
-        mock_companies_data = {
-            "fintech": ["Stripe", "PayPal", "Square"],
-            "e-commerce": ["Amazon", "Shopify", "eBay"],
-            "software": ["Microsoft", "Google", "Oracle"],
-        }
-
-        for keyword, companies in mock_companies_data.items():
-            if keyword in text.lower():
-                return {"similar_companies": companies}
-
-        print("[SimilarCompanyFinderAgent] No matches found in mock data.")
-        return {"similar_companies": []}
\ No newline at end of file
+        return self.index.add(companies)
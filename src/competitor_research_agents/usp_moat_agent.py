@@ -1,7 +1,13 @@
+import logging
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import obj, string
+
+logger = logging.getLogger(__name__)
 
 class USPMoatAgent(BaseAgent):
     """Agent to evaluate the startup's USP and competitive moat."""
+    output_schema = obj({"USP": string(), "moat_analysis": string(), "explanation": string()})
+    max_output_tokens = 600
 
     def analyze_usps(self, startup_description: str, competitors: list[str]) -> dict:
         """
@@ -14,7 +20,8 @@ class USPMoatAgent(BaseAgent):
         Returns:
             dict: JSON object containing USP, moat analysis, and explanation.
         """
-        print(f"Agent [USPMoat]: Comparing USP for startup: {startup_description} against competitors: {competitors}")
+        logger.info("Agent [USPMoat]: Comparing USP for startup: %s against competitors: %s", startup_description,
+                    competitors)
 
         try:
             # Prompt construction
@@ -42,12 +49,12 @@ class USPMoatAgent(BaseAgent):
 
             # Validate and return response
             if response:
-                print(f"Agent [USPMoat]: Successfully retrieved USP and moat analysis: {response}")
+                logger.debug("Agent [USPMoat]: Successfully retrieved USP and moat analysis: %s", response)
                 return response
             else:
                 raise ValueError("No response from LLM.")
         except Exception as e:
-            print(f"Agent [USPMoat] Error: {e}")
+            logger.warning("Agent [USPMoat] Error: %s", e)
             return {
                 "USP": None,
                 "moat_analysis": None,
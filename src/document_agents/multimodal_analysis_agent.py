@@ -1,23 +1,52 @@
 # src/document_agents/multimodal_analysis_agent.py
 import base64
-from openai import OpenAI
+import logging
+
+from Agents.model_router import get_router
+from document_agents.slide_cache import get_slide_cache, normalize_text, perceptual_hash, text_hash
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the prompts change, so cached transcriptions from older prompts are not reused
+PROMPT_VERSION = 1
+
 
 class MultimodalAnalysisAgent:
-    """An agent that analyzes and synthesizes slide content from both text and image sources."""
+    """
+    An agent that analyzes and synthesizes slide content from both text and image sources.
+
+    Transcriptions are cached across decks by a perceptual hash of the rendered slide plus a
+    hash of its text layer, so a reused team slide or template cover is only sent once.
+    A slide without a text layer is only reused on an exact perceptual match, since nothing
+    else tells two flattened slides with different figures apart.
+    """
     def __init__(self, model: str, api_key: str):
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.router = get_router()
         self.model = model
+        self.api_key = api_key
+        self.cache = get_slide_cache()
 
-    def analyze_slide_content(self, image_bytes: bytes, extracted_text: str | None) -> str | None:
+    def analyze_slide_content(self, image_bytes, extracted_text: str | None) -> str | None:
         """
         Analyzes a slide's image and text together to create a comprehensive, unified transcription.
+        image_bytes is either the PNG bytes or a lazily loaded PageImageRef from the rasterizer.
         """
-        print("Agent [Analyzer]: Synthesizing extracted text with multimodal image analysis...")
+        logger.info("Agent [Analyzer]: Synthesizing extracted text with multimodal image analysis...")
+        cache_key = None
+        if self.cache is not None:
+            phash = perceptual_hash(image_bytes)
+            if phash is not None:
+                cache_key = (phash, text_hash(extracted_text), f"{self.model}/v{PROMPT_VERSION}")
+                max_distance = None if normalize_text(extracted_text) else 0
+                cached = self.cache.lookup(*cache_key, max_distance=max_distance)
+                if cached is not None:
+                    logger.info("Agent [Analyzer]: Reusing the cached transcription of a matching slide.")
+                    return cached
         try:
-            base64_image = base64.b64encode(image_bytes).decode('utf-8')
+            if hasattr(image_bytes, "base64"):
+                base64_image = image_bytes.base64()
+            else:
+                base64_image = base64.b64encode(image_bytes).decode('utf-8')
             
             # If no raw text was extracted, we provide a different instruction.
             if extracted_text:
@@ -36,25 +65,33 @@ class MultimodalAnalysisAgent:
             else:
                 prompt_text = "You are an expert Optical Character Recognition (OCR) system. Transcribe ALL text visible in the provided image of a presentation slide. This includes text in logos, charts, and any other graphical elements. Provide only the transcribed text without any additional commentary."
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt_text},
-                            {
-                                "type": "image_url",
-                                "image_url": { "url": f"data:image/png;base64,{base64_image}" }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=2000
+            messages = [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt_text},
+                        {
+                            "type": "image_url",
+                            "image_url": { "url": f"data:image/png;base64,{base64_image}" }
+                        }
+                    ]
+                }
+            ]
+            response = self.router.complete(
+                "MultimodalAnalysisAgent",
+                messages,
+                default_model=self.model,
+                api_key=self.api_key,
+                max_output_tokens=2000
             )
             analysis_text = response.choices[0].message.content
-            print("Agent [Analyzer]: Comprehensive analysis and synthesis complete.")
-            return analysis_text
+            logger.info("Agent [Analyzer]: Comprehensive analysis and synthesis complete.")
         except Exception as e:
-            print(f"An error occurred during multimodal synthesis: {e}")
-            return None
\ No newline at end of file
+            logger.warning("An error occurred during multimodal synthesis: %s", e)
+            return None
+        if cache_key is not None and analysis_text:
+            try:
+                self.cache.store(*cache_key, analysis_text)
+            except Exception as e:
+                logger.warning("Could not cache the slide transcription: %s", e)
+        return analysis_text
@@ -0,0 +1,199 @@
+# src/document_agents/page_rasterizer.py
+import os
+import base64
+import shutil
+import logging
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future, InvalidStateError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DPI = 150
+DEFAULT_MEMORY_BUDGET = int(os.getenv("RASTER_MEMORY_BUDGET_MB", 512)) * 1024 * 1024
+
+
+def _render_page(pdf_path: str, page_number: int, dpi: int, out_path: str) -> tuple[int, int | None]:
+    """
+    Worker-process entry point: renders one page to a PNG file and returns its size and
+    perceptual hash, which is cheapest to take from the pixmap while it is still decoded.
+    """
+    import fitz  # PyMuPDF
+    from document_agents.slide_cache import pixmap_hash
+    doc = fitz.open(pdf_path)
+    try:
+        pix = doc.load_page(page_number).get_pixmap(dpi=dpi)
+        pix.save(out_path)
+        try:
+            phash = pixmap_hash(pix)
+        except Exception:
+            phash = None
+    finally:
+        doc.close()
+    return os.path.getsize(out_path), phash
+
+
+class MemoryBudget:
+    """Process-wide budget of in-flight image bytes. acquire() blocks while the budget is exhausted."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit = limit_bytes
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, amount: int):
+        amount = min(amount, self.limit)
+        with self._cond:
+            # A single oversized request may always proceed once nothing else is in flight
+            while self._used and self._used + amount > self.limit:
+                self._cond.wait()
+            self._used += amount
+        return amount
+
+    def release(self, amount: int):
+        with self._cond:
+            self._used = max(0, self._used - amount)
+            self._cond.notify_all()
+
+    @property
+    def used(self) -> int:
+        with self._cond:
+            return self._used
+
+
+class PageImageRef:
+    """A rendered page spilled to disk. The PNG is only read when the bytes are actually needed."""
+
+    def __init__(self, path: str, size: int, reserved: int, budget: MemoryBudget, phash: int | None = None):
+        self.path = path
+        self.size = size
+        self.phash = phash
+        self._reserved = reserved
+        self._budget = budget
+        self._released = False
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def base64(self) -> str:
+        return base64.b64encode(self.read_bytes()).decode('utf-8')
+
+    def release(self):
+        """Deletes the spill file and returns its share of the memory budget."""
+        if self._released:
+            return
+        self._released = True
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self._budget.release(self._reserved)
+
+
+class PageRasterizer:
+    """
+    Renders PDF pages in a process pool, off the orchestrating thread.
+
+    Pages are written to a spill directory and handed out as lazily loaded
+    PageImageRefs. Every submitted page reserves its estimated raw pixmap size
+    from a shared memory budget until the consumer releases the reference, so a
+    fast renderer cannot run arbitrarily far ahead of slow consumers.
+    """
+
+    def __init__(self, max_workers: int | None = None, memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET,
+                 spill_dir: str | None = None):
+        self.budget = MemoryBudget(memory_budget_bytes)
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="slides_")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers or max(1, (os.cpu_count() or 2) - 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _estimate_bytes(pdf_path: str, page_number: int, dpi: int) -> int:
+        import fitz  # PyMuPDF
+        doc = fitz.open(pdf_path)
+        try:
+            rect = doc.load_page(page_number).rect
+        finally:
+            doc.close()
+        scale = dpi / 72.0
+        return int(rect.width * scale * rect.height * scale * 3)
+
+    def submit(self, pdf_path: str, page_number: int, dpi: int = DEFAULT_DPI) -> Future:
+        """Blocks until the budget allows, then schedules the render. The future yields a PageImageRef."""
+        reserved = self.budget.acquire(self._estimate_bytes(pdf_path, page_number, dpi))
+        with self._lock:
+            self._counter += 1
+            out_path = os.path.join(self.spill_dir, f"{os.getpid()}_{self._counter}_p{page_number + 1}.png")
+
+        result = Future()
+        render = self._pool.submit(_render_page, pdf_path, page_number, dpi, out_path)
+
+        def _done(f):
+            try:
+                size, phash = f.result()
+                result.set_result(PageImageRef(out_path, size, reserved, self.budget, phash))
+            except Exception as e:
+                self.budget.release(reserved)
+                result.set_exception(e)
+        render.add_done_callback(_done)
+        return result
+
+    def prefetch(self, pdf_path: str, page_numbers: list[int], dpi: int = DEFAULT_DPI) -> dict[int, Future]:
+        """
+        Schedules pages from a background feeder thread, so the caller never blocks on the budget.
+        Returns {page_number: Future[PageImageRef]}; each future resolves once its page is rendered.
+        Cancelling a future skips its page, or releases it as soon as it is rendered.
+        """
+        futures = {page_number: Future() for page_number in page_numbers}
+
+        def _hand_over(inner: Future, target: Future):
+            try:
+                if inner.exception() is not None:
+                    target.set_exception(inner.exception())
+                else:
+                    target.set_result(inner.result())
+            except InvalidStateError:
+                # The consumer cancelled the page while it was rendering
+                if inner.exception() is None:
+                    inner.result().release()
+
+        def _feed():
+            for page_number in page_numbers:
+                target = futures[page_number]
+                if target.cancelled():
+                    continue
+                try:
+                    inner = self.submit(pdf_path, page_number, dpi)
+                except Exception as e:
+                    if not target.cancelled():
+                        target.set_exception(e)
+                    continue
+                inner.add_done_callback(lambda f, target=target: _hand_over(f, target))
+
+        threading.Thread(target=_feed, name="raster-feeder", daemon=True).start()
+        return futures
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+_rasterizer: PageRasterizer | None = None
+_rasterizer_lock = threading.Lock()
+
+
+def get_rasterizer() -> PageRasterizer:
+    """Returns the process-wide rasterizer, so concurrent jobs share one pool and one memory budget."""
+    global _rasterizer
+    with _rasterizer_lock:
+        if _rasterizer is None:
+            _rasterizer = PageRasterizer()
+            logger.info("Started page rasterizer pool (spill dir: %s)", _rasterizer.spill_dir)
+        return _rasterizer
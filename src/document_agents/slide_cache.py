@@ -0,0 +1,202 @@
+# src/document_agents/slide_cache.py
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing, contextmanager
+
+from report_store import REPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLIDE_CACHE_PATH = os.getenv("SLIDE_CACHE_PATH", os.path.join(REPORTS_DIR, "slide_cache.sqlite3"))
+# Largest Hamming distance (of 64 bits) at which two renders count as the same slide. The four
+# 16-bit bands guarantee that every match up to a distance of 3 shares at least one band.
+DEFAULT_MAX_DISTANCE = int(os.getenv("SLIDE_CACHE_MAX_DISTANCE", 3))
+
+# dHash grid: 9x8 cells give 8 horizontal gradients per row, 64 bits in total
+HASH_COLUMNS, HASH_ROWS = 9, 8
+# Pixmaps are halved until they are below this width, so averaging the cells stays cheap
+_SHRINK_TARGET = 128
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slide_transcriptions (
+    text_hash TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    phash TEXT NOT NULL,
+    band0 INTEGER NOT NULL,
+    band1 INTEGER NOT NULL,
+    band2 INTEGER NOT NULL,
+    band3 INTEGER NOT NULL,
+    transcription TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (text_hash, variant, phash)
+);
+"""
+
+
+def pixmap_hash(pix) -> int:
+    """64-bit difference hash (dHash) of a PyMuPDF pixmap: does each cell get darker to its right?"""
+    import fitz  # PyMuPDF
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    else:
+        pix = fitz.Pixmap(pix)  # shrink() works in place; leave the caller's pixmap alone
+    while pix.width >= _SHRINK_TARGET and pix.height >= _SHRINK_TARGET:
+        pix.shrink(1)
+    return _dhash(pix.samples, pix.width, pix.height, pix.stride)
+
+
+def _dhash(samples: bytes, width: int, height: int, stride: int) -> int:
+    cells = []
+    for row in range(HASH_ROWS):
+        y0 = row * height // HASH_ROWS
+        y1 = max((row + 1) * height // HASH_ROWS, y0 + 1)
+        for col in range(HASH_COLUMNS):
+            x0 = col * width // HASH_COLUMNS
+            x1 = max((col + 1) * width // HASH_COLUMNS, x0 + 1)
+            total = sum(sum(samples[y * stride + x0:y * stride + x1]) for y in range(y0, y1))
+            cells.append(total / ((y1 - y0) * (x1 - x0)))
+    bits = 0
+    for row in range(HASH_ROWS):
+        for col in range(HASH_COLUMNS - 1):
+            left, right = cells[row * HASH_COLUMNS + col], cells[row * HASH_COLUMNS + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def perceptual_hash(image) -> int | None:
+    """
+    Perceptual hash of a rendered slide: PNG bytes, or a PageImageRef (which may carry the
+    hash computed by the rasterizer already). None if the image cannot be decoded.
+    """
+    phash = getattr(image, "phash", None)
+    if phash is not None:
+        return phash
+    try:
+        import fitz  # PyMuPDF
+        data = image.read_bytes() if hasattr(image, "read_bytes") else image
+        return pixmap_hash(fitz.Pixmap(data))
+    except Exception as e:
+        logger.warning("Could not hash slide image: %s", e)
+        return None
+
+
+def normalize_text(text: str | None) -> str:
+    return " ".join((text or "").split())
+
+
+def text_hash(text: str | None) -> str:
+    """Hash of a page's text layer, insensitive to whitespace and line breaks."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(phash: int) -> tuple[int, int, int, int]:
+    return tuple((phash >> shift) & 0xFFFF for shift in (48, 32, 16, 0))
+
+
+class SlideTranscriptionCache:
+    """
+    Persistent, SQLite-backed store of slide transcriptions, shared across decks.
+
+    An entry is keyed by the text-layer hash of the page, a variant (model and prompt
+    version of the transcribing agent) and the perceptual hash of the rendered slide.
+    A lookup matches the text hash exactly and the perceptual hash within max_distance
+    bits, so the same slide rendered at another DPI, or re-exported by another tool,
+    still hits, while a slide with different numbers in its text layer never does.
+    Slides without a text layer (flattened or image-only) all share one text hash, so
+    for them the caller should ask for an exact perceptual match (max_distance=0).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_SLIDE_CACHE_PATH, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.db_path = db_path
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is always closed."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+
+    def lookup(self, phash: int, text_digest: str, variant: str, max_distance: int | None = None) -> str | None:
+        """
+        Returns the transcription of the closest stored slide within max_distance (default:
+        the cache's own), or None.
+        """
+        max_distance = self.max_distance if max_distance is None else max_distance
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT phash, transcription FROM slide_transcriptions WHERE text_hash = ? AND variant = ? "
+                "AND (band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?)",
+                (text_digest, variant, *_bands(phash))
+            ).fetchall()
+            best = min(rows, key=lambda row: hamming(phash, int(row["phash"], 16)), default=None)
+            hit = best is not None and hamming(phash, int(best["phash"], 16)) <= max_distance
+            if hit:
+                conn.execute("UPDATE slide_transcriptions SET hits = hits + 1 "
+                             "WHERE text_hash = ? AND variant = ? AND phash = ?",
+                             (text_digest, variant, best["phash"]))
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return best["transcription"] if hit else None
+
+    def store(self, phash: int, text_digest: str, variant: str, transcription: str):
+        if not transcription:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO slide_transcriptions "
+                "(text_hash, variant, phash, band0, band1, band2, band3, transcription, created_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (text_digest, variant, f"{phash:016x}", *_bands(phash), transcription, time.time())
+            )
+
+    def invalidate(self, variant: str | None = None) -> int:
+        """Drops all entries, or those of one variant, so those slides are transcribed again."""
+        with self._connect() as conn:
+            if variant:
+                return conn.execute("DELETE FROM slide_transcriptions WHERE variant = ?", (variant,)).rowcount
+            return conn.execute("DELETE FROM slide_transcriptions").rowcount
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM slide_transcriptions").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": entries, "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+_slide_cache: SlideTranscriptionCache | None = None
+_slide_cache_lock = threading.Lock()
+
+
+def get_slide_cache() -> SlideTranscriptionCache | None:
+    """Returns the process-wide transcription cache, or None when it is disabled (SLIDE_CACHE=0)."""
+    global _slide_cache
+    if os.getenv("SLIDE_CACHE", "1") != "1":
+        return None
+    with _slide_cache_lock:
+        if _slide_cache is None:
+            _slide_cache = SlideTranscriptionCache()
+        return _slide_cache
@@ -0,0 +1,205 @@
+# src/job_queue.py
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+from report_store import REPORTS_DIR
+
+DEFAULT_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(REPORTS_DIR, "job_queue.sqlite3"))
+DEFAULT_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 120))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    group_id TEXT,
+    pdf_path TEXT NOT NULL,
+    params TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker_id TEXT,
+    lease_expires REAL,
+    created_at TEXT,
+    updated_at TEXT,
+    report_path TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_group ON jobs(group_id);
+"""
+
+
+class JobQueue:
+    """
+    Durable, SQLite-backed queue of document analysis jobs with leases.
+
+    A worker that claims a job holds a lease on it and must renew it with heartbeat()
+    while it works. If a worker dies, its lease runs out and the next claim() hands the
+    job to another worker, so every job runs at least once. Workers on several hosts can
+    share the queue as long as they share the database file (SQLite locking must work on it).
+    Re-runs are cheap because the orchestrator resumes from the job's journal.
+
+    Status flow: queued -> running -> done | failed (retried as queued while attempts remain).
+    A job deferred by a worker (defer()) is queued again without using up an attempt and is
+    not handed out before its hold-off has passed.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """An autocommit connection that is always closed on exit."""
+        with closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None)) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row | None) -> dict | None:
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"]) if job["params"] else {}
+        return job
+
+    # --- PRODUCERS ---
+
+    def enqueue(self, pdf_path: str, params: dict | None = None, job_id: str | None = None,
+                group_id: str | None = None, max_attempts: int = 3) -> str:
+        """Adds a job and returns its id. Re-enqueuing an existing id is a no-op."""
+        job_id = job_id or uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, group_id, pdf_path, params, status, max_attempts, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, group_id, pdf_path, json.dumps(params or {}), max_attempts, now, now)
+            )
+        return job_id
+
+    # --- WORKERS ---
+
+    def claim(self, worker_id: str) -> dict | None:
+        """
+        Leases the oldest queued job, or a running job whose lease has expired, to this worker.
+        Expired jobs that already used up their attempts are marked failed instead.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Lease expired after the last attempt', "
+                    "updated_at = ? WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                    (datetime.now().isoformat(), now)
+                )
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE (status = 'queued' AND (lease_expires IS NULL OR lease_expires < ?)) "
+                    "OR (status = 'running' AND lease_expires < ?) ORDER BY created_at LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                    (worker_id, now + self.lease_seconds, datetime.now().isoformat(), row["job_id"])
+                )
+                job = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+                conn.execute("COMMIT")
+                return self._row_to_job(job)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Renews the lease. A job deferred while this worker was still running it (see defer())
+        is taken back. Returns False if the job is another worker's (e.g. it was reclaimed).
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND ((worker_id = ? AND status = 'running') "
+                "OR (worker_id IS NULL AND status = 'queued' AND lease_expires IS NOT NULL))",
+                (worker_id, time.time() + self.lease_seconds, datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, report_path: str | None = None) -> bool:
+        """Marks the job done; also accepted for a job that was deferred while this worker finished it."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', worker_id = ?, report_path = ?, error = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE job_id = ? AND ((worker_id = ? AND status = 'running') "
+                "OR (worker_id IS NULL AND status = 'queued' AND lease_expires IS NOT NULL))",
+                (worker_id, report_path, datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """Records a failure; the job is queued again while it has attempts left (and retry is set)."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "error = ?, worker_id = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (1 if retry else 0, error, datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def defer(self, job_id: str, worker_id: str, reason: str, delay_seconds: float | None = None) -> bool:
+        """
+        Hands a claimed job back without using up an attempt, e.g. because another run still
+        holds its journal. It is not claimed again for delay_seconds (default: one lease period),
+        which gives the run still working on it time to finish, renew or lose its lease.
+        """
+        delay_seconds = self.lease_seconds if delay_seconds is None else delay_seconds
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), error = ?, worker_id = NULL, "
+                "lease_expires = ?, updated_at = ? WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (reason, time.time() + delay_seconds, datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    # --- QUERIES ---
+
+    def get(self, job_id: str) -> dict | None:
+        with self._connect() as conn:
+            return self._row_to_job(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone())
+
+    def list_group(self, group_id: str) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE group_id = ? ORDER BY created_at, job_id",
+                                (group_id,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Returns the process-wide queue handle."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,105 @@
+# src/logging_config.py
+"""
+Process-wide logging setup.
+
+Modules log through their own logger (logging.getLogger(__name__)) with lazy %-style
+arguments, so messages below the active level are never formatted. configure_logging()
+routes every record through a QueueHandler to a single listener thread, which does the
+(blocking) stream I/O off the agents' threads.
+
+Environment:
+    LOG_LEVEL    root level (default INFO)
+    LOG_LEVELS   per-logger levels, e.g. "validation_agents=DEBUG,Agents.search_agent=WARNING"
+    LOG_FORMAT   "text" (default) or "json" (one JSON object per line)
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+# Standard LogRecord attributes; anything else on a record came in through extra= and is emitted as a field
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+_configure_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line: time, level, logger, message and any extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class LazyJson:
+    """Defers json.dumps of a (large) value until a handler actually formats the record."""
+
+    __slots__ = ("value", "indent", "limit")
+
+    def __init__(self, value, indent: int | None = None, limit: int | None = None):
+        self.value = value
+        self.indent = indent
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = json.dumps(self.value, indent=self.indent, default=str, ensure_ascii=False)
+        return text if self.limit is None or len(text) <= self.limit else text[:self.limit] + "..."
+
+
+def _parse_levels(spec: str) -> dict[str, int]:
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        if level and isinstance(logging.getLevelName(level.strip().upper()), int):
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def configure_logging(level: str | None = None, levels: dict[str, str] | None = None,
+                      fmt: str | None = None, stream=None):
+    """
+    Installs the queue-based root handler once per process (later calls only adjust levels).
+
+    Args:
+        level: Root level name; defaults to LOG_LEVEL or INFO.
+        levels: Per-logger level names, merged over LOG_LEVELS.
+        fmt: "text" or "json"; defaults to LOG_FORMAT or text.
+        stream: Output stream of the listener (default stderr).
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    per_logger = _parse_levels(os.getenv("LOG_LEVELS", ""))
+    per_logger.update({name: logging.getLevelName(lvl.upper()) for name, lvl in (levels or {}).items()})
+    for name, lvl in per_logger.items():
+        logging.getLogger(name).setLevel(lvl)
+
+    with _configure_lock:
+        if _listener is not None:
+            return
+        handler = logging.StreamHandler(stream or sys.stderr)
+        json_format = (fmt or os.getenv("LOG_FORMAT", "text")).lower() == "json"
+        handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(logging.handlers.QueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
@@ -1,21 +1,44 @@
-from fastapi import FastAPI, Form, UploadFile, File, Body
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import FastAPI, Form, UploadFile, File, Body, Request
+from fastapi.responses import JSONResponse, StreamingResponse, FileResponse, Response
+import re
 import uuid
 from dotenv import load_dotenv
 import os
-from typing import List as TList, Optional, Dict
-from supabase import create_client, Client
+import sys
+import logging
+import threading
+from typing import List as TList, Optional, Dict, TYPE_CHECKING
 from fastapi.middleware.cors import CORSMiddleware
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from report_store import ReportStore
+from report_renderer import ReportRenderer
+from job_queue import get_job_queue
+from logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Load base .env first
 load_dotenv(".env")
+configure_logging()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_BUCKET = os.getenv("SUPABASE_BUCKET")
 SUPABASE_FOLDER = os.getenv("SUPABASE_FOLDER", "")  # optional subfolder
 
-_supabase_client: Optional[Client] = None
+_supabase_client: Optional["Client"] = None
+_report_store: Optional[ReportStore] = None
+_report_store_lock = threading.Lock()
+_report_renderer: Optional[ReportRenderer] = None
+
+_JOB_ID_RE = re.compile(r"^\w[\w.\-]*$")
+UPLOAD_DIR = os.path.join("reports", "uploads")
+# Default per-deck SLA for /start requests that do not set their own budget
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", 0)) or None
 
 app = FastAPI()
 
@@ -29,16 +52,70 @@ app.add_middleware(
 )
 
 
-def get_supabase() -> Client:
+def get_supabase() -> "Client":
     """Create or return a cached Supabase client using service role key."""
     global _supabase_client
     if _supabase_client is None:
+        from supabase import create_client
         if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
             raise RuntimeError("Supabase env vars missing: SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.")
         _supabase_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
     return _supabase_client
 
 
+def get_report_store() -> ReportStore:
+    """Create or return the cached report index, picking up any new report files."""
+    global _report_store
+    # Endpoints run in FastAPI's threadpool, so two first calls may race to create it
+    with _report_store_lock:
+        if _report_store is None:
+            store = ReportStore()
+            store.ingest_directory()
+            _report_store = store
+        return _report_store
+
+
+def get_report_renderer() -> ReportRenderer:
+    """Create or return the cached PDF renderer."""
+    global _report_renderer
+    if _report_renderer is None:
+        _report_renderer = ReportRenderer(store=get_report_store())
+    return _report_renderer
+
+
+def _parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """
+    Parses a single "bytes=start-end" range. Returns (start, end) inclusive, or None if
+    the range cannot be satisfied. Raises ValueError for syntax we do not serve (e.g. multiple ranges).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError(header)
+    start_str, _, end_str = spec.strip().partition("-")
+    if not start_str:
+        suffix = int(end_str)
+        if suffix <= 0:
+            return None
+        return max(0, size - suffix), size - 1
+    start = int(start_str)
+    end = min(int(end_str), size - 1) if end_str else size - 1
+    if start >= size or end < start:
+        return None
+    return start, end
+
+
+def _iter_file(path: str, start: int, end: int, chunk_size: int = 64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 def list_all_files(bucket: str, folder: str = "") -> TList[str]:
         """List all file paths within a bucket/folder recursively."""
         sb = get_supabase()
@@ -79,7 +156,7 @@ def list_all_files(bucket: str, folder: str = "") -> TList[str]:
 
 def download_file_bytes(bucket: str, path: str) -> bytes:
     """Download a storage object as bytes."""
-    print(f"Downloading {bucket}/{path}")
+    logger.info("Downloading %s/%s", bucket, path)
     sb = get_supabase()
     # The download method returns the bytes directly.
     return sb.storage.from_(bucket).download(path)
@@ -87,9 +164,11 @@ def download_file_bytes(bucket: str, path: str) -> bytes:
 
 @app.post("/start")
 async def start_analysis(
-        context: str = Form(...)
+        context: str = Form(...),
+        deadline_seconds: Optional[float] = Form(None),
+        token_budget: Optional[int] = Form(None)
 ):
-    print("Starting Analysis with context:", context[:80])
+    logger.info("Starting Analysis with context: %s", context[:80])
 
     # Download all files from the specified folder in the bucket
     file_blobs = {}
@@ -98,7 +177,7 @@ async def start_analysis(
         paths = list_all_files(SUPABASE_BUCKET, SUPABASE_FOLDER)
 
         if not paths:
-            print("No files found in the configured bucket/folder.")
+            logger.info("No files found in the configured bucket/folder.")
             return JSONResponse({"detail": "No files found in the configured bucket/folder"}, status_code=404)
 
         # 2. Download each file and store it in a dictionary
@@ -106,34 +185,145 @@ async def start_analysis(
             try:
                 blob = download_file_bytes(SUPABASE_BUCKET, p)
                 file_blobs[p] = blob
-                print(f"Successfully downloaded file: {p}")
+                logger.info("Successfully downloaded file: %s", p)
             except Exception as e:
-                print(f"Failed to download {p}: {e}")
+                logger.warning("Failed to download %s: %s", p, e)
                 return JSONResponse({"detail": f"Failed to download {p}: {e}"}, status_code=400)
 
-        # 3. TODO: Integrate with your agents. Example:
-        # results = run_document_agents(file_blobs, context=context)
+        # 3. Hand the decks to the worker fleet (src/analysis_worker.py) through the job queue
+        job_id = str(uuid.uuid4())
+        budget = {"seconds": deadline_seconds or DEFAULT_DEADLINE_SECONDS, "tokens": token_budget}
+        if not enqueue_decks(job_id, file_blobs, context, budget):
+            return JSONResponse({"detail": "No PDF files found in the configured bucket/folder"}, status_code=400)
 
     except Exception as e:
-        print(f"Error during analysis: {e}")
+        logger.warning("Error during analysis: %s", e)
         return JSONResponse({"detail": f"An unexpected error occurred during analysis: {e}"}, status_code=500)
 
     return JSONResponse({
-        "jobId": str(uuid.uuid4()),
-        "agents": [
-            {"name": "Market Fit Agent", "status": "queued", "progress": 0},
-            {"name": "Financials Agent", "status": "queued", "progress": 0},
-            {"name": "Tech Diligence Agent", "status": "queued", "progress": 0},
-        ]
+        "jobId": job_id,
+        "agents": job_statuses(job_id)
     })
 
 
-# Minimal status endpoint so the frontend polling succeeds
+def enqueue_decks(group_id: str, file_blobs: Dict[str, bytes], context: str,
+                  budget: Optional[Dict] = None) -> TList[str]:
+    """
+    Stores the uploaded PDFs and queues one analysis job per deck under the request's job id.
+    budget ({"seconds", "tokens"}) bounds each deck's analysis.
+    """
+    pdfs = [(p, blob) for p, blob in file_blobs.items() if p.lower().endswith(".pdf")]
+    directory = os.path.join(UPLOAD_DIR, group_id)
+    os.makedirs(directory, exist_ok=True)
+    queue = get_job_queue()
+    job_ids = []
+    for i, (path, blob) in enumerate(pdfs):
+        local_path = os.path.abspath(os.path.join(directory, f"{i}_{os.path.basename(path)}"))
+        with open(local_path, 'wb') as f:
+            f.write(blob)
+        # A single deck gets the request's id itself, so /report/{jobId}.pdf finds its journal
+        job_id = group_id if len(pdfs) == 1 else f"{group_id}_{i}"
+        params = {"context": context}
+        if budget and (budget.get("seconds") or budget.get("tokens")):
+            params["budget"] = budget
+        job_ids.append(queue.enqueue(local_path, params, job_id=job_id, group_id=group_id))
+    return job_ids
+
+
+_PROGRESS = {"queued": 0, "running": 50, "done": 100, "failed": 100}
+
+
+def job_statuses(group_id: str) -> TList[Dict]:
+    """Queue state of every deck in a request, in the frontend's AgentStatus shape."""
+    return [
+        {"name": os.path.basename(job["pdf_path"]).split("_", 1)[-1], "status": job["status"],
+         "progress": _PROGRESS.get(job["status"], 0), "jobId": job["job_id"]}
+        for job in get_job_queue().list_group(group_id)
+    ]
+
+
 @app.get("/status/{job_id}")
-async def get_status(job_id: str) -> TList[Dict]:
-    # Return a simple simulated progress
+def get_status(job_id: str) -> TList[Dict]:
+    statuses = job_statuses(job_id)
+    if statuses:
+        return statuses
+    # Unknown ids (e.g. from demo mode) get a simple simulated progress
     return [
         {"name": "Market Fit Agent", "status": "running", "progress": 40},
         {"name": "Financials Agent", "status": "queued", "progress": 0},
         {"name": "Tech Diligence Agent", "status": "queued", "progress": 0},
-    ]
\ No newline at end of file
+    ]
+
+
+@app.get("/reports/search")
+def search_reports(
+        q: Optional[str] = None,
+        conclusion: Optional[str] = None,
+        segment: Optional[str] = None,
+        region: Optional[str] = None,
+        competitor: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+) -> TList[Dict]:
+    """
+    Full-text and filtered search across all indexed reports. A plain def, so FastAPI runs the
+    SQLite query (and the first call's directory scan) in its threadpool, off the event loop.
+    """
+    return get_report_store().search(
+        text=q, conclusion=conclusion, segment=segment, region=region, competitor=competitor,
+        date_from=date_from, date_to=date_to, limit=min(limit, 200), offset=offset
+    )
+
+
+@app.post("/reports/reindex")
+def reindex_reports() -> Dict:
+    """Index report files written to reports/ since the last scan."""
+    return {"indexed": get_report_store().ingest_directory()}
+
+
+@app.get("/report/{job_id}.pdf")
+def get_report_pdf(job_id: str, request: Request):
+    """
+    Serves the PDF rendering of a finished (or journaled) report. PDFs are cached by the
+    hash of the report content, which is also the ETag; single byte ranges are supported.
+    """
+    if not _JOB_ID_RE.match(job_id):
+        return JSONResponse({"detail": "Report not found"}, status_code=404)
+    try:
+        rendered = get_report_renderer().render_job(job_id)
+    except Exception as e:
+        logger.warning("Error rendering report %s: %s", job_id, e)
+        return JSONResponse({"detail": f"Could not render report: {e}"}, status_code=500)
+    if rendered is None:
+        return JSONResponse({"detail": "Report not found"}, status_code=404)
+
+    path, digest = rendered
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=0, must-revalidate",
+        "Content-Disposition": f'inline; filename="{job_id}.pdf"',
+    }
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    size = os.path.getsize(path)
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) == etag:
+        try:
+            byte_range = _parse_byte_range(range_header, size)
+        except ValueError:
+            byte_range = (0, size - 1)
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = byte_range
+        if (start, end) != (0, size - 1):
+            return StreamingResponse(
+                _iter_file(path, start, end), status_code=206, media_type="application/pdf",
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}",
+                         "Content-Length": str(end - start + 1)}
+            )
+    return FileResponse(path, media_type="application/pdf", headers=headers)
@@ -1,57 +1,121 @@
 import os
 import json
 import sys
-import fitz
 import logging
+from contextlib import closing, nullcontext
 from datetime import datetime
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from document_agents.pdf_extractor_agent import PdfExtractorAgent
-from document_agents.multimodal_analysis_agent import MultimodalAnalysisAgent
-from document_agents.triage_agent import TriageAgent
-from orchestrator_validation import ValidationOrchestrator
-from orchestrator_market_insight import MarketInsightOrchestrator
-from orchestrator_competitor_research import CompetitorResearchOrchestrator
+# Agents, orchestrators and their SDKs (fitz, openai, tavily) are imported on first use,
+# so importing this module, e.g. from the API, stays cheap.
+from agent_registry import get_registry
+from analysis_budget import AnalysisBudget, materiality_score
+from logging_config import configure_logging
+from document_agents.page_rasterizer import DEFAULT_DPI
+from document_agents.slide_cache import get_slide_cache
+from report_journal import ReportJournal, JournalLockedError, compute_job_id
+from report_store import ReportStore
+from Agents.rate_limiter import limiter_stats
+from Agents.model_router import DEFAULT_MODEL, get_router
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Under a budget, pages are rendered only this far ahead, so a lowered DPI takes effect quickly
+PREFETCH_LOOKAHEAD = 4
 
 
 class DocumentAnalysisOrchestrator:
-    def __init__(self):
+    """
+    Runs the full analysis of one pitch deck. Construction is cheap: agents and
+    sub-orchestrators are built on first use and shared process-wide through the
+    agent registry, so one instance (see get_document_orchestrator) serves every request.
+    """
+
+    def __init__(self, fused: bool | None = None):
         load_dotenv()
         self.llm_api_key = os.getenv("API_KEY")
         self.tavily_api_key = os.getenv("TAVILY_API_KEY")
-        self.model = "openrouter/sonoma-sky-alpha"
+        # Per-agent overrides and fallbacks come from the model routing table (MODEL_ROUTES_PATH)
+        self.model = os.getenv("DEFAULT_MODEL", DEFAULT_MODEL)
 
         if not self.llm_api_key or not self.tavily_api_key:
             raise ValueError("API keys not found. Check your .env file.")
 
-        # Initialize agents and orchestrators
-        self.extractor = PdfExtractorAgent()
-        self.analyzer = MultimodalAnalysisAgent(model=self.model, api_key=self.llm_api_key)
-        self.triage = TriageAgent(model=self.model, api_key=self.llm_api_key)
-
-        # Initialize orchestrators
-        self.validator = ValidationOrchestrator(
+        # Read after load_dotenv(), so settings from .env apply to every entry point
+        # Optional single-call triage + decomposition + planning; the separate agents remain the fallback
+        self.fused = os.getenv("FUSED_ANALYSIS", "0") == "1" if fused is None else fused
+        self.validation_mode = os.getenv("VALIDATION_MODE", "page")
+        self.parallel_raster = os.getenv("PARALLEL_RASTER", "1") == "1"
+        self.render_dpi = DEFAULT_DPI
+
+    # --- SHARED COMPONENTS (built on first use) ---
+
+    def _shared(self, name: str, factory):
+        return get_registry().get((name, self.model), factory)
+
+    @property
+    def extractor(self):
+        from document_agents.pdf_extractor_agent import PdfExtractorAgent
+        return self._shared("PdfExtractorAgent", PdfExtractorAgent)
+
+    @property
+    def analyzer(self):
+        from document_agents.multimodal_analysis_agent import MultimodalAnalysisAgent
+        return self._shared("MultimodalAnalysisAgent",
+                            lambda: MultimodalAnalysisAgent(model=self.model, api_key=self.llm_api_key))
+
+    @property
+    def triage(self):
+        from document_agents.triage_agent import TriageAgent
+        return self._shared("TriageAgent", lambda: TriageAgent(model=self.model, api_key=self.llm_api_key))
+
+    @property
+    def fused_analyzer(self):
+        from validation_agents.fused_analysis_agent import FusedAnalysisAgent
+        return self._shared("FusedAnalysisAgent",
+                            lambda: FusedAnalysisAgent(model=self.model, api_key=self.llm_api_key))
+
+    @property
+    def rasterizer(self):
+        """Slides are rendered ahead of time in a shared process pool unless PARALLEL_RASTER=0."""
+        if not self.parallel_raster:
+            return None
+        from document_agents.page_rasterizer import get_rasterizer
+        return get_rasterizer()
+
+    @property
+    def validator(self):
+        from orchestrator_validation import ValidationOrchestrator
+        return self._shared("ValidationOrchestrator", lambda: ValidationOrchestrator(
             llm_api_key=self.llm_api_key,
             tavily_api_key=self.tavily_api_key,
             model=self.model
-        )
-        self.market_insight_orchestrator = MarketInsightOrchestrator(
+        ))
+
+    @property
+    def market_insight_orchestrator(self):
+        from orchestrator_market_insight import MarketInsightOrchestrator
+        return self._shared("MarketInsightOrchestrator", lambda: MarketInsightOrchestrator(
             llm_api_key=self.llm_api_key,
             tavily_api_key=self.tavily_api_key,
             model=self.model
-        )
-        self.competitor_research_orchestrator = CompetitorResearchOrchestrator(
+        ))
+
+    @property
+    def competitor_research_orchestrator(self):
+        from orchestrator_competitor_research import CompetitorResearchOrchestrator
+        return self._shared("CompetitorResearchOrchestrator", lambda: CompetitorResearchOrchestrator(
             llm_api_key=self.llm_api_key,
             tavily_api_key=self.tavily_api_key,
             model=self.model
-        )
+        ))
 
     def _extract_startup_description(self, pdf_path: str) -> str:
         """Extract startup description from document."""
+        import fitz
         try:
             doc = fitz.open(pdf_path)
             description_parts = []
@@ -64,12 +128,12 @@ class DocumentAnalysisOrchestrator:
             doc.close()
             return " ".join(description_parts) if description_parts else "Technology startup"
         except Exception as e:
-            logging.error(f"Error extracting startup description: {e}")
+            logger.error("Error extracting startup description: %s", e)
             return "Technology startup"
 
     def _run_market_insights(self, startup_description: str) -> dict:
         """Generate market insights using MarketInsightOrchestrator."""
-        logging.info("Generating Market Insights")
+        logger.info("Generating Market Insights")
         try:
             result = self.market_insight_orchestrator.run(
                 description=startup_description,
@@ -82,7 +146,7 @@ class DocumentAnalysisOrchestrator:
                 "data": result
             }
         except Exception as e:
-            logging.error(f"Market insight generation failed: {e}")
+            logger.error("Market insight generation failed: %s", e)
             return {
                 "timestamp": datetime.now().isoformat(),
                 "status": "error",
@@ -91,7 +155,7 @@ class DocumentAnalysisOrchestrator:
 
     def _run_competitor_research(self, startup_description: str, competitors: list) -> dict:
         """Generate competitor research analysis."""
-        logging.info("Generating Competitor Research")
+        logger.info("Generating Competitor Research")
         try:
             result = self.competitor_research_orchestrator.run(
                 startup_description=startup_description,
@@ -104,7 +168,7 @@ class DocumentAnalysisOrchestrator:
                 "data": result
             }
         except Exception as e:
-            logging.error(f"Competitor research failed: {e}")
+            logger.error("Competitor research failed: %s", e)
             return {
                 "timestamp": datetime.now().isoformat(),
                 "status": "error",
@@ -113,52 +177,261 @@ class DocumentAnalysisOrchestrator:
 
     def _pre_analyze_for_context(self, pdf_path: str) -> str:
         """Analyze first page for document context."""
-        logging.info("Establishing document context")
+        logger.info("Establishing document context")
         image_bytes = self.extractor.extract_page_as_image(pdf_path, 0)
         if not image_bytes:
             return "General business document"
 
-        context = self.analyzer.analyze_slide_content(image_bytes, None)
+        context = self.analyzer.analyze_slide_content(image_bytes, self.extractor.extract_page_text(pdf_path, 0))
         return context or "General business document"
 
-    def _process_page(self, pdf_path: str, page_num: int, document_context: str) -> dict:
-        """Process individual page for validation."""
-        page_report = {"page_number": page_num + 1}
+    def _prefetch_images(self, pdf_path: str, page_nums: list[int], dpi: int | None = None) -> dict:
+        """Starts rendering the given pages in the background; returns {page_num: Future[PageImageRef]}."""
+        if not self.rasterizer or not page_nums:
+            return {}
+        return self.rasterizer.prefetch(pdf_path, page_nums, dpi=dpi or self.render_dpi)
+
+    def _render_dpi(self, budget: AnalysisBudget | None) -> int:
+        return budget.render_dpi(self.render_dpi) if budget is not None else self.render_dpi
+
+    def _page_order(self, pdf_path: str, page_nums: list[int], budget: AnalysisBudget | None) -> list[int]:
+        """Document order, or under a budget the most material pages (by their text layer) first."""
+        if budget is None:
+            return page_nums
+        scores = {n: materiality_score(self.extractor.extract_page_text(pdf_path, n) or "") for n in page_nums}
+        return sorted(page_nums, key=lambda n: -scores[n])
+
+    def _iter_pages(self, pdf_path: str, page_nums: list[int], budget: AnalysisBudget | None):
+        """
+        Yields (page_num, prefetched image or None). Without a budget every page is prefetched up
+        front; under one, only PREFETCH_LOOKAHEAD pages ahead, at the DPI the budget allows by then.
+        Close the generator (see contextlib.closing) if it is not drained, so pending prefetches are released.
+        """
+        lookahead = PREFETCH_LOOKAHEAD if budget is not None else len(page_nums)
+        images = {}
+        try:
+            for i, page_num in enumerate(page_nums):
+                ahead = [n for n in page_nums[i:i + lookahead] if n not in images]
+                images.update(self._prefetch_images(pdf_path, ahead, self._render_dpi(budget)))
+                yield page_num, images.pop(page_num, None)
+        finally:
+            # Closed early (e.g. by an exception): free the memory budget and spill files of pages never handed out
+            for page_image in images.values():
+                self._discard_image(page_image)
+
+    @staticmethod
+    def _discard_image(page_image):
+        """Releases a prefetched page that will not be analyzed; one that has not been scheduled yet is cancelled."""
+        if page_image is not None and not page_image.cancel():
+            page_image.add_done_callback(lambda f: f.exception() is None and f.result().release())
+
+    @staticmethod
+    def _not_checked_page(page_num: int, budget: AnalysisBudget) -> dict:
+        budget.mark_not_checked("page", page_num + 1, page_number=page_num + 1)
+        return {"page_number": page_num + 1, "status": "Not checked",
+                "reason": "The analysis budget ran out before this page was analyzed."}
+
+    @staticmethod
+    def _remaining_budget_report(journal: ReportJournal, budget_report: dict) -> dict:
+        """An earlier run's budget report, with only the entries that are still not checked."""
+        unchecked_claims = {
+            verdict.get("claim")
+            for page_num in range(journal.page_count())
+            for verdict in ReportJournal.page_verdicts(journal.get(journal.page_unit(page_num)))
+            if verdict.get("conclusion") == "NOT_CHECKED"
+        }
+
+        def still_unchecked(entry: dict) -> bool:
+            if entry.get("kind") == "step":
+                return not journal.is_complete(entry["item"])
+            if entry.get("kind") == "page":
+                return not journal.is_complete(journal.page_unit(entry["page_number"] - 1))
+            return entry.get("item") in unchecked_claims
+
+        return dict(budget_report, not_checked=[e for e in budget_report.get("not_checked", []) if still_unchecked(e)])
+
+    def _synthesize_page(self, pdf_path: str, page_num: int, page_report: dict, page_image=None,
+                         dpi: int | None = None) -> str | None:
+        """
+        Extracts and synthesizes one page. Returns None (with page_report updated) if there is nothing to analyze.
+        page_image is an optional prefetched Future[PageImageRef]; without it the page is rendered inline at dpi.
+        """
+        image = None
+        if page_image is not None:
+            try:
+                image = page_image.result()
+            except Exception as e:
+                logger.warning("Background render of page %s failed, rendering inline: %s", page_num + 1, e)
+        if image is None:
+            image = self.extractor.extract_page_as_image(pdf_path, page_num, dpi or self.render_dpi)
+
+        if not image:
+            page_report.update({"status": "Failed", "reason": "Image extraction failed"})
+            return None
 
         try:
             raw_text = self.extractor.extract_page_text(pdf_path, page_num)
-            image_bytes = self.extractor.extract_page_as_image(pdf_path, page_num)
-
-            if not image_bytes:
-                page_report.update({"status": "Failed", "reason": "Image extraction failed"})
-                return page_report
+            synthesized_content = self.analyzer.analyze_slide_content(image, raw_text)
+        finally:
+            if hasattr(image, "release"):
+                image.release()
+        if not synthesized_content:
+            page_report.update({"status": "Skipped", "reason": "No content synthesized"})
+            return None
+        return synthesized_content
+
+    def _triage_page(self, synthesized_content: str, document_context: str, page_report: dict) -> dict | None:
+        """
+        Decides whether the page has verifiable claims. Returns None (with page_report updated) if not,
+        otherwise {"claims", "queries"}, which are already filled in when the fused agent was used.
+        """
+        fused_result = None
+        if self.fused:
+            fused_result = self.fused_analyzer.analyze(synthesized_content, document_context)
+
+        if fused_result is not None:
+            if not fused_result["contains_claims"]:
+                page_report.update({"status": "Skipped", "reason": fused_result["reason"]})
+                return None
+            return {"claims": fused_result["claims"], "queries": fused_result["queries"]}
+
+        triage_result = self.triage.contains_verifiable_claims(synthesized_content)
+        if not triage_result.get("contains_verifiable_claims"):
+            page_report.update({"status": "Skipped", "reason": triage_result.get("reason")})
+            return None
+        return {"claims": None, "queries": None}
+
+    def _process_page(self, pdf_path: str, page_num: int, document_context: str, page_image=None,
+                      budget: AnalysisBudget | None = None) -> dict:
+        """Process individual page for validation."""
+        page_report = {"page_number": page_num + 1}
 
-            synthesized_content = self.analyzer.analyze_slide_content(image_bytes, raw_text)
-            if not synthesized_content:
-                page_report.update({"status": "Skipped", "reason": "No content synthesized"})
+        try:
+            synthesized_content = self._synthesize_page(pdf_path, page_num, page_report, page_image,
+                                                         self._render_dpi(budget))
+            if synthesized_content is None:
                 return page_report
 
-            triage_result = self.triage.contains_verifiable_claims(synthesized_content)
-            if not triage_result.get("contains_verifiable_claims"):
-                page_report.update({"status": "Skipped", "reason": triage_result.get("reason")})
+            plan = self._triage_page(synthesized_content, document_context, page_report)
+            if plan is None:
                 return page_report
 
-            validation_results = self.validator.run(synthesized_content, document_context)
+            validation_results = self.validator.run(
+                synthesized_content, document_context, claims=plan["claims"], queries=plan["queries"],
+                budget=budget, page_number=page_num + 1
+            )
             page_report.update({
                 "status": "Analyzed",
                 "validation_results": validation_results
             })
 
         except Exception as e:
-            logging.error(f"Error processing page {page_num + 1}: {e}")
+            logger.error("Error processing page %s: %s", page_num + 1, e)
             page_report.update({"status": "Error", "error": str(e)})
 
         return page_report
 
-    def run_full_document_analysis(self, pdf_path: str, competitors: list = None):
-        """Execute comprehensive analysis workflow."""
-        logging.info("Starting full document analysis workflow")
+    def _collect_page_claims(self, pdf_path: str, page_num: int, document_context: str, page_image=None,
+                             budget: AnalysisBudget | None = None) -> dict:
+        """Phase one of document-wide validation: synthesize, triage and decompose a page, without searching."""
+        page_report = {"page_number": page_num + 1}
+        claims = []
+
+        try:
+            synthesized_content = self._synthesize_page(pdf_path, page_num, page_report, page_image,
+                                                         self._render_dpi(budget))
+            if synthesized_content is not None:
+                plan = self._triage_page(synthesized_content, document_context, page_report)
+                if plan is not None:
+                    claims = plan["claims"] or self.validator.decomposer.decompose(synthesized_content)
+                    if not claims:
+                        page_report.update({
+                            "status": "Analyzed",
+                            "validation_results": {"error": "Validation failed: Could not decompose text into claims."}
+                        })
+        except Exception as e:
+            logger.error("Error processing page %s: %s", page_num + 1, e)
+            page_report.update({"status": "Error", "error": str(e)})
 
+        return {"page_report": page_report, "claims": claims}
+
+    def _validate_document(self, pdf_path: str, num_pages: int, document_context: str, journal: ReportJournal,
+                           budget: AnalysisBudget | None = None):
+        """
+        Two-phase validation: collect claims from every page, then plan, search and validate them together.
+        Returns the pages it left incomplete (failed, or wholly or partly unchecked because the budget ran
+        out), which the page-by-page pass must not redo in the same run; a resumed run picks them up again.
+        """
+        page_claims = {}
+        left_incomplete = set()
+        to_collect = self._page_order(pdf_path, [
+            n for n in range(num_pages)
+            if not journal.is_complete(journal.page_unit(n)) and not journal.is_complete(f"claims:{n}")
+        ], budget)
+        for page_num in range(num_pages):
+            if journal.is_complete(journal.page_unit(page_num)):
+                logger.info("Skipping page %s/%s (already in journal)", page_num + 1, num_pages)
+        with closing(self._iter_pages(pdf_path, to_collect, budget)) as page_images:
+            for page_num in [n for n in range(num_pages) if journal.is_complete(f"claims:{n}")] + to_collect:
+                if journal.is_complete(journal.page_unit(page_num)):
+                    continue
+                claims_unit = f"claims:{page_num}"
+                if not journal.is_complete(claims_unit):
+                    _, page_image = next(page_images)
+                    if budget is not None and budget.exhausted():
+                        self._discard_image(page_image)
+                        journal.record(journal.page_unit(page_num), self._not_checked_page(page_num, budget))
+                        left_incomplete.add(page_num)
+                        continue
+                    logger.info("Collecting claims from page %s/%s", page_num + 1, num_pages)
+                    collected = self._collect_page_claims(pdf_path, page_num, document_context, page_image, budget)
+                    if collected["page_report"].get("status") == "Error":
+                        journal.record(journal.page_unit(page_num), collected["page_report"])
+                        left_incomplete.add(page_num)
+                        continue
+                    journal.record(claims_unit, collected)
+                collected = journal.get(claims_unit)
+                if collected["claims"]:
+                    page_claims[page_num] = collected["claims"]
+                else:
+                    journal.record(journal.page_unit(page_num), collected["page_report"])
+
+        if not page_claims:
+            return left_incomplete
+
+        result = self.validator.run_document(page_claims, document_context, budget)
+        for page_num, validation_results in result["pages"].items():
+            page_report = dict(journal.get(f"claims:{page_num}")["page_report"])
+            page_report.update({"status": "Analyzed", "validation_results": validation_results})
+            journal.record(journal.page_unit(page_num), page_report)
+            if not journal.is_complete(journal.page_unit(page_num)):
+                left_incomplete.add(page_num)
+        journal.record("validation_summary", result["summary"])
+        return left_incomplete
+
+    def run_full_document_analysis(self, pdf_path: str, competitors: list = None,
+                                   job_id: str = None, resume: bool = False,
+                                   validation_mode: str = None, budget=None, context: str = None):
+        """
+        Execute comprehensive analysis workflow.
+
+        Every completed unit is appended to a per-job journal. With resume=True,
+        units already in the journal are skipped and only missing or failed ones run.
+        validation_mode is "page" (plan, search and validate each page on its own) or
+        "document" (one global search plan and evidence pool for all pages).
+        budget ({"seconds", "tokens"} or an AnalysisBudget) bounds the run: the most material
+        pages and claims go first, and the analysis degrades as the budget runs down (see
+        AnalysisBudget). What was not checked is listed under "budget" in the report, and
+        a resumed run picks it up. A second concurrent run of the same job returns an error
+        marked "locked" instead of touching the journal the first one is writing.
+        context is the requester's own description of the analysis; it is added to the
+        document context every page is analyzed in.
+        """
+        validation_mode = validation_mode or self.validation_mode
+        budget = AnalysisBudget.from_params(budget)
+        logger.info("Starting full document analysis workflow")
+
+        import fitz
         try:
             doc = fitz.open(pdf_path)
             num_pages = doc.page_count
@@ -166,35 +439,96 @@ class DocumentAnalysisOrchestrator:
         except Exception as e:
             return {"error": f"Failed to open PDF: {e}"}
 
+        journal = ReportJournal(job_id or compute_job_id(pdf_path))
+        try:
+            journal.acquire()
+        except JournalLockedError as e:
+            return {"error": str(e), "locked": True}
+        try:
+            # The budget's token count covers only this analysis, even with others running in the process
+            with budget.metering() if budget is not None else nullcontext():
+                return self._run_journaled(pdf_path, num_pages, journal, competitors, resume, validation_mode,
+                                           budget, context)
+        finally:
+            journal.release()
+
+    def _run_journaled(self, pdf_path: str, num_pages: int, journal: ReportJournal, competitors: list | None,
+                       resume: bool, validation_mode: str, budget: AnalysisBudget | None,
+                       context: str | None = None) -> dict:
+        """The analysis units of run_full_document_analysis, run while holding the journal's lock."""
+        if resume:
+            journal.load()
+        else:
+            journal.reset()
+
         # Extract startup description and context
-        startup_description = self._extract_startup_description(pdf_path)
-        document_context = self._pre_analyze_for_context(pdf_path)
-
-        # Initialize comprehensive report
-        full_report = {
-            "market_insights": self._run_market_insights(startup_description),
-            "competitor_research": None,
-            "document_validation": []
-        }
+        if journal.is_complete("context"):
+            logger.info("Resuming: reusing journaled document context")
+            startup_description = journal.get("context")["startup_description"]
+            document_context = journal.get("context")["document_context"]
+        else:
+            startup_description = self._extract_startup_description(pdf_path)
+            document_context = self._pre_analyze_for_context(pdf_path)
+            if context:
+                document_context = f"{document_context}\n\nRequester's context: {context}"
+            journal.record("context", {
+                "startup_description": startup_description,
+                "document_context": document_context
+            })
+
+        if not journal.is_complete("market_insights"):
+            if budget is not None and budget.exhausted():
+                budget.mark_not_checked("step", "market_insights")
+            else:
+                journal.record("market_insights", self._run_market_insights(startup_description))
 
         # Add competitor research if competitors provided
-        if competitors:
-            full_report["competitor_research"] = self._run_competitor_research(
-                startup_description, competitors
-            )
+        if competitors and not journal.is_complete("competitor_research"):
+            if budget is not None and budget.exhausted():
+                budget.mark_not_checked("step", "competitor_research")
+            else:
+                journal.record("competitor_research", self._run_competitor_research(
+                    startup_description, competitors
+                ))
+
+        # Pages document mode already attempted in this run are not retried page by page
+        left_incomplete = set()
+        if validation_mode == "document":
+            left_incomplete = self._validate_document(pdf_path, num_pages, document_context, journal, budget)
 
         # Process document pages
         for page_num in range(num_pages):
-            logging.info(f"Processing page {page_num + 1}/{num_pages}")
-            page_report = self._process_page(pdf_path, page_num, document_context)
-            full_report["document_validation"].append(page_report)
-
-        logging.info("Full document analysis completed")
-        return full_report
-
-
-def save_report_to_file(report: dict, original_filename: str):
-    """Save report to timestamped JSON file."""
+            if journal.is_complete(journal.page_unit(page_num)):
+                logger.info("Skipping page %s/%s (already in journal)", page_num + 1, num_pages)
+        pending = self._page_order(pdf_path, [
+            n for n in range(num_pages) if not journal.is_complete(journal.page_unit(n)) and n not in left_incomplete
+        ], budget)
+        with closing(self._iter_pages(pdf_path, pending, budget)) as page_images:
+            for page_num, page_image in page_images:
+                unit = journal.page_unit(page_num)
+                if budget is not None and budget.exhausted():
+                    self._discard_image(page_image)
+                    journal.record(unit, self._not_checked_page(page_num, budget))
+                    continue
+                logger.info("Processing page %s/%s", page_num + 1, num_pages)
+                page_report = self._process_page(pdf_path, page_num, document_context, page_image, budget)
+                journal.record(unit, page_report)
+
+        if budget is not None:
+            journal.record("budget", budget.report())
+        elif journal.get("budget"):
+            # A resumed run without a budget keeps the earlier budget section, minus what it has checked since
+            journal.record("budget", self._remaining_budget_report(journal, journal.get("budget")))
+        logger.info("Full document analysis completed")
+        logger.info("Provider limiter stats: %s", limiter_stats())
+        logger.info("LLM hedging stats: %s", get_router().hedging.stats())
+        if get_slide_cache() is not None:
+            logger.info("Slide transcription cache stats: %s", get_slide_cache().stats())
+        return journal.assemble(num_pages)
+
+
+def save_report_to_file(report: dict, original_filename: str) -> str | None:
+    """Save report to a timestamped, compact JSON file, written atomically."""
     if not os.path.exists("reports"):
         os.makedirs("reports")
 
@@ -202,17 +536,27 @@ def save_report_to_file(report: dict, original_filename: str):
     base_name = os.path.basename(original_filename)
     file_name = f"{os.path.splitext(base_name)[0]}_{timestamp}_report.json"
     file_path = os.path.join("reports", file_name)
+    tmp_path = file_path + ".tmp"
+
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, separators=(',', ':'))
+        os.replace(tmp_path, file_path)
+        logger.info("Report saved to: %s", file_path)
+    except Exception as e:
+        logger.error("Error saving report: %s", e)
+        return None
 
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=4)
-        logging.info(f"Report saved to: {file_path}")
+        ReportStore().ingest_file(file_path)
     except Exception as e:
-        logging.error(f"Error saving report: {e}")
+        logger.error("Error indexing report: %s", e)
+    return file_path
 
 
 def main():
-    """Main execution function."""
+    """Main execution function. Pass --resume to continue an interrupted run."""
+    resume = "--resume" in sys.argv[1:]
     PDF_FILE_PATH = os.path.join("src", "sample_data", "example-presentation.pdf")
 
     try:
@@ -222,18 +566,19 @@ def main():
         competitors = ["Microsoft", "Google", "Amazon"]  # Add actual competitors
         final_analysis = orchestrator.run_full_document_analysis(
             PDF_FILE_PATH,
-            competitors=competitors
+            competitors=competitors,
+            resume=resume
         )
 
-        logging.info("Analysis completed")
+        logger.info("Analysis completed")
         if final_analysis:
             print(json.dumps(final_analysis, indent=2))
             save_report_to_file(final_analysis, PDF_FILE_PATH)
         else:
-            logging.error("Analysis could not be completed")
+            logger.error("Analysis could not be completed")
 
     except Exception as e:
-        logging.error(f"Error in main execution: {e}")
+        logger.error("Error in main execution: %s", e)
 
 
 if __name__ == '__main__':
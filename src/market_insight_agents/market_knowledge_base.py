@@ -0,0 +1,292 @@
+# src/market_insight_agents/market_knowledge_base.py
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+
+from report_store import REPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KB_PATH = os.getenv("MARKET_KB_PATH", os.path.join(REPORTS_DIR, "market_kb.sqlite3"))
+
+# Market figures move slowly; forecasts are revisited more often than sizes
+DEFAULT_TTL_DAYS = {
+    "size": float(os.getenv("MARKET_KB_SIZE_TTL_DAYS", 90)),
+    "outlook": float(os.getenv("MARKET_KB_OUTLOOK_TTL_DAYS", 30)),
+}
+
+# Fields an entry must carry to be worth storing (error fallbacks of the agents lack them)
+REQUIRED_FIELDS = {
+    "size": ("TAM", "SAM", "SOM", "classification"),
+    "outlook": ("growth_rate", "opportunities", "challenges"),
+}
+
+# Canonical segment -> other spellings of the same segment. Only true variants belong here:
+# a sub-segment (payments, medtech, adtech, ...) has its own market figures and must not be
+# served its parent's entry.
+SEGMENT_SYNONYMS = {
+    "fintech": ["financial technology", "fin tech", "finance technology"],
+    "healthtech": ["health tech", "health technology", "healthcare technology", "health care technology"],
+    "edtech": ["education technology", "educational technology", "ed tech"],
+    "insurtech": ["insurance technology", "insur tech"],
+    "proptech": ["property technology", "real estate technology", "prop tech"],
+    "legaltech": ["legal technology", "legal tech"],
+    "regtech": ["regulatory technology", "reg tech"],
+    "agritech": ["agtech", "agriculture technology", "agricultural technology", "agri tech", "ag tech"],
+    "foodtech": ["food technology", "food tech"],
+    "climatetech": ["climate tech", "climate technology"],
+    "mobility": ["mobility technology", "mobility tech"],
+    "hrtech": ["hr tech", "human resources technology", "hr technology"],
+    "martech": ["marketing technology", "mar tech"],
+    "cybersecurity": ["cyber security"],
+    "saas": ["software as a service"],
+    "artificial intelligence": ["ai"],
+    "e-commerce": ["ecommerce", "e commerce"],
+    "biotech": ["biotechnology", "bio tech"],
+    "gaming": ["video games", "video gaming"],
+    "logistics": ["logistics technology", "logistics tech"],
+}
+
+# Canonical region -> other names of the same region (not overlapping or larger ones, such as EMEA)
+REGION_SYNONYMS = {
+    "global": ["worldwide", "world", "all regions", "globally"],
+    "europe": ["european"],
+    "dach": ["germany austria switzerland", "d a ch"],
+    "germany": ["de", "deutschland", "german"],
+    "united kingdom": ["uk", "great britain", "britain"],
+    "united states": ["us", "usa", "u s", "u s a", "united states of america"],
+    "north america": ["na"],
+    "asia pacific": ["apac", "asia-pacific"],
+    "latin america": ["latam"],
+}
+
+# Words that do not change which market is meant
+_FILLER_WORDS = frozenset("market markets industry industries sector sectors segment space the and".split())
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_facts (
+    kind TEXT NOT NULL,
+    segment_key TEXT NOT NULL,
+    region_key TEXT NOT NULL,
+    timeframe INTEGER NOT NULL,
+    segment TEXT,
+    region TEXT,
+    data TEXT NOT NULL,
+    model TEXT,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, segment_key, region_key, timeframe)
+);
+CREATE TABLE IF NOT EXISTS segment_aliases (
+    alias TEXT PRIMARY KEY,
+    segment_key TEXT NOT NULL
+);
+"""
+
+
+def _clean(text: str) -> str:
+    return " ".join(t for t in _TOKEN_RE.findall((text or "").lower().replace("&", " and ")) if t not in _FILLER_WORDS)
+
+
+def _alias_table(synonyms: dict[str, list[str]]) -> dict[str, str]:
+    table = {}
+    for canonical, variants in synonyms.items():
+        key = _clean(canonical)
+        for variant in [canonical, *variants]:
+            table[_clean(variant)] = key
+            table[_clean(variant).replace(" ", "")] = key
+    return table
+
+
+_SEGMENT_ALIASES = _alias_table(SEGMENT_SYNONYMS)
+_REGION_ALIASES = _alias_table(REGION_SYNONYMS)
+
+
+def normalize_region(region: str | None) -> str:
+    """Canonical region key, e.g. "Worldwide" -> "global", "USA" -> "united states"."""
+    cleaned = _clean(region or "") or "global"
+    return _REGION_ALIASES.get(cleaned) or _REGION_ALIASES.get(cleaned.replace(" ", "")) or cleaned
+
+
+class MarketKnowledgeBase:
+    """
+    Persistent, SQLite-backed store of market size and outlook figures.
+
+    Entries are keyed by (kind, normalized segment, normalized region, timeframe), so
+    "FinTech", "Fintech industry" and "Financial Technology" share one entry, and every
+    kind has its own freshness TTL after which the figures are fetched again. Segment
+    synonyms come from SEGMENT_SYNONYMS plus aliases learned with add_alias().
+    get_or_fetch() is single-flight per key: concurrent decks in the same segment
+    wait for one model call instead of each making their own.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_KB_PATH, ttl_days: dict[str, float] | None = None):
+        self.db_path = db_path
+        self.ttl_seconds = {kind: days * 86400 for kind, days in {**DEFAULT_TTL_DAYS, **(ttl_days or {})}.items()}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            self._learned_aliases = dict(conn.execute("SELECT alias, segment_key FROM segment_aliases").fetchall())
+        self._drop_misfiled()
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is always closed."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+
+    def _drop_misfiled(self):
+        """Removes entries filed under a key their own segment and region no longer normalize to."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, segment_key, region_key, timeframe, segment, region "
+                                "FROM market_facts").fetchall()
+            misfiled = [(row["kind"], row["segment_key"], row["region_key"], row["timeframe"]) for row in rows
+                        if row["segment"] is not None
+                        and (self.normalize_segment(row["segment"]), normalize_region(row["region"]))
+                        != (row["segment_key"], row["region_key"])]
+            conn.executemany("DELETE FROM market_facts "
+                             "WHERE kind = ? AND segment_key = ? AND region_key = ? AND timeframe = ?", misfiled)
+        if misfiled:
+            logger.info("Dropped %s market knowledge entries filed under another segment or region", len(misfiled))
+
+    # --- NORMALIZATION ---
+
+    def normalize_segment(self, segment: str) -> str:
+        """Canonical segment key, e.g. "Financial Technology (FinTech)" -> "fintech"."""
+        cleaned = _clean(segment)
+        for candidate in (cleaned, cleaned.replace(" ", "")):
+            key = self._learned_aliases.get(candidate) or _SEGMENT_ALIASES.get(candidate)
+            if key:
+                return key
+        # "Financial Technology (FinTech)", "FinTech / Payments": a known segment named in parentheses or parts
+        for part in re.split(r"[()/,;|]", (segment or "").lower()):
+            part = _clean(part)
+            key = part and (self._learned_aliases.get(part) or _SEGMENT_ALIASES.get(part)
+                            or _SEGMENT_ALIASES.get(part.replace(" ", "")))
+            if key:
+                return key
+        return cleaned
+
+    def add_alias(self, alias: str, segment: str):
+        """Maps another spelling to a segment, persistently (e.g. add_alias("Open Banking", "FinTech"))."""
+        alias_key, segment_key = _clean(alias), self.normalize_segment(segment)
+        if not alias_key or alias_key == segment_key:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO segment_aliases VALUES (?, ?)", (alias_key, segment_key))
+            self._learned_aliases[alias_key] = segment_key
+
+    def _key(self, kind: str, segment: str, region: str | None, timeframe: int | None) -> tuple:
+        if kind not in REQUIRED_FIELDS:
+            raise ValueError(f"Unknown market knowledge kind: {kind}")
+        return kind, self.normalize_segment(segment), normalize_region(region), int(timeframe or 0)
+
+    # --- ENTRIES ---
+
+    @staticmethod
+    def is_valid(kind: str, data) -> bool:
+        """True for a complete agent result (the agents' error fallbacks are never stored)."""
+        return isinstance(data, dict) and all(data.get(field) for field in REQUIRED_FIELDS[kind]) \
+            and data.get("confidence") != "Error"
+
+    def get(self, kind: str, segment: str, region: str | None = "Global", timeframe: int | None = None) -> dict | None:
+        """Returns the stored figures if they are younger than the kind's TTL, else None."""
+        key = self._key(kind, segment, region, timeframe)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, created_at FROM market_facts "
+                "WHERE kind = ? AND segment_key = ? AND region_key = ? AND timeframe = ?", key
+            ).fetchone()
+            fresh = row is not None and time.time() - row["created_at"] <= self.ttl_seconds[kind]
+            if fresh:
+                conn.execute("UPDATE market_facts SET hits = hits + 1 "
+                             "WHERE kind = ? AND segment_key = ? AND region_key = ? AND timeframe = ?", key)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not fresh:
+            return None
+        try:
+            return json.loads(row["data"])
+        except json.JSONDecodeError as e:
+            logger.warning("Ignoring unreadable market knowledge entry %s: %s", key, e)
+            return None
+
+    def put(self, kind: str, segment: str, data: dict, region: str | None = "Global",
+            timeframe: int | None = None, model: str | None = None) -> bool:
+        """Stores (or refreshes) an entry. Incomplete results are rejected and False is returned."""
+        if not self.is_valid(kind, data):
+            return False
+        key = self._key(kind, segment, region, timeframe)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO market_facts "
+                "(kind, segment_key, region_key, timeframe, segment, region, data, model, created_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (*key, segment, region, json.dumps(data), model, time.time())
+            )
+        return True
+
+    def get_or_fetch(self, kind: str, segment: str, fetch, region: str | None = "Global",
+                     timeframe: int | None = None, model: str | None = None) -> dict:
+        """Serves fresh figures from the store, or calls fetch() once per key and stores a valid result."""
+        key = self._key(kind, segment, region, timeframe)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            data = self.get(kind, segment, region, timeframe)
+            if data is not None:
+                return data
+            data = fetch()
+            self.put(kind, segment, data, region, timeframe, model)
+            return data
+
+    def invalidate(self, kind: str | None = None, segment: str | None = None) -> int:
+        """Drops entries (all, one kind and/or one segment) so they are fetched again."""
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if segment:
+            clauses.append("segment_key = ?")
+            params.append(self.normalize_segment(segment))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM market_facts{where}", params).rowcount
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, COUNT(*) AS n FROM market_facts GROUP BY kind").fetchall()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": {row["kind"]: row["n"] for row in rows}, "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+_kb: MarketKnowledgeBase | None = None
+_kb_lock = threading.Lock()
+
+
+def get_market_knowledge_base() -> MarketKnowledgeBase | None:
+    """Returns the process-wide knowledge base, or None when it is disabled (MARKET_KB=0)."""
+    global _kb
+    if os.getenv("MARKET_KB", "1") != "1":
+        return None
+    with _kb_lock:
+        if _kb is None:
+            _kb = MarketKnowledgeBase()
+        return _kb
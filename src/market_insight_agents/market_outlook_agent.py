@@ -1,9 +1,23 @@
 # src/market_insight_agents/market_outlook_agent.py
+import logging
 
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, enum, obj, string
+from market_insight_agents.market_knowledge_base import get_market_knowledge_base
+
+logger = logging.getLogger(__name__)
 
 class MarketOutlookAgent(BaseAgent):
     """Agent to analyze and provide the growth outlook for a given market segment."""
+    output_schema = obj({
+        "growth_rate": string(),
+        "future_potential": string(),
+        "opportunities": array(string()),
+        "challenges": array(string()),
+        "confidence": enum("High", "Medium", "Low"),
+        "explanation": string(),
+    })
+    max_output_tokens = 700
 
     def get_market_outlook(self, segment: str, region: str = "Global", timeframe: int = 5) -> dict:
         """
@@ -17,7 +31,16 @@ class MarketOutlookAgent(BaseAgent):
         Returns:
             dict: A JSON object containing growth rate, potential, opportunities, challenges, confidence level, and explanation.
         """
-        print(f"Agent [MarketOutlook]: Analyzing outlook for segment: '{segment}' in region: '{region}' with timeframe: '{timeframe}' years.")
+        kb = get_market_knowledge_base()
+        if kb is None:
+            return self._fetch_market_outlook(segment, region, timeframe)
+        return kb.get_or_fetch("outlook", segment, lambda: self._fetch_market_outlook(segment, region, timeframe),
+                               region=region, timeframe=timeframe, model=self.model)
+
+    def _fetch_market_outlook(self, segment: str, region: str, timeframe: int) -> dict:
+        """Asks the LLM for the market outlook (used on a knowledge base miss)."""
+        logger.info("Agent [MarketOutlook]: Analyzing outlook for segment: '%s' in region: '%s' with timeframe: '%s' years.",
+                    segment, region, timeframe)
 
         try:
             # Prompt for the LLM
@@ -53,12 +76,12 @@ class MarketOutlookAgent(BaseAgent):
 
             # Validate and return the response
             if response:
-                print(f"Agent [MarketOutlook]: Successfully retrieved market outlook data: {response}")
+                logger.debug("Agent [MarketOutlook]: Successfully retrieved market outlook data: %s", response)
                 return response
             else:
                 raise ValueError("No response from LLM.")
         except Exception as e:
-            print(f"Agent [MarketOutlook] Error: {e}")
+            logger.warning("Agent [MarketOutlook] Error: %s", e)
             return {
                 "growth_rate": None,
                 "future_potential": None,
@@ -1,9 +1,21 @@
 # src/market_insight_agents/market_segment_agent.py
+import logging
 
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, obj, string
+
+logger = logging.getLogger(__name__)
 
 class MarketSegmentAgent(BaseAgent):
     """Agent to identify the market segment in which a startup operates."""
+    output_schema = obj({
+        "segment": string(),
+        "sub_segments": array(string()),
+        "examples": array(string()),
+        "keywords": array(string()),
+        "explanation": string(),
+    })
+    max_output_tokens = 500
 
     def identify_segment(self, description: str) -> dict:
         """
@@ -15,7 +27,7 @@ class MarketSegmentAgent(BaseAgent):
         Returns:
             dict: A detailed JSON object containing the identified market segment and explanation.
         """
-        print(f"Agent [MarketSegment]: Analyzing description to identify market segment: {description}")
+        logger.info("Agent [MarketSegment]: Analyzing description to identify market segment: %s", description)
 
         try:
             # Construct the prompt for the LLM
@@ -48,12 +60,12 @@ class MarketSegmentAgent(BaseAgent):
 
             # Check if the LLM response is valid
             if response:
-                print(f"Agent [MarketSegment]: Retrieved market segment data: {response}")
+                logger.debug("Agent [MarketSegment]: Retrieved market segment data: %s", response)
                 return response
             else:
                 raise ValueError("No response from the LLM")
         except Exception as e:
-            print(f"Agent [MarketSegment] Error: {e}")
+            logger.warning("Agent [MarketSegment] Error: %s", e)
             return {
                 "segment": None,
                 "sub_segments": None,
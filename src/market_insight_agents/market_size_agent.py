@@ -1,10 +1,24 @@
 # src/market_insight_agents/market_size_agent.py
+import logging
 
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import enum, obj, string
+from market_insight_agents.market_knowledge_base import get_market_knowledge_base
+
+logger = logging.getLogger(__name__)
 
 
 class MarketSizeAgent(BaseAgent):
     """Agent to determine TAM, SAM, SOM, and classify the market size using LLM."""
+    output_schema = obj({
+        "TAM": string(),
+        "SAM": string(),
+        "SOM": string(),
+        "classification": enum("Small", "Medium", "Large"),
+        "confidence": enum("High", "Medium", "Low"),
+        "explanation": string(),
+    })
+    max_output_tokens = 500
 
     def get_market_size(self, segment: str, region: str = "Global") -> dict:
         """
@@ -17,7 +31,15 @@ class MarketSizeAgent(BaseAgent):
         Returns:
             dict: A dictionary containing TAM, SAM, SOM, classification, explanation, and optional confidence level.
         """
-        print(f"Agent [MarketSize]: Analyzing segment: '{segment}' in region: '{region}'")
+        kb = get_market_knowledge_base()
+        if kb is None:
+            return self._fetch_market_size(segment, region)
+        return kb.get_or_fetch("size", segment, lambda: self._fetch_market_size(segment, region),
+                               region=region, model=self.model)
+
+    def _fetch_market_size(self, segment: str, region: str) -> dict:
+        """Asks the LLM for the market size figures (used on a knowledge base miss)."""
+        logger.info("Agent [MarketSize]: Analyzing segment: '%s' in region: '%s'", segment, region)
 
         try:
             # Prompt for the LLM
@@ -53,12 +75,12 @@ class MarketSizeAgent(BaseAgent):
 
             # Validate and return the response
             if response:
-                print(f"Agent [MarketSize]: Successfully retrieved market size data: {response}")
+                logger.debug("Agent [MarketSize]: Successfully retrieved market size data: %s", response)
                 return response
             else:
                 raise ValueError("No response from LLM.")
         except Exception as e:
-            print(f"Agent [MarketSize] Error: {e}")
+            logger.warning("Agent [MarketSize] Error: %s", e)
             return {
                 "TAM": None,
                 "SAM": None,
@@ -1,9 +1,22 @@
 # src/market_insight_agents/profitability_agent.py
+import logging
 
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import enum, obj, string
+
+logger = logging.getLogger(__name__)
 
 class ProfitabilityAgent(BaseAgent):
     """Agent to determine the profitability and financial viability of a startup."""
+    output_schema = obj({
+        "recurring_revenue": string(),
+        "profitability_assessment": string(),
+        "scalability": string(),
+        "competitive_analysis": string(),
+        "confidence": enum("High", "Medium", "Low"),
+        "explanation": string(),
+    })
+    max_output_tokens = 800
 
     def get_profitability(self, startup_data: dict, market_data: dict, context: str = None) -> dict:
         """
@@ -18,7 +31,8 @@ class ProfitabilityAgent(BaseAgent):
         Returns:
             dict: A JSON representation of profitability insights, scalability, challenges, confidence level, and explanation.
         """
-        print(f"Agent [Profitability]: Assessing profitability for startup in industry '{startup_data.get('industry')}' with market data.")
+        logger.info("Agent [Profitability]: Assessing profitability for startup in industry '%s' with market data.",
+                    startup_data.get('industry'))
 
         try:
             # Construct the LLM prompt
@@ -57,12 +71,12 @@ class ProfitabilityAgent(BaseAgent):
 
             # Validate and return the response
             if response:
-                print(f"Agent [Profitability]: Successfully retrieved profitability insights: {response}")
+                logger.debug("Agent [Profitability]: Successfully retrieved profitability insights: %s", response)
                 return response
             else:
                 raise ValueError("No response from LLM.")
         except Exception as e:
-            print(f"Agent [Profitability] Error: {e}")
+            logger.warning("Agent [Profitability] Error: %s", e)
             return {
                 "recurring_revenue": None,
                 "profitability_assessment": "Error: Unable to fetch profitability analysis.",
@@ -1,9 +1,12 @@
 # src/orchestrator_competitor_research.py
+import logging
 from competitor_research_agents.competitor_rank_agent import CompetitorRankAgent
 from competitor_research_agents.usp_moat_agent import USPMoatAgent
 from competitor_research_agents.similar_company_finder_agent import SimilarCompanyFinderAgent
 from competitor_research_agents.historical_analysis_agent import HistoricalAnalysisAgent
 
+logger = logging.getLogger(__name__)
+
 class CompetitorResearchOrchestrator:
     """Orchestrator to coordinate competitor research using multiple agents."""
 
@@ -28,20 +31,20 @@ class CompetitorResearchOrchestrator:
         try:
             # Step 1: Find similar companies
             similar_companies = self.similar_company_finder.find_similar_companies(startup_description)
-            print(f"Similar companies found: {similar_companies}")
+            logger.debug("Similar companies found: %s", similar_companies)
 
             # Step 2: Analyze USP and moat
             usp_moat_analysis = self.usp_moat_agent.analyze_usps(startup_description, similar_companies)
-            print(f"USP and moat analysis: {usp_moat_analysis}")
+            logger.debug("USP and moat analysis: %s", usp_moat_analysis)
 
             # Step 3: Rank competitors
             competitor_details = [{"name": comp, "strengths": [], "weaknesses": []} for comp in similar_companies]
             ranked_competitors = self.competitor_rank_agent.rank_competitors(competitor_details)
-            print(f"Ranked competitors: {ranked_competitors}")
+            logger.debug("Ranked competitors: %s", ranked_competitors)
 
             # Step 4: Historical analysis
             historical_analysis = self.historical_analysis_agent.find_historical_similar_companies(similar_companies, years)
-            print(f"Historical analysis: {historical_analysis}")
+            logger.debug("Historical analysis: %s", historical_analysis)
 
             # Step 5: Aggregate results
             final_report = {
@@ -53,5 +56,5 @@ class CompetitorResearchOrchestrator:
             return final_report
 
         except Exception as e:
-            print(f"Error in orchestrating competitor research: {e}")
+            logger.warning("Error in orchestrating competitor research: %s", e)
             return {"error": str(e)}
@@ -1,6 +1,7 @@
 # src/orchestrator_market_insight.py
 import os
 import sys
+import logging
 
 # Ensure the market_insight_agents package can be found
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -10,6 +11,8 @@ from market_insight_agents.market_size_agent import MarketSizeAgent
 from market_insight_agents.market_outlook_agent import MarketOutlookAgent
 from market_insight_agents.profitability_agent import ProfitabilityAgent
 
+logger = logging.getLogger(__name__)
+
 class MarketInsightOrchestrator:
     """Manages the workflow for generating market insights based on a startup description or related inputs."""
 
@@ -31,10 +34,12 @@ class MarketInsightOrchestrator:
         Returns:
             dict: Comprehensive market insight report, combining all agents' results.
         """
-        print("\n--- STARTING MARKET INSIGHT WORKFLOW ---")
+        logger.info("Starting market insight workflow")
 
         # Initialize the report structure
         insights_report = {
+            "region": region,
+            "timeframe": timeframe,
             "segment_analysis": None,
             "market_size": None,
             "market_outlook": None,
@@ -43,7 +48,7 @@ class MarketInsightOrchestrator:
 
         try:
             # Step 1: Identify Market Segment
-            print("\n--- Step 1: Identifying Market Segment ---")
+            logger.info("Step 1: Identifying Market Segment")
             segment_data = self.segment_agent.identify_segment(description=description)
             if not segment_data or not segment_data.get("segment"):
                 raise ValueError("Market segment identification failed.")
@@ -51,7 +56,7 @@ class MarketInsightOrchestrator:
             insights_report["segment_analysis"] = segment_data
 
             # Step 2: Determine Market Size
-            print("\n--- Step 2: Calculating Market Size ---")
+            logger.info("Step 2: Calculating Market Size")
             size_data = self.size_agent.get_market_size(segment=segment_data["segment"], region=region)
             if not size_data or not size_data.get("TAM"):
                 raise ValueError("Market size analysis failed.")
@@ -59,7 +64,7 @@ class MarketInsightOrchestrator:
             insights_report["market_size"] = size_data
 
             # Step 3: Assess Market Outlook
-            print("\n--- Step 3: Assessing Market Outlook ---")
+            logger.info("Step 3: Assessing Market Outlook")
             outlook_data = self.outlook_agent.get_market_outlook(segment=segment_data["segment"], region=region, timeframe=timeframe)
             if not outlook_data or not outlook_data.get("growth_rate"):
                 raise ValueError("Market outlook analysis failed.")
@@ -67,7 +72,7 @@ class MarketInsightOrchestrator:
             insights_report["market_outlook"] = outlook_data
 
             # Step 4: Profitability Assessment
-            print("\n--- Step 4: Assessing Profitability ---")
+            logger.info("Step 4: Assessing Profitability")
             profitability_data = self.profitability_agent.get_profitability(
                 startup_data={
                     "industry": segment_data["segment"],
@@ -88,10 +93,10 @@ class MarketInsightOrchestrator:
 
             insights_report["profitability"] = profitability_data
 
-            print("\n--- MARKET INSIGHT WORKFLOW COMPLETED SUCCESSFULLY ---")
+            logger.info("Market insight workflow completed successfully")
 
         except Exception as e:
-            print(f"Error occurred during market insight generation: {e}")
+            logger.warning("Error occurred during market insight generation: %s", e)
             # Capture error in the final report
             insights_report["error"] = str(e)
 
@@ -1,6 +1,10 @@
 # src/orchestrator_validation.py
 import os
+import re
 import sys
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure the validation_agents package can be found
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -8,34 +12,158 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from validation_agents.decomposer_agent import DecomposerAgent
 from validation_agents.planner_agent import PlannerAgent
 from Agents.search_agent import SearchAgent
+from Agents.rate_limiter import bind_meter
 from validation_agents.reputability_agent import ReputabilityAgent
 from validation_agents.validation_agent import ValidationAgent
+from analysis_budget import AnalysisBudget
+
+logger = logging.getLogger(__name__)
 
 class ValidationOrchestrator:
     """Manages the entire multi-agent claim validation workflow."""
-    def __init__(self, llm_api_key: str, tavily_api_key: str, model: str):
+    def __init__(self, llm_api_key: str, tavily_api_key: str, model: str,
+                 streaming: bool = True, plan_batch_size: int = 4, max_workers: int = 8,
+                 document_plan_chunk_size: int = 12):
+        self.streaming = streaming
+        self.plan_batch_size = plan_batch_size
+        self.document_plan_chunk_size = document_plan_chunk_size
+        self.max_workers = max_workers
         self.decomposer = DecomposerAgent(model=model, api_key=llm_api_key)
         self.planner = PlannerAgent(model=model, api_key=llm_api_key)
         self.searcher = SearchAgent(api_key=tavily_api_key)
         self.reputability_checker = ReputabilityAgent(model=model, api_key=llm_api_key)
         self.validator = ValidationAgent(model=model, api_key=llm_api_key)
 
-    def run(self, text: str, document_context: str | None = None) -> dict:
+    def run(self, text: str, document_context: str | None = None,
+            claims: list[str] | None = None, queries: list[str] | None = None,
+            budget: AnalysisBudget | None = None, page_number: int | None = None) -> dict:
         """
         Executes the full, multi-agent validation workflow from start to finish.
         This now validates claims one by one for improved reliability.
+        Claims and queries produced upstream (e.g. by the fused agent) skip decomposition and planning.
+        Under a budget, searches are capped and low-priority claims may be left NOT_CHECKED.
         """
-        print("\n--- STARTING CLAIM VALIDATION SUB-WORKFLOW ---")
+        if self.streaming:
+            return self._run_streaming(text, document_context, claims, queries, budget, page_number)
+        return self._run_sequential(text, document_context, claims, queries, budget, page_number)
+
+    @staticmethod
+    def _budgeted_claims(claims: list[str], budget: AnalysisBudget | None, page_number: int | None) -> list[str]:
+        """The claims worth validating within the budget (all of them without one)."""
+        if budget is None:
+            return list(claims)
+        return budget.select_claims(claims, page_number)[0]
+
+    @staticmethod
+    def _query_cap(queries: list[str], budget: AnalysisBudget | None) -> list[str]:
+        cap = budget.max_queries() if budget is not None else None
+        return list(queries) if cap is None else list(queries)[:cap]
+
+    def _merge_verdicts(self, claims: list[str], verdicts: dict) -> list[dict]:
+        """Verdicts in claim order; claims that were never validated are marked NOT_CHECKED."""
+        return [
+            (verdicts[claim] or self._validation_error(claim)) if claim in verdicts
+            else AnalysisBudget.not_checked_result(claim)
+            for claim in claims
+        ]
+
+    def _run_streaming(self, text: str, document_context: str | None = None,
+                       claims: list[str] | None = None, queries: list[str] | None = None,
+                       budget: AnalysisBudget | None = None, page_number: int | None = None) -> dict:
+        """
+        Streaming variant of the workflow: claims are planned in small batches while the
+        decomposer is still writing, and each planned query is searched as soon as it
+        is complete. Claims are then validated concurrently against the shared evidence.
+        """
+        logger.info("Starting streaming claim validation sub-workflow")
+        search_futures = []
+        seen_queries = set()
+        lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def submit_search(query: str):
+                key = query.strip().lower()
+                cap = budget.max_queries() if budget is not None else None
+                with lock:
+                    if key in seen_queries or (cap is not None and len(seen_queries) >= cap):
+                        return
+                    seen_queries.add(key)
+                    search_futures.append(pool.submit(self.searcher.search_query, query))
+
+            def plan_batch(batch: list[str]):
+                for query in self.planner.plan_stream(batch, document_context=document_context):
+                    submit_search(query)
+
+            plan_futures = []
+            if claims and queries:
+                # Already planned upstream: only the searches remain
+                claims = list(claims)
+                for query in queries:
+                    submit_search(query)
+            else:
+                # Step 1 + 2: Decompose, plan and search, overlapping as results stream in
+                claims = []
+                batch = []
+                for claim in self.decomposer.decompose_stream(text):
+                    claims.append(claim)
+                    batch.append(claim)
+                    if len(batch) >= self.plan_batch_size:
+                        plan_futures.append(pool.submit(bind_meter(plan_batch), batch))
+                        batch = []
+                if batch:
+                    plan_futures.append(pool.submit(bind_meter(plan_batch), batch))
+            if not claims:
+                return {"error": "Validation failed: Could not decompose text into claims."}
+
+            for future in plan_futures:
+                future.result()
+            to_validate = self._budgeted_claims(claims, budget, page_number)
+            if not to_validate:
+                return {"validation_results": self._merge_verdicts(claims, {})}
+            with lock:
+                pending_searches = list(search_futures)
+            if not pending_searches:
+                return {"error": "Validation failed: Could not create a search plan."}
+
+            context, sources = self.searcher.consolidate([f.result() for f in pending_searches])
+            if not context:
+                return {"error": "Validation failed: Failed to retrieve any content."}
+
+            # Step 3: Evaluate source reputability once for all sources
+            evaluated_sources = self.reputability_checker.evaluate(sources)
+            context.annotate(evaluated_sources)
+
+            # Step 4: Validate every claim against the shared context, in parallel
+            # The first claim runs alone so the shared prefix is cached before the fan-out
+            session = self.validator.start_session(context, evaluated_sources)
+            reports = [session.validate(to_validate[0])] + list(pool.map(bind_meter(session.validate), to_validate[1:]))
+            final_validation_list = self._merge_verdicts(claims, dict(zip(to_validate, reports)))
+
+        cache_report = session.cache_report()
+        logger.info("Prompt cache: %s/%s prompt tokens cached (%s).", cache_report['cached_tokens'],
+                    cache_report['prompt_tokens'], format(cache_report['cached_ratio'], ".0%"))
+        logger.info("Streaming claim validation sub-workflow completed")
+        return {"validation_results": final_validation_list, "prompt_cache": cache_report}
+
+    def _run_sequential(self, text: str, document_context: str | None = None,
+                        claims: list[str] | None = None, queries: list[str] | None = None,
+                        budget: AnalysisBudget | None = None, page_number: int | None = None) -> dict:
+        """The original, fully sequential workflow."""
+        logger.info("Starting claim validation sub-workflow")
         
         # Step 1: Decompose text into a list of claims
-        claims = self.decomposer.decompose(text)
+        claims = claims or self.decomposer.decompose(text)
         if not claims: 
             return {"error": "Validation failed: Could not decompose text into claims."}
         
         # Step 2: Create a search plan and retrieve all context needed for ALL claims
-        queries = self.planner.plan(claims, document_context=document_context)
+        queries = queries or self.planner.plan(claims, document_context=document_context)
         if not queries: 
             return {"error": "Validation failed: Could not create a search plan."}
+        to_validate = self._budgeted_claims(claims, budget, page_number)
+        if not to_validate:
+            return {"validation_results": self._merge_verdicts(claims, {})}
+        queries = self._query_cap(queries, budget)
         
         context, sources = self.searcher.search(queries)
         if not context: 
@@ -43,27 +171,141 @@ class ValidationOrchestrator:
         
         # Step 3: Evaluate source reputability once for all sources
         evaluated_sources = self.reputability_checker.evaluate(sources)
+        context.annotate(evaluated_sources)
         
         # --- NEW PATHWAY: Loop and validate each claim individually ---
-        print("\n--- Starting Individual Claim Validation Loop ---")
-        final_validation_list = []
-        for i, claim in enumerate(claims):
-            print(f"\n>>> Validating Claim {i+1}/{len(claims)}: '{claim}'")
+        logger.info("Starting individual claim validation loop")
+        verdicts = {}
+        session = self.validator.start_session(context, evaluated_sources)
+        for i, claim in enumerate(to_validate):
+            logger.info("Validating claim %s/%s: '%s'", i+1, len(to_validate), claim)
             # The validator agent is now called inside the loop for each claim
-            single_claim_report = self.validator.validate(claim, context, evaluated_sources)
-            if single_claim_report:
-                final_validation_list.append(single_claim_report)
-            else:
-                # Append a failure record if the agent returns nothing
-                final_validation_list.append({
-                    "claim": claim,
-                    "conclusion": "VALIDATION_ERROR",
-                    "summary": "The validation agent failed to produce a result for this claim.",
-                    "evidence": []
-                })
-        print("--- Individual Claim Validation Loop COMPLETED ---\n")
-
-        final_report = {"validation_results": final_validation_list}
+            verdicts[claim] = session.validate(claim)
+        # Failure records for claims the agent returned nothing for, NOT_CHECKED for skipped ones
+        final_validation_list = self._merge_verdicts(claims, verdicts)
+        logger.info("Individual claim validation loop completed")
+
+        final_report = {"validation_results": final_validation_list, "prompt_cache": session.cache_report()}
         
-        print("--- CLAIM VALIDATION SUB-WORKFLOW COMPLETED ---\n")
-        return final_report
\ No newline at end of file
+        logger.info("Claim validation sub-workflow completed")
+        return final_report
+
+    def run_document(self, page_claims: dict[int, list[str]], document_context: str | None = None,
+                     budget: AnalysisBudget | None = None) -> dict:
+        """
+        Two-phase, document-wide validation.
+
+        Phase one takes the claims of every page, de-duplicates them, and builds one global
+        search plan (planned in chunks of related claims, with queries de-duplicated across
+        chunks), runs one search wave and one reputability pass. Phase two validates every
+        unique claim against the evidence gathered for its chunk, and maps the verdicts back
+        to the pages.
+
+        Under a budget, only the most material claims of each page may be planned and validated,
+        plans are capped, and claims left over when the budget runs out are marked NOT_CHECKED.
+
+        Returns {"pages": {page_num: {"validation_results": [...]}}, "summary": {...}}.
+        """
+        logger.info("Starting document-wide claim validation")
+        unique_claims = {}
+        for page_num, claims in page_claims.items():
+            for claim in self._budgeted_claims(claims, budget, page_num + 1):
+                unique_claims.setdefault(self._claim_key(claim), claim)
+        claim_list = list(unique_claims.values())
+        size = self.document_plan_chunk_size
+        chunks = [claim_list[i:i + size] for i in range(0, len(claim_list), size)]
+        logger.info("%s claims on %s pages, %s unique, planned in %s chunk(s).",
+                    sum(len(c) for c in page_claims.values()), len(page_claims), len(claim_list), len(chunks))
+
+        if not claim_list:
+            pages = {page_num: {"validation_results": self._merge_verdicts(claims, {})}
+                     for page_num, claims in page_claims.items()}
+            return {"pages": pages, "summary": {"claims": sum(len(c) for c in page_claims.values()),
+                                                "unique_claims": 0, "queries": 0, "sources": 0}}
+
+        verdicts = {}
+        sessions = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Phase 1: one global plan, one search wave, one reputability pass
+            chunk_queries = list(pool.map(bind_meter(
+                lambda chunk: self._query_cap(self.planner.plan(chunk, document_context=document_context), budget)
+            ), chunks))
+            search_futures = {}
+            for queries in chunk_queries:
+                for query in queries:
+                    key = query.strip().lower()
+                    if key not in search_futures:
+                        search_futures[key] = pool.submit(self.searcher.search_query, query)
+            results_by_query = {key: future.result() for key, future in search_futures.items()}
+            logger.info("Global search plan: %s unique queries (from %s planned).", len(search_futures),
+                        sum(len(q) for q in chunk_queries))
+
+            all_sources = {}
+            for results in results_by_query.values():
+                for res in results:
+                    if res.get('url') and res['url'] not in all_sources:
+                        all_sources[res['url']] = {'title': res.get('title'), 'url': res.get('url')}
+            evaluated = {s['url']: s for s in self.reputability_checker.evaluate(list(all_sources.values()))}
+
+            # Phase 2: validate each chunk's claims against its share of the evidence pool
+            jobs = []
+            for chunk, queries in zip(chunks, chunk_queries):
+                keys = list(dict.fromkeys(q.strip().lower() for q in queries))
+                context, chunk_sources = self.searcher.consolidate([results_by_query[k] for k in keys], keys)
+                if not context:
+                    for claim in chunk:
+                        verdicts[self._claim_key(claim)] = self._validation_error(claim)
+                    continue
+                session = self.validator.start_session(context, [evaluated.get(s['url'], s) for s in chunk_sources])
+                sessions.append(session)
+                jobs.append((session, chunk))
+
+            if budget is not None and budget.exhausted():
+                for session, chunk in jobs:
+                    for claim in chunk:
+                        budget.mark_not_checked("claim", claim)
+                jobs = []
+
+            # The first claim of each chunk warms that chunk's prompt cache before the fan-out
+            warm = list(pool.map(bind_meter(lambda job: job[0].validate(job[1][0])), jobs))
+            rest = [(session, claim) for session, chunk in jobs for claim in chunk[1:]]
+            rest_reports = list(pool.map(bind_meter(lambda pair: pair[0].validate(pair[1])), rest))
+            for (session, chunk), report in zip(jobs, warm):
+                verdicts[self._claim_key(chunk[0])] = report or self._validation_error(chunk[0])
+            for (session, claim), report in zip(rest, rest_reports):
+                verdicts[self._claim_key(claim)] = report or self._validation_error(claim)
+
+        pages = {
+            page_num: {"validation_results": [
+                verdicts.get(self._claim_key(c)) or AnalysisBudget.not_checked_result(c) for c in claims
+            ]}
+            for page_num, claims in page_claims.items()
+        }
+        prompt_tokens = sum(s.cache_report()["prompt_tokens"] for s in sessions)
+        cached_tokens = sum(s.cache_report()["cached_tokens"] for s in sessions)
+        summary = {
+            "claims": sum(len(c) for c in page_claims.values()),
+            "unique_claims": len(claim_list),
+            "queries": len(search_futures),
+            "sources": len(all_sources),
+            "prompt_cache": {
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "cached_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0
+            }
+        }
+        logger.info("Document-wide claim validation completed: %s", summary)
+        return {"pages": pages, "summary": summary}
+
+    @staticmethod
+    def _claim_key(claim: str) -> str:
+        return re.sub(r"\s+", " ", claim).strip().rstrip(".").lower()
+
+    @staticmethod
+    def _validation_error(claim: str) -> dict:
+        return {
+            "claim": claim,
+            "conclusion": "VALIDATION_ERROR",
+            "summary": "The validation agent failed to produce a result for this claim.",
+            "evidence": []
+        }
\ No newline at end of file
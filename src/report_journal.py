@@ -0,0 +1,181 @@
+# src/report_journal.py
+import os
+import json
+import hashlib
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_DIR = os.path.join("reports", "journals")
+
+
+class JournalLockedError(RuntimeError):
+    """Another run is already writing the journal of this job."""
+
+
+def compute_job_id(pdf_path: str) -> str:
+    """Derives a stable job id from the PDF name and content so re-runs find their journal."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    return f"{base_name}_{digest.hexdigest()[:12]}"
+
+
+class ReportJournal:
+    """
+    Append-only, per-job JSONL journal of completed analysis units.
+
+    Every finished unit (document context, market insights, competitor research,
+    a single page) is written as one line and fsynced, so a crash only loses
+    the unit that was in flight. The final report is assembled from the journal.
+
+    A run holds the journal's lock file (acquire()/release(), or use the journal as a
+    context manager) while it writes, so two concurrent runs of the same deck cannot
+    reset or interleave each other's journal; the second one fails fast instead.
+    """
+
+    def __init__(self, job_id: str, journal_dir: str = JOURNAL_DIR):
+        self.job_id = job_id
+        self.path = os.path.join(journal_dir, f"{job_id}.jsonl")
+        self._lock = threading.Lock()
+        self._units: dict[str, dict] = {}
+        self._lock_file = None
+        os.makedirs(journal_dir, exist_ok=True)
+
+    def acquire(self) -> "ReportJournal":
+        """Takes the job's exclusive lock; raises JournalLockedError if another run holds it."""
+        lock_file = open(self.path + ".lock", "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            raise JournalLockedError(f"Job {self.job_id} is already being analyzed by another run")
+        self._lock_file = lock_file
+        return self
+
+    def release(self):
+        """Gives up the lock (the OS also drops it if the process dies)."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __enter__(self) -> "ReportJournal":
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def load(self, repair: bool = True) -> "ReportJournal":
+        """
+        Reads existing entries; a torn last line from a crash is truncated away.
+        With repair=False the file is only read and unreadable lines are skipped, which is
+        safe on the journal of a job that is still running (and may be mid-append).
+        """
+        self._units = {}
+        if not os.path.exists(self.path):
+            return self
+        good_offset = 0
+        with open(self.path, 'rb') as f:
+            for line_no, raw in enumerate(f, start=1):
+                line = raw.strip()
+                if line:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        if not repair:
+                            continue
+                        logger.warning("Dropping unreadable journal line %s in %s", line_no, self.path)
+                        break
+                    self._units[entry["unit"]] = entry["data"]
+                good_offset += len(raw)
+        if repair and good_offset < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+        logger.info("Loaded %s completed unit(s) from %s", len(self._units), self.path)
+        return self
+
+    def reset(self):
+        """Discards any previous journal for this job."""
+        with self._lock:
+            self._units = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def record(self, unit: str, data):
+        """Durably appends one completed unit. Later entries for the same unit win."""
+        line = json.dumps({"unit": unit, "data": data}, separators=(',', ':'))
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._units[unit] = data
+
+    def get(self, unit: str):
+        return self._units.get(unit)
+
+    def is_complete(self, unit: str) -> bool:
+        """
+        A unit counts as complete unless it was recorded with an error status or left unchecked
+        by a budget, wholly or in part (a page with NOT_CHECKED claims is run again on resume).
+        """
+        data = self._units.get(unit)
+        if data is None:
+            return False
+        if isinstance(data, dict) and data.get("status") in ("error", "Error", "Failed", "Not checked"):
+            return False
+        if any(verdict.get("conclusion") == "NOT_CHECKED" for verdict in self.page_verdicts(data)):
+            return False
+        return True
+
+    @staticmethod
+    def page_verdicts(page_report) -> list[dict]:
+        """The claim verdicts of a journaled page report (empty for other units)."""
+        if not isinstance(page_report, dict):
+            return []
+        results = page_report.get("validation_results")
+        if isinstance(results, dict):
+            results = results.get("validation_results")
+        return [r for r in results if isinstance(r, dict)] if isinstance(results, list) else []
+
+    @staticmethod
+    def page_unit(page_num: int) -> str:
+        return f"page:{page_num}"
+
+    def page_count(self) -> int:
+        """Number of pages the journal knows about (highest journaled page + 1)."""
+        pages = [int(unit.split(":", 1)[1]) for unit in self._units
+                 if unit.startswith(("page:", "claims:"))]
+        return max(pages) + 1 if pages else 0
+
+    def assemble(self, num_pages: int) -> dict:
+        """Builds the final report from the journaled units, in page order."""
+        pages = []
+        for page_num in range(num_pages):
+            page_report = self._units.get(self.page_unit(page_num))
+            if page_report is None:
+                page_report = {"page_number": page_num + 1, "status": "Missing"}
+            pages.append(page_report)
+        report = {
+            "market_insights": self._units.get("market_insights"),
+            "competitor_research": self._units.get("competitor_research"),
+            "document_validation": pages
+        }
+        if "validation_summary" in self._units:
+            report["validation_summary"] = self._units["validation_summary"]
+        if self._units.get("budget"):
+            report["budget"] = self._units["budget"]
+        return report
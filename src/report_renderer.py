@@ -0,0 +1,198 @@
+# src/report_renderer.py
+import os
+import json
+import html
+import hashlib
+import logging
+import threading
+
+from report_journal import ReportJournal, JOURNAL_DIR
+from report_store import ReportStore, REPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_DIR = os.path.join(REPORTS_DIR, "cache", "pdf")
+# Bumped whenever the layout changes, so older renders are not served for the same content
+RENDERER_VERSION = 1
+
+PAGE_SIZE = (595, 842)  # A4 in points
+MARGIN = 50
+
+_CSS = """
+body { font-family: sans-serif; font-size: 10pt; }
+h1 { font-size: 18pt; }
+h2 { font-size: 13pt; margin-top: 14pt; }
+h3 { font-size: 11pt; margin-top: 8pt; }
+.SUPPORTED { color: #1B873F; }
+.CONTRADICTED { color: #C62828; }
+.INSUFFICIENT_INFORMATION { color: #8A6D00; }
+.muted { color: #666666; }
+"""
+
+
+def _e(value) -> str:
+    return html.escape(str(value)) if value is not None else ""
+
+
+def _render_value(value) -> str:
+    """Renders nested agent output (dicts, lists, scalars) as simple HTML."""
+    if isinstance(value, dict):
+        return "".join(f"<p><b>{_e(k.replace('_', ' ').capitalize())}:</b></p>{_render_value(v)}"
+                       if isinstance(v, (dict, list)) else
+                       f"<p><b>{_e(k.replace('_', ' ').capitalize())}:</b> {_e(v)}</p>"
+                       for k, v in value.items())
+    if isinstance(value, list):
+        return "<ul>" + "".join(f"<li>{_render_value(v) if isinstance(v, (dict, list)) else _e(v)}</li>"
+                                for v in value) + "</ul>"
+    return f"<p>{_e(value)}</p>"
+
+
+def report_to_html(report: dict, title: str) -> str:
+    """Lays out an analysis report as HTML for PyMuPDF's Story renderer."""
+    parts = [f"<h1>{_e(title)}</h1>"]
+
+    summary = report.get("validation_summary")
+    if summary:
+        parts.append("<h2>Validation summary</h2>" + _render_value(summary))
+
+    for key, heading in (("market_insights", "Market insights"), ("competitor_research", "Competitor research")):
+        section = report.get(key)
+        if not section:
+            continue
+        parts.append(f"<h2>{heading}</h2>")
+        if section.get("status") == "error":
+            parts.append(f"<p class='muted'>Not available: {_e(section.get('error'))}</p>")
+        else:
+            parts.append(_render_value(section.get("data", section)))
+
+    pages = report.get("document_validation") or report.get("document_analysis_report") or []
+    if pages:
+        parts.append("<h2>Claim validation</h2>")
+    for page in pages:
+        parts.append(f"<h3>Page {_e(page.get('page_number'))} <span class='muted'>({_e(page.get('status'))})</span></h3>")
+        results = page.get("validation_results") or {}
+        if isinstance(results, dict):
+            if results.get("error"):
+                parts.append(f"<p class='muted'>{_e(results['error'])}</p>")
+            results = results.get("validation_results") or []
+        if not results and page.get("reason"):
+            parts.append(f"<p class='muted'>{_e(page['reason'])}</p>")
+        for res in results:
+            conclusion = res.get("conclusion") or ""
+            parts.append(f"<p><b>{_e(res.get('claim'))}</b><br/>"
+                         f"<span class='{_e(conclusion)}'>{_e(conclusion.replace('_', ' '))}</span> "
+                         f"{_e(res.get('summary'))}</p>")
+    return f"<html><body>{''.join(parts)}</body></html>"
+
+
+def content_hash(report: dict, title: str = "") -> str:
+    """
+    Hash of the report content, its title and the renderer version. Identical reports share
+    one rendered PDF; the title is part of the hash because it is printed on the first page.
+    """
+    payload = json.dumps(report, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(f"{RENDERER_VERSION}\x00{title}\x00{payload}".encode('utf-8')).hexdigest()
+
+
+class ReportRenderer:
+    """
+    Renders finished reports to PDF with PyMuPDF and caches the files by content hash.
+
+    A report is only rendered the first time its content is seen; later requests for
+    the same content (from any job or process) are served from the cache directory.
+    The hash doubles as the ETag.
+    """
+
+    def __init__(self, cache_dir: str = PDF_CACHE_DIR, store: ReportStore | None = None):
+        self.cache_dir = cache_dir
+        self.store = store
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._render_locks: dict[str, threading.Lock] = {}
+        # (file path, mtime) -> content hash, so unchanged report files are not re-hashed
+        self._hashes: dict[tuple, str] = {}
+
+    # --- LOOKUP ---
+
+    def load_report(self, job_id: str) -> tuple[dict, tuple | None] | None:
+        """
+        Finds the report for a job id: an indexed report id, a reports/<id>_report.json
+        file, or the journal of a (possibly still running) job. Returns (report, file_version).
+        """
+        candidates = []
+        if self.store is not None:
+            path = self.store.file_path_for(job_id)
+            if path:
+                candidates.append(path)
+        candidates.append(os.path.join(REPORTS_DIR, f"{job_id}_report.json"))
+        for path in candidates:
+            if os.path.isfile(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f), (path, os.path.getmtime(path))
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.error("Could not read report %s: %s", path, e)
+                    return None
+
+        if os.path.isfile(os.path.join(JOURNAL_DIR, f"{job_id}.jsonl")):
+            # The job may still be running: read its journal without repairing (truncating) it
+            journal = ReportJournal(job_id).load(repair=False)
+            return journal.assemble(journal.page_count()), None
+        return None
+
+    # --- RENDERING ---
+
+    def _key_for(self, report: dict, title: str, file_version: tuple | None) -> str:
+        if file_version is None:
+            return content_hash(report, title)
+        with self._lock:
+            key = self._hashes.get((file_version, title))
+        if key is None:
+            key = content_hash(report, title)
+            with self._lock:
+                self._hashes[(file_version, title)] = key
+        return key
+
+    def _render(self, report: dict, title: str, out_path: str):
+        import fitz  # PyMuPDF
+        story = fitz.Story(html=report_to_html(report, title), user_css=_CSS)
+        mediabox = fitz.Rect(0, 0, *PAGE_SIZE)
+        where = mediabox + (MARGIN, MARGIN, -MARGIN, -MARGIN)
+        writer = fitz.DocumentWriter(out_path)
+        more = 1
+        while more:
+            device = writer.begin_page(mediabox)
+            more, _ = story.place(where)
+            story.draw(device)
+            writer.end_page()
+        writer.close()
+
+    def render(self, report: dict, title: str, file_version: tuple | None = None) -> tuple[str, str]:
+        """Returns (pdf_path, content_hash), rendering only if this content has no cached PDF yet."""
+        key = self._key_for(report, title, file_version)
+        path = os.path.join(self.cache_dir, f"{key}.pdf")
+        if os.path.exists(path):
+            return path, key
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        try:
+            with render_lock:
+                if not os.path.exists(path):
+                    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    self._render(report, title, tmp_path)
+                    os.replace(tmp_path, path)
+                    logger.info("Rendered report PDF %s", path)
+        finally:
+            # Later requests find the cached file, so the lock is only needed while this render runs
+            with self._lock:
+                if self._render_locks.get(key) is render_lock:
+                    del self._render_locks[key]
+        return path, key
+
+    def render_job(self, job_id: str) -> tuple[str, str] | None:
+        """Renders (or fetches from cache) the PDF for a job; None if no report exists for it."""
+        found = self.load_report(job_id)
+        if found is None:
+            return None
+        report, file_version = found
+        return self.render(report, f"Analysis report: {job_id}", file_version)
@@ -0,0 +1,258 @@
+# src/report_store.py
+import os
+import re
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = "reports"
+DEFAULT_DB_PATH = os.path.join(REPORTS_DIR, "report_index.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_id TEXT PRIMARY KEY,
+    file_path TEXT,
+    file_mtime REAL,
+    source_document TEXT,
+    created_at TEXT,
+    num_pages INTEGER,
+    segment TEXT,
+    region TEXT,
+    claims_total INTEGER,
+    claims_supported INTEGER,
+    claims_contradicted INTEGER,
+    claims_insufficient INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_segment ON reports(segment COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS claims (
+    report_id TEXT,
+    page_number INTEGER,
+    claim TEXT,
+    conclusion TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_claims_report ON claims(report_id);
+CREATE INDEX IF NOT EXISTS idx_claims_conclusion ON claims(conclusion, report_id);
+
+CREATE TABLE IF NOT EXISTS competitors (
+    report_id TEXT,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_competitors_name ON competitors(name COLLATE NOCASE, report_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS report_fts USING fts5(
+    report_id UNINDEXED,
+    kind UNINDEXED,
+    page_number UNINDEXED,
+    content,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_TIMESTAMP_RE = re.compile(r"_(\d{8}_\d{6})$")
+
+
+def _fts_query(text: str) -> str | None:
+    """Turns free user text into a safe FTS5 prefix query (all terms must match)."""
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+class ReportStore:
+    """
+    Embedded SQLite index over finished reports.
+
+    Claims, verdicts, market segments, competitors and report metadata are
+    extracted once at ingest time, so searches never touch the JSON files.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is always closed."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+
+    # --- INGESTION ---
+
+    def ingest(self, report: dict, report_id: str, file_path: str = None,
+               file_mtime: float = None, created_at: str = None):
+        """Indexes a single report dict, replacing any previous version of it."""
+        pages = report.get("document_validation") or report.get("document_analysis_report") or []
+        market = (report.get("market_insights") or {}).get("data") or {}
+        segment_data = market.get("segment_analysis") or {}
+        segment = segment_data.get("segment")
+        # Reports written before the orchestrator recorded its region have none
+        region = market.get("region") or (market.get("market_size") or {}).get("region")
+        competitor_data = (report.get("competitor_research") or {}).get("data") or {}
+
+        claim_rows, fts_rows = [], []
+        for page in pages:
+            page_number = page.get("page_number")
+            results = page.get("validation_results") or {}
+            if isinstance(results, dict):
+                results = results.get("validation_results") or []
+            for res in results:
+                claim = res.get("claim") or ""
+                conclusion = res.get("conclusion")
+                claim_rows.append((report_id, page_number, claim, conclusion))
+                fts_rows.append((report_id, "claim", page_number,
+                                 f"{claim}\n{conclusion or ''}\n{res.get('summary') or ''}"))
+
+        competitors = set(competitor_data.get("similar_companies") or [])
+        ranked = competitor_data.get("ranked_competitors") or {}
+        for comp in ranked.get("ranked_competitors", []) if isinstance(ranked, dict) else []:
+            if comp.get("name"):
+                competitors.add(comp["name"])
+        for name in competitors:
+            fts_rows.append((report_id, "competitor", None, name))
+
+        if segment_data:
+            fts_rows.append((report_id, "segment", None, " ".join(filter(None, [
+                segment,
+                " ".join(segment_data.get("sub_segments") or []),
+                " ".join(segment_data.get("keywords") or []),
+            ]))))
+
+        source_document = None
+        match = _TIMESTAMP_RE.search(report_id)
+        if match:
+            source_document = report_id[:match.start()]
+            created_at = created_at or datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+        fts_rows.append((report_id, "metadata", None, " ".join(filter(None, [report_id, source_document]))))
+
+        conclusions = [row[3] for row in claim_rows]
+        with self._lock, self._connect() as conn:
+            for table in ("reports", "claims", "competitors", "report_fts"):
+                conn.execute(f"DELETE FROM {table} WHERE report_id = ?", (report_id,))
+            conn.execute(
+                "INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (report_id, file_path, file_mtime, source_document,
+                 created_at or datetime.now().isoformat(), len(pages), segment,
+                 region, len(conclusions),
+                 conclusions.count("SUPPORTED"), conclusions.count("CONTRADICTED"),
+                 conclusions.count("INSUFFICIENT_INFORMATION"))
+            )
+            conn.executemany("INSERT INTO claims VALUES (?, ?, ?, ?)", claim_rows)
+            conn.executemany("INSERT INTO competitors VALUES (?, ?)", [(report_id, n) for n in competitors])
+            conn.executemany("INSERT INTO report_fts VALUES (?, ?, ?, ?)", fts_rows)
+
+    def ingest_file(self, file_path: str) -> bool:
+        """Indexes a report file unless the same version is already in the index."""
+        report_id = os.path.splitext(os.path.basename(file_path))[0]
+        if report_id.endswith("_report"):
+            report_id = report_id[:-len("_report")]
+        mtime = os.path.getmtime(file_path)
+        with self._connect() as conn:
+            row = conn.execute("SELECT file_mtime FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        if row and row["file_mtime"] == mtime:
+            return False
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error("Could not index report %s: %s", file_path, e)
+            return False
+        self.ingest(report, report_id, file_path=file_path, file_mtime=mtime)
+        return True
+
+    def ingest_directory(self, directory: str = REPORTS_DIR) -> int:
+        """Indexes every new or changed *_report.json file in a directory."""
+        if not os.path.isdir(directory):
+            return 0
+        count = 0
+        for name in sorted(os.listdir(directory)):
+            if name.endswith("_report.json"):
+                count += self.ingest_file(os.path.join(directory, name))
+        if count:
+            logger.info("Indexed %s report(s) from %s", count, directory)
+        return count
+
+    # --- QUERIES ---
+
+    def file_path_for(self, report_id: str) -> str | None:
+        """The file an indexed report was read from, if any."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT file_path FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        return row["file_path"] if row else None
+
+    def search(self, text: str = None, conclusion: str = None, segment: str = None,
+               competitor: str = None, date_from: str = None, date_to: str = None,
+               limit: int = 50, offset: int = 0, region: str = None) -> list[dict]:
+        """
+        Returns matching reports, newest first, with up to three highlighted snippets each.
+
+        Args:
+            text (str): Free-text query over claims, verdict summaries, segments, competitors and metadata.
+            conclusion (str): Only reports with at least one claim with this verdict (e.g. CONTRADICTED).
+            segment (str): Market segment, case-insensitive exact match.
+            region (str): Region of the market insights, case-insensitive exact match.
+            competitor (str): Competitor name, case-insensitive exact match.
+            date_from (str), date_to (str): ISO dates bounding the report creation time (inclusive).
+        """
+        where, params = [], []
+        fts = _fts_query(text) if text else None
+        if text and not fts:
+            return []
+        if fts:
+            where.append("r.report_id IN (SELECT report_id FROM report_fts WHERE report_fts MATCH ?)")
+            params.append(fts)
+        if conclusion:
+            where.append("r.report_id IN (SELECT report_id FROM claims WHERE conclusion = ?)")
+            params.append(conclusion.upper())
+        if segment:
+            where.append("r.segment = ? COLLATE NOCASE")
+            params.append(segment)
+        if region:
+            where.append("r.region = ? COLLATE NOCASE")
+            params.append(region)
+        if competitor:
+            where.append("r.report_id IN (SELECT report_id FROM competitors WHERE name = ? COLLATE NOCASE)")
+            params.append(competitor)
+        if date_from:
+            where.append("r.created_at >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("r.created_at <= ?")
+            params.append(date_to + "T23:59:59.999999" if len(date_to) == 10 else date_to)
+
+        sql = "SELECT r.* FROM reports r"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.created_at DESC LIMIT ? OFFSET ?"
+
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params + [limit, offset])]
+            if fts and rows:
+                # One pass over the match set for just the returned page of reports
+                by_id = {row["report_id"]: row for row in rows}
+                for row in rows:
+                    row["matches"] = []
+                placeholders = ",".join("?" * len(by_id))
+                for m in conn.execute(
+                    "SELECT report_id, kind, page_number, snippet(report_fts, 3, '[', ']', '...', 12) AS snippet "
+                    f"FROM report_fts WHERE report_fts MATCH ? AND report_id IN ({placeholders}) ORDER BY rank",
+                    [fts, *by_id]
+                ):
+                    matches = by_id[m["report_id"]]["matches"]
+                    if len(matches) < 3:
+                        matches.append({"kind": m["kind"], "page_number": m["page_number"], "snippet": m["snippet"]})
+        for row in rows:
+            row.pop("file_mtime", None)
+        return rows
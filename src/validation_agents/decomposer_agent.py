@@ -1,18 +1,46 @@
 # src/validation_agents/decomposer_agent.py
-import json
+import logging
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, obj, string
+from logging_config import LazyJson
+
+logger = logging.getLogger(__name__)
 
 class DecomposerAgent(BaseAgent):
     """An agent that breaks down a block of text into a list of atomic claims."""
+    output_schema = obj({"claims": array(string())})
+    max_output_tokens = 800
+
     def decompose(self, text: str) -> list[str]:
         """Runs the decomposition task."""
-        print("Agent [Decomposer]: Breaking down text into individual claims...")
+        logger.info("Agent [Decomposer]: Breaking down text into individual claims...")
         
         # --- LOGGING: Show the input text ---
-        print("\n--- Decomposer INPUT ---")
-        print(f"Text to decompose (first 500 chars):\n{text[:500]}...")
-        print("------------------------\n")
+        logger.debug("Text to decompose (first 500 chars):\n%s...", text[:500])
+
+        response = self._send_llm_request(self._build_messages(text))
+        
+        # --- LOGGING: Show the output claims ---
+        if response and 'claims' in response:
+            logger.debug("Extracted claims:\n%s", LazyJson(response['claims'], indent=2))
+            logger.info("Successfully decomposed into %s claims.", len(response['claims']))
+        else:
+            logger.warning("No claims were extracted or an error occurred.")
+        
+        return response.get('claims', []) if response else []
 
+    def decompose_stream(self, text: str):
+        """Like decompose(), but yields each claim as soon as the model has finished writing it."""
+        logger.info("Agent [Decomposer]: Streaming individual claims...")
+        count = 0
+        for claim in self._stream_llm_list(self._build_messages(text), 'claims'):
+            if isinstance(claim, str) and claim.strip():
+                count += 1
+                logger.debug("Agent [Decomposer]: Claim %s: '%s'", count, claim)
+                yield claim
+        logger.info("Agent [Decomposer]: Streamed %s claims.", count)
+
+    def _build_messages(self, text: str) -> list[dict]:
         messages = [
             {
                 "role": "system", 
@@ -43,16 +71,4 @@ class DecomposerAgent(BaseAgent):
                 "content": f"Extract the individual claims from the following text:\n\n---\n{text}\n---"
             }
         ]
-        
-        response = self._send_llm_request(messages)
-        
-        # --- LOGGING: Show the output claims ---
-        print("\n--- Decomposer OUTPUT ---")
-        if response and 'claims' in response:
-            print(f"Extracted claims:\n{json.dumps(response['claims'], indent=2)}")
-            print("Successfully decomposed into {} claims.".format(len(response['claims'])))
-        else:
-            print("No claims were extracted or an error occurred.")
-        print("-------------------------\n")
-        
-        return response.get('claims', []) if response else []
\ No newline at end of file
+        return messages
\ No newline at end of file
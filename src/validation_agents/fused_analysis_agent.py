@@ -0,0 +1,99 @@
+# src/validation_agents/fused_analysis_agent.py
+import logging
+from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, boolean, obj, string
+from logging_config import LazyJson
+
+logger = logging.getLogger(__name__)
+
+class FusedAnalysisAgent(BaseAgent):
+    """
+    An agent that triages a slide, extracts its claims and plans the search queries
+    in a single LLM call, instead of three sequential calls that each resend the slide.
+    """
+    output_schema = obj({
+        "contains_claims": boolean(),
+        "reason": string(),
+        "claims": array(string()),
+        "queries": array(string()),
+    })
+    max_output_tokens = 1000
+
+    def analyze(self, text: str, document_context: str | None = None) -> dict | None:
+        """
+        Returns {"contains_claims", "reason", "claims", "queries"}, or None if the
+        response does not pass validation and the caller should fall back to the
+        separate Triage, Decomposer and Planner agents.
+        """
+        logger.info("Agent [Fused]: Triaging, decomposing and planning in one pass...")
+        messages = [
+            {
+                "role": "system",
+                "content": """
+                You are a document analyst and expert fact-checking researcher. For one presentation slide you do three things:
+
+                1. TRIAGE: Decide whether the text contains factual, verifiable claims (statistics, data points, specific assertions),
+                   or whether it is a title, section divider, or purely aspirational marketing statement.
+                2. CLAIMS: If it does, extract the individual, atomic, verifiable claims. Prioritize claims with numbers, statistics,
+                   percentages or specific factual assertions. Ignore vague marketing language, rhetorical questions and section titles.
+                   Break composite sentences into atomic claims.
+                3. QUERIES: Convert the claims into a concise list of search engine queries that find primary sources to VERIFY or DISPROVE them.
+                   - Rephrase claims as neutral, fact-finding questions; do not search for the literal claim text.
+                   - For universal statistics (e.g. "50 million startups per year"), IGNORE the document context to avoid confirmation bias.
+                   - Use the document context (company name, topic) ONLY for claims specific to that subject.
+                   - Combine claims into one broader query where one search can answer several.
+
+                Output a JSON object with exactly these keys:
+                {
+                  "contains_claims": true or false,
+                  "reason": "One sentence explaining the triage decision.",
+                  "claims": ["<atomic claim>", ...],
+                  "queries": ["<search query>", ...]
+                }
+                If "contains_claims" is false, "claims" and "queries" must be empty lists.
+                """
+            },
+            {
+                "role": "user",
+                "content": f"""
+                **Document Context:**
+                "{document_context}"
+
+                **Slide Text:**
+                ---
+                {text}
+                ---
+                """
+            }
+        ]
+
+        response = self._send_llm_request(messages)
+        result = self._validate(response)
+        if result is None:
+            logger.warning("Agent [Fused]: Response failed validation, falling back to separate agents.")
+            logger.debug("Raw: %s", LazyJson(response, limit=500))
+            return None
+
+        logger.info("Agent [Fused]: Verifiable claims: %s, %s claim(s), %s query(ies).", result['contains_claims'],
+                    len(result['claims']), len(result['queries']))
+        return result
+
+    @staticmethod
+    def _validate(response: dict | None) -> dict | None:
+        """Checks the structured output; anything malformed or inconsistent is rejected."""
+        if not isinstance(response, dict) or not isinstance(response.get("contains_claims"), bool):
+            return None
+        claims = response.get("claims")
+        queries = response.get("queries")
+        if not isinstance(claims, list) or not isinstance(queries, list):
+            return None
+        claims = [c.strip() for c in claims if isinstance(c, str) and c.strip()]
+        queries = [q.strip() for q in queries if isinstance(q, str) and q.strip()]
+        if response["contains_claims"] and (not claims or not queries):
+            return None
+        return {
+            "contains_claims": response["contains_claims"],
+            "reason": response.get("reason") or "",
+            "claims": claims if response["contains_claims"] else [],
+            "queries": queries if response["contains_claims"] else []
+        }
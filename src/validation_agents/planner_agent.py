@@ -1,11 +1,30 @@
 # src/validation_agents/planner_agent.py
+import logging
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, obj, string
+
+logger = logging.getLogger(__name__)
 
 class PlannerAgent(BaseAgent):
     """An agent that creates an expert research plan to verify or disprove claims."""
+    output_schema = obj({"queries": array(string())})
+    max_output_tokens = 400
+
     def plan(self, claims: list[str], document_context: str | None = None) -> list[str]:
         """Creates an efficient list of investigative search queries."""
-        print("Agent [Planner]: Creating an efficient, context-aware search plan...")
+        logger.info("Agent [Planner]: Creating an efficient, context-aware search plan...")
+        response = self._send_llm_request(self._build_messages(claims, document_context))
+        return response.get('queries', []) if response else []
+
+    def plan_stream(self, claims: list[str], document_context: str | None = None):
+        """Like plan(), but yields each query as soon as the model has finished writing it."""
+        logger.info("Agent [Planner]: Streaming an efficient, context-aware search plan...")
+        for query in self._stream_llm_list(self._build_messages(claims, document_context), 'queries'):
+            if isinstance(query, str) and query.strip():
+                logger.debug("Agent [Planner]: Planned query: '%s'", query)
+                yield query
+
+    def _build_messages(self, claims: list[str], document_context: str | None) -> list[dict]:
         claims_str = "\n".join(f"- {c}" for c in claims)
         
         # --- MODIFICATION START: A much more sophisticated prompt for investigative queries ---
@@ -52,6 +71,4 @@ class PlannerAgent(BaseAgent):
             }
         ]
         # --- MODIFICATION END ---
-        
-        response = self._send_llm_request(messages)
-        return response.get('queries', []) if response else []
\ No newline at end of file
+        return messages
\ No newline at end of file
@@ -1,18 +1,67 @@
 # src/validation_agents/reputability_agent.py
-import json
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, number, obj, string
+from Agents.rate_limiter import bind_meter
+from Agents.result_cache import get_cache, content_key
+from logging_config import LazyJson
+
+logger = logging.getLogger(__name__)
+
+REPUTABILITY_CACHE_TTL = float(os.getenv("REPUTABILITY_CACHE_TTL_DAYS", 30)) * 86400
+# Sources rated per LLM call, sized so a batch's evaluations fit within max_output_tokens
+REPUTABILITY_BATCH_SIZE = int(os.getenv("REPUTABILITY_BATCH_SIZE", 15))
 
 class ReputabilityAgent(BaseAgent):
     """An agent that evaluates the credibility of a list of sources."""
+    output_schema = obj({"source_evaluations": array(obj({
+        "url": string(),
+        "reputability_score": number(),
+        "reputability_justification": string(),
+    }))})
+    max_output_tokens = 1500
+
     def evaluate(self, sources: list[dict]) -> list[dict]:
-        """Evaluates source credibility and enriches the source list."""
-        print("Agent [Reputability]: Evaluating source credibility...")
+        """
+        Evaluates source credibility and enriches the source list.
+        Sources are rated in batches of REPUTABILITY_BATCH_SIZE so that long source lists
+        (document mode) are not cut off by the output-token cap.
+        With the shared caches enabled, sources evaluated before are not sent to the LLM again.
+        """
+        logger.info("Agent [Reputability]: Evaluating source credibility...")
+        cache = get_cache("reputability", ttl_seconds=REPUTABILITY_CACHE_TTL)
+        if cache is not None:
+            pending = []
+            for source in sources:
+                cached = cache.get(content_key(source['url']))
+                if cached is not None:
+                    source.update(cached)
+                else:
+                    pending.append(source)
+            logger.info("%s of %s source evaluation(s) found in cache.", len(sources) - len(pending), len(sources))
+            if not pending:
+                return sources
+            self._evaluate(pending, cache)
+            return sources
+        return self._evaluate(sources)
+
+    def _evaluate(self, sources: list[dict], cache=None) -> list[dict]:
+        batches = [sources[i:i + REPUTABILITY_BATCH_SIZE] for i in range(0, len(sources), REPUTABILITY_BATCH_SIZE)]
+        if len(batches) > 1:
+            logger.info("Evaluating %s source(s) in %s batches.", len(sources), len(batches))
+            with ThreadPoolExecutor(max_workers=min(4, len(batches))) as pool:
+                list(pool.map(bind_meter(lambda batch: self._evaluate_batch(batch, cache)), batches))
+        elif batches:
+            self._evaluate_batch(batches[0], cache)
+        return sources
+
+    def _evaluate_batch(self, sources: list[dict], cache=None):
         source_list_str = "\n".join(f"- {s.get('title', 'No Title')}: {s['url']}" for s in sources)
 
         # --- LOGGING: Show reputability inputs ---
-        print("\n--- Reputability INPUT ---")
-        print(f"Sources to evaluate:\n{source_list_str}")
-        print("--------------------------\n")
+        logger.debug("Sources to evaluate:\n%s", source_list_str)
 
         messages = [
             {"role": "system", "content": "You are a media analyst. Evaluate a list of sources and return a JSON object with a 'source_evaluations' key. This key should contain a list of objects, where each object has 'url', 'reputability_score' (1-10, 10 is best), and a brief 'reputability_justification'."},
@@ -21,17 +70,20 @@ class ReputabilityAgent(BaseAgent):
         response = self._send_llm_request(messages)
         
         # --- LOGGING: Show reputability output ---
-        print("\n--- Reputability OUTPUT ---")
         if response and 'source_evaluations' in response:
-            print(f"Evaluations:\n{json.dumps(response['source_evaluations'], indent=2)}")
+            logger.debug("Evaluations:\n%s", LazyJson(response['source_evaluations'], indent=2))
         else:
-            print("No evaluations were generated or an error occurred.")
-        print("---------------------------\n")
+            logger.warning("No evaluations were generated or an error occurred.")
 
         evaluations = response.get('source_evaluations', []) if response else []
-        
-        eval_map = {e['url']: e for e in evaluations}
+        if len(evaluations) < len(sources):
+            logger.warning("Only %s of %s source(s) were evaluated.", len(evaluations), len(sources))
+
+        # An evaluation cut off by the token cap may have lost its score; leave that source unrated
+        eval_map = {e['url']: e for e in evaluations
+                    if isinstance(e, dict) and 'url' in e and 'reputability_score' in e}
         for source in sources:
             if source['url'] in eval_map:
                 source.update(eval_map[source['url']])
-        return sources
\ No newline at end of file
+                if cache is not None:
+                    cache.set(content_key(source['url']), eval_map[source['url']])
\ No newline at end of file
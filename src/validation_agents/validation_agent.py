@@ -1,62 +1,122 @@
 # src/validation_agents/validation_agent.py
-import json
+import threading
+import logging
 from Agents.base_agent import BaseAgent
+from Agents.output_schema import array, enum, obj, string
+from logging_config import LazyJson
 
-class ValidationAgent(BaseAgent):
-    """An agent that performs the final synthesis and validation for a SINGLE claim."""
-    
-    # --- METHOD SIGNATURE MODIFIED ---
-    def validate(self, claim: str, context: str, sources: list[dict]) -> dict | None:
-        """
-        Synthesizes information to produce a final verdict on a single claim.
-        """
-        print(f"Agent [Validation]: Now validating the claim: '{claim}'")
-        sources_str = json.dumps(sources, indent=2)
-
-        # --- LOGGING: Show validation inputs for this single claim ---
-        print("\n--- Validation Agent INPUT ---")
-        print(f"Claim to validate: {claim}")
-        print(f"Context length: {len(context)} characters.")
-        print("------------------------------\n")
-        
-        # --- CRITICAL CHANGE: Simplified prompt for a single claim ---
-        messages = [
-            {"role": "system", "content": "You are a meticulous, unbiased fact-checking engine. Your ONLY source of truth is the 'FULL CONTEXT FROM SOURCES' provided by the user. You MUST NOT use any external knowledge. Your task is to validate a single claim based ONLY on this provided text."},
-            {"role": "user", "content": f"""
-            Please validate the single claim below based *exclusively* on the provided context.
-
-            **CLAIM TO VALIDATE:**
-            "{claim}"
+logger = logging.getLogger(__name__)
 
-            **FULL CONTEXT FROM SOURCES (Your only source of truth):**
-            <context>
-            {context}
-            </context>
+SYSTEM_PROMPT = "You are a meticulous, unbiased fact-checking engine. Your ONLY source of truth is the 'FULL CONTEXT FROM SOURCES' provided by the user. You MUST NOT use any external knowledge. Your task is to validate a single claim based ONLY on this provided text."
 
+INSTRUCTIONS = """
             **INSTRUCTIONS (Follow these steps PRECISELY):**
             1.  Meticulously scan the text within the <context> tags to find relevant information for the claim.
             2.  Create a JSON object with the following keys:
-                - "claim": The original claim string: "{claim}".
+                - "claim": The original claim string, exactly as given.
                 - "conclusion": Your verdict. Must be one of: "SUPPORTED", "CONTRADICTED", or "INSUFFICIENT_INFORMATION".
                 - "summary": A brief explanation of your reasoning. Explain *why* the evidence supports or contradicts the claim, or why no information was found.
-                - "evidence": A list of direct, verbatim quotes from the context that support your conclusion. For each quote, you MUST include the source URL cited in the context block (e.g., "--- Source (URL: http://...) ---"). If no direct evidence is found, this MUST be an empty list [].
+                - "evidence": A list of direct, verbatim quotes from the context that support your conclusion, each as an object {"quote": "<verbatim quote>", "url": "<source URL>"}. The URL MUST be the one cited in the context block the quote comes from (e.g., "--- Source (URL: http://...) ---"). If no direct evidence is found, this MUST be an empty list [].
 
             **RULES:**
             - If you cannot find any supporting or contradicting text for the claim within the <context>, you MUST set the conclusion to "INSUFFICIENT_INFORMATION" and provide an empty evidence list.
             - Do not infer or speculate. Your analysis must be based entirely on the provided text.
 
             Produce only the single JSON object for this one claim. Do not wrap it in any other keys.
+            """
+
+class ValidationSession:
+    """
+    Validates many claims against one shared context.
+
+    The instructions and the context form a byte-identical prompt prefix for every
+    claim, marked with a cache-control hint, so provider-side prompt caching can
+    reuse it. Only the claim itself goes into the suffix.
+    """
+    def __init__(self, agent: "ValidationAgent", context, sources: list[dict], cache_hints: bool = True):
+        """context is the consolidated context string or the EvidenceStore it is rendered from."""
+        self.agent = agent
+        self.sources = sources
+        context_part = {"type": "text", "text": f"""
+            You will be asked to validate claims based *exclusively* on the context below.
+
+            **FULL CONTEXT FROM SOURCES (Your only source of truth):**
+            <context>
+            {context}
+            </context>
+            {INSTRUCTIONS}"""}
+        if cache_hints:
+            # Honored by providers with explicit prompt caching (e.g. Anthropic, Gemini via OpenRouter);
+            # providers with automatic prefix caching ignore it.
+            context_part["cache_control"] = {"type": "ephemeral"}
+        self.prefix = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": [context_part]},
+        ]
+        self.context_length = len(context)
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._lock = threading.Lock()
+
+    def _record_usage(self, usage):
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.cached_tokens += getattr(details, "cached_tokens", 0) or 0
+
+    def validate(self, claim: str) -> dict | None:
+        """Synthesizes information to produce a final verdict on a single claim."""
+        logger.info("Agent [Validation]: Now validating the claim: '%s'", claim)
+
+        # --- LOGGING: Show validation inputs for this single claim ---
+        logger.debug("Claim to validate: %s", claim)
+        logger.debug("Context length: %s characters.", self.context_length)
+
+        messages = self.prefix + [
+            {"role": "user", "content": f"""
+            Please validate the single claim below based *exclusively* on the provided context.
+
+            **CLAIM TO VALIDATE:**
+            "{claim}"
             """}
         ]
-        
-        response = self._send_llm_request(messages)
+
+        response = self.agent._send_llm_request(messages, usage_callback=self._record_usage)
 
         # --- LOGGING: Show final validation output for this single claim ---
-        print("\n--- Validation Agent OUTPUT ---")
         if response:
-            print(json.dumps(response, indent=2))
+            logger.debug("%s", LazyJson(response, indent=2))
         else:
-            print("Validation agent failed to produce a response for this claim.")
-        print("-------------------------------\n")
-        
+            logger.warning("Validation agent failed to produce a response for this claim.")
+
         return response
+
+    def cache_report(self) -> dict:
+        """Share of prompt tokens served from the provider's prompt cache in this session."""
+        with self._lock:
+            ratio = self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+            return {
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": round(ratio, 3)
+            }
+
+class ValidationAgent(BaseAgent):
+    """An agent that performs the final synthesis and validation for a SINGLE claim."""
+    output_schema = obj({
+        "claim": string(),
+        "conclusion": enum("SUPPORTED", "CONTRADICTED", "INSUFFICIENT_INFORMATION"),
+        "summary": string(),
+        "evidence": array(obj({"quote": string(), "url": string()})),
+    })
+    max_output_tokens = 700
+
+    def start_session(self, context, sources: list[dict]) -> ValidationSession:
+        """Opens a context session to validate several claims against the same sources."""
+        return ValidationSession(self, context, sources)
+
+    def validate(self, claim: str, context: str, sources: list[dict]) -> dict | None:
+        """
+        Synthesizes information to produce a final verdict on a single claim.
+        """
+        return self.start_session(context, sources).validate(claim)
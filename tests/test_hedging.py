@@ -0,0 +1,42 @@
+import threading
+import time
+
+from Agents.hedging import HedgingPolicy
+from Agents.rate_limiter import ProviderLimiter
+
+
+def _policy(latency: float) -> HedgingPolicy:
+    policy = HedgingPolicy({"enabled": True, "percentile": 50, "budget": 1.0, "min_samples": 1})
+    for _ in range(5):
+        policy._tracker("agent").add(latency)
+    policy._stats["agent"]["calls"] = 10
+    return policy
+
+
+def test_slow_call_is_hedged_and_the_faster_answer_wins():
+    policy = _policy(0.02)
+    calls = iter([0.5, 0.0])
+    assert policy.call("agent", lambda: time.sleep(next(calls)) or "done") == "done"
+    assert policy.stats()["agent"]["hedged"] == 1
+    assert policy.stats()["agent"]["hedge_wins"] == 1
+
+
+def test_time_queued_for_a_pool_thread_is_not_latency():
+    limiter = ProviderLimiter("busy", rpm=None, tpm=None, max_concurrency=1)
+    policy = _policy(0.05)
+    release = threading.Event()
+    executor = policy._executor_for(limiter)
+    blockers = [executor.submit(release.wait) for _ in range(executor._max_workers)]
+    threading.Timer(0.2, release.set).start()
+
+    assert policy.call("agent", lambda: time.sleep(0.01) or "done", limiter=limiter) == "done"
+    assert policy.stats()["agent"]["hedged"] == 0
+    assert all(blocker.result() for blocker in blockers)
+
+
+def test_no_hedge_while_the_provider_is_throttled():
+    limiter = ProviderLimiter("throttled", rpm=None, tpm=None, max_concurrency=4)
+    limiter.block_for(60)
+    policy = _policy(0.01)
+    assert policy.call("agent", lambda: time.sleep(0.05) or "done", limiter=limiter) == "done"
+    assert policy.stats()["agent"]["hedged"] == 0
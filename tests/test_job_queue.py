@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "queue.sqlite3"), lease_seconds=60)
+
+
+def _expire_lease(queue, job_id):
+    with queue._connect() as conn:
+        conn.execute("UPDATE jobs SET lease_expires = ? WHERE job_id = ?", (time.time() - 1, job_id))
+
+
+def test_deferred_job_keeps_its_attempt_and_is_held_off(queue):
+    job_id = queue.enqueue("deck.pdf", max_attempts=2)
+    queue.claim("a")
+    _expire_lease(queue, job_id)
+    assert queue.claim("b")["job_id"] == job_id
+
+    assert queue.defer(job_id, "b", "Job is already being analyzed by another run")
+    job = queue.get(job_id)
+    assert job["status"] == "queued"
+    assert job["attempts"] == 1
+    assert queue.claim("c") is None
+
+
+def test_original_worker_takes_back_and_completes_a_deferred_job(queue):
+    job_id = queue.enqueue("deck.pdf")
+    queue.claim("a")
+    _expire_lease(queue, job_id)
+    queue.claim("b")
+    assert not queue.heartbeat(job_id, "a")
+
+    queue.defer(job_id, "b", "locked")
+    assert queue.heartbeat(job_id, "a")
+    assert not queue.complete(job_id, "b", "other.json")
+    assert queue.complete(job_id, "a", "report.json")
+    job = queue.get(job_id)
+    assert (job["status"], job["worker_id"], job["report_path"]) == ("done", "a", "report.json")
+
+
+def test_failed_job_is_retried_until_attempts_run_out(queue):
+    job_id = queue.enqueue("deck.pdf", max_attempts=2)
+    queue.claim("a")
+    queue.fail(job_id, "a", "boom")
+    assert queue.get(job_id)["status"] == "queued"
+    queue.claim("a")
+    queue.fail(job_id, "a", "boom")
+    assert queue.get(job_id)["status"] == "failed"
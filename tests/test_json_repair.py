@@ -0,0 +1,44 @@
+from Agents.json_repair import parse_json_lenient, repair_json
+
+
+def test_valid_json_is_not_marked_repaired():
+    assert parse_json_lenient('{"claims": ["x"]}') == ({"claims": ["x"]}, False)
+
+
+def test_code_fences_and_trailing_commas_are_removed():
+    value, repaired = parse_json_lenient('```json\n{"claims": ["x", "y",],}\n```')
+    assert value == {"claims": ["x", "y"]}
+    assert repaired
+
+
+def test_truncated_string_element_is_dropped_not_closed():
+    value, repaired = parse_json_lenient('{"claims": ["x", "y')
+    assert value == {"claims": ["x"]}
+    assert repaired
+
+
+def test_truncated_number_inside_a_string_is_not_kept():
+    value, _ = parse_json_lenient('{"claims": ["Revenue grew 3x", "We raised $4')
+    assert value == {"claims": ["Revenue grew 3x"]}
+
+
+def test_truncated_member_is_dropped_but_complete_members_are_kept():
+    value, _ = parse_json_lenient('{"conclusion": "SUPPORTED", "summary": "The report sta')
+    assert value == {"conclusion": "SUPPORTED"}
+    value, _ = parse_json_lenient('{"conclusion": "SUPPORTED", "summary"')
+    assert value == {"conclusion": "SUPPORTED"}
+
+
+def test_truncated_bare_number_is_dropped():
+    value, _ = parse_json_lenient('{"scores": [7, 8, 1')
+    assert value == {"scores": [7, 8]}
+
+
+def test_complete_nested_members_survive_truncation():
+    value, _ = parse_json_lenient('{"source_evaluations": [{"url": "a", "reputability_score": 8}, {"url": "b", "rep')
+    assert value == {"source_evaluations": [{"url": "a", "reputability_score": 8}, {"url": "b"}]}
+
+
+def test_text_without_json_is_rejected():
+    assert repair_json("no json here") is None
+    assert parse_json_lenient("no json here") == (None, False)
@@ -0,0 +1,30 @@
+import sqlite3
+
+from market_insight_agents.market_knowledge_base import MarketKnowledgeBase, normalize_region
+
+SIZE = {"TAM": "$10B", "SAM": "$2B", "SOM": "$100M", "classification": "Large"}
+
+
+def test_spelling_variants_share_an_entry_but_sub_segments_do_not(tmp_path):
+    kb = MarketKnowledgeBase(str(tmp_path / "kb.sqlite3"))
+    assert kb.put("size", "FinTech", SIZE)
+    assert kb.get("size", "Financial Technology (FinTech)") == SIZE
+    assert kb.get("size", "Payments") is None
+    assert kb.get("size", "Neobank") is None
+    assert kb.normalize_segment("Generative AI") != kb.normalize_segment("AI")
+    assert normalize_region("EMEA") != normalize_region("Europe")
+    assert normalize_region("Asia") != normalize_region("APAC")
+
+
+def test_entries_filed_under_an_old_synonym_are_dropped(tmp_path):
+    path = str(tmp_path / "kb.sqlite3")
+    kb = MarketKnowledgeBase(path)
+    kb.put("size", "FinTech", SIZE)
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO market_facts VALUES ('size', 'fintech', 'global', 1, 'Payments', 'Global', ?, "
+                     "NULL, 0, 0)", ('{"TAM": "$1B"}',))
+    conn.close()
+
+    kb = MarketKnowledgeBase(path)
+    assert kb.stats()["entries"] == {"size": 1}
+    assert kb.get("size", "FinTech") == SIZE
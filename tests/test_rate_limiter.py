@@ -0,0 +1,232 @@
+import threading
+import types
+
+import pytest
+
+from Agents import rate_limiter
+from Agents.rate_limiter import (AdaptiveConcurrencyLimit, ProviderLimiter, RateLimitedError, TokenBucket,
+                                 TokenMeter, bind_meter, classify_error, estimate_tokens, metered,
+                                 retry_after_seconds)
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep so the tests never actually wait."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", types.SimpleNamespace(monotonic=fake.monotonic, sleep=fake.sleep))
+    monkeypatch.setattr(rate_limiter.random, "random", lambda: 0.5)
+    return fake
+
+
+class HttpError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = types.SimpleNamespace(status_code=status, headers=headers or {})
+
+
+def test_bucket_serves_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4.0)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.slept == []
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_bucket_adjust_refunds_overestimates(clock):
+    bucket = TokenBucket(rate=1.0, capacity=10.0)
+    bucket.acquire(8)
+    bucket.adjust(-6)  # only 2 of the 8 reserved tokens were used
+    bucket.acquire(8)
+    assert clock.slept == []
+
+
+def test_bucket_never_refills_beyond_capacity(clock):
+    bucket = TokenBucket(rate=100.0, capacity=3.0)
+    clock.now += 60
+    for _ in range(3):
+        bucket.acquire()
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(0.01)]
+
+
+def test_aimd_grows_additively_and_backs_off_multiplicatively():
+    limit = AdaptiveConcurrencyLimit(initial=4, maximum=8)
+    for _ in range(20):
+        limit.acquire()
+        limit.release(latency=1.0, outcome="ok")
+    assert 5 <= limit.limit <= 8
+
+    before = limit.limit
+    limit.acquire()
+    limit.release(latency=1.0, outcome="rate_limited")
+    assert limit.limit == max(1, int(before * 0.5)) or limit.limit == int(before * 0.5 + 0.5)
+    assert limit.limit < before
+
+
+def test_aimd_respects_bounds():
+    limit = AdaptiveConcurrencyLimit(initial=2, minimum=1, maximum=3)
+    for _ in range(10):
+        limit.acquire()
+        limit.release(1.0, "rate_limited")
+    assert limit.limit == 1
+    for _ in range(200):
+        limit.acquire()
+        limit.release(1.0, "ok")
+    assert limit.limit == 3
+
+
+def test_aimd_backs_off_on_latency_well_above_baseline():
+    limit = AdaptiveConcurrencyLimit(initial=10, maximum=10)
+    limit.acquire()
+    limit.release(1.0, "ok")
+    before = limit._limit
+    limit.acquire()
+    limit.release(5.0, "ok")
+    assert limit._limit == pytest.approx(before * 0.9)
+
+
+def test_aimd_blocks_callers_above_the_limit():
+    limit = AdaptiveConcurrencyLimit(initial=1, maximum=1)
+    limit.acquire()
+    entered = threading.Event()
+
+    def second():
+        limit.acquire()
+        entered.set()
+
+    thread = threading.Thread(target=second, daemon=True)
+    thread.start()
+    assert not entered.wait(0.05)
+    limit.release(0.1, "ok")
+    assert entered.wait(1)
+
+
+def test_classify_error():
+    assert classify_error(HttpError(429)) == "rate_limited"
+    assert classify_error(Exception("Too Many Requests")) == "rate_limited"
+    assert classify_error(HttpError(503)) == "transient"
+    assert classify_error(type("ReadTimeout", (Exception,), {})()) == "transient"
+    assert classify_error(HttpError(400)) == "fatal"
+
+
+def test_retry_after_header():
+    assert retry_after_seconds(HttpError(429, {"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(HttpError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(HttpError(429)) is None
+
+
+def test_call_retries_rate_limits_after_retry_after(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+    outcomes = [HttpError(429, {"retry-after": "2"}), "ok"]
+
+    def fn():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert limiter.call(fn) == "ok"
+    assert limiter.stats["rate_limited"] == 1 and limiter.stats["retries"] == 1
+    assert sum(clock.slept) >= 2.0
+
+
+def test_limiter_reports_throttling_after_a_rate_limit(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+    assert not limiter.throttled()
+    outcomes = [HttpError(429, {"retry-after": "2"}), "ok"]
+
+    def fn():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    limiter.call(fn)
+    assert limiter.throttled()
+    clock.now += 61
+    assert not limiter.throttled()
+
+
+def test_call_gives_up_with_rate_limited_error(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+
+    def fn():
+        raise HttpError(429)
+
+    with pytest.raises(RateLimitedError):
+        limiter.call(fn, max_retries=2)
+    assert limiter.stats["calls"] == 3
+
+
+def test_call_does_not_retry_fatal_errors(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise HttpError(400)
+
+    with pytest.raises(HttpError):
+        limiter.call(fn)
+    assert len(calls) == 1
+
+
+def test_call_counts_actual_tokens(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=6000, max_concurrency=4)
+    limiter.call(lambda: {"used": 120}, estimated_tokens=500, usage_tokens=lambda r: r["used"])
+    limiter.call(lambda: None, estimated_tokens=300)
+    assert limiter.stats["tokens"] == 420
+
+
+def test_meters_only_count_their_own_calls(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+    first, second = TokenMeter(), TokenMeter()
+    with metered(first):
+        limiter.call(lambda: None, estimated_tokens=100)
+        call_elsewhere = bind_meter(lambda: limiter.call(lambda: None, estimated_tokens=50))
+    with metered(second):
+        limiter.call(lambda: None, estimated_tokens=7)
+
+    thread = threading.Thread(target=call_elsewhere)
+    thread.start()
+    thread.join()
+    limiter.call(lambda: None, estimated_tokens=1000)
+    assert (first.tokens, second.tokens) == (150, 7)
+
+
+def test_stream_holds_its_slot_until_closed(clock):
+    limiter = ProviderLimiter("test", rpm=None, tpm=None, max_concurrency=4)
+    stream = limiter.stream(lambda: iter(["a", "b", "c"]), estimated_tokens=10)
+    assert next(stream) == "a"
+    assert limiter.concurrency._in_flight == 1
+    stream.close()
+    assert limiter.concurrency._in_flight == 0
+
+    assert list(limiter.stream(lambda: iter(["a", "b"]))) == ["a", "b"]
+    assert limiter.concurrency._in_flight == 0
+    assert limiter.stats["tokens"] == 10
+
+
+def test_estimate_tokens_counts_images():
+    text_only = estimate_tokens([{"role": "user", "content": "x" * 400}], max_output_tokens=0)
+    with_image = estimate_tokens([{"role": "user", "content": [
+        {"type": "text", "text": "x" * 400}, {"type": "image_url", "image_url": {"url": "data:..."}}
+    ]}], max_output_tokens=0)
+    assert text_only == 100
+    assert with_image == 1100
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from report_journal import ReportJournal, JournalLockedError
+
+
+def test_record_and_load_roundtrip(tmp_path):
+    journal = ReportJournal("deck_abc", journal_dir=str(tmp_path))
+    journal.record("context", {"document_context": "ctx"})
+    journal.record("page:0", {"page_number": 1, "status": "Analyzed"})
+
+    loaded = ReportJournal("deck_abc", journal_dir=str(tmp_path)).load()
+    assert loaded.get("context") == {"document_context": "ctx"}
+    assert loaded.is_complete("page:0")
+    assert loaded.page_count() == 1
+
+
+def test_later_entries_win(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("page:0", {"status": "Error"})
+    journal.record("page:0", {"status": "Analyzed"})
+    assert ReportJournal("deck", journal_dir=str(tmp_path)).load().get("page:0") == {"status": "Analyzed"}
+
+
+def test_torn_last_line_is_truncated(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("context", {"document_context": "ctx"})
+    size = os.path.getsize(journal.path)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"unit": "page:0", "data": {"sta')
+
+    loaded = ReportJournal("deck", journal_dir=str(tmp_path)).load()
+    assert loaded.get("page:0") is None
+    assert loaded.is_complete("context")
+    assert os.path.getsize(journal.path) == size
+
+
+def test_read_only_load_skips_a_torn_line_without_rewriting(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("context", {"document_context": "ctx"})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"unit": "page:0", "data": {"sta')
+    size = os.path.getsize(journal.path)
+
+    loaded = ReportJournal("deck", journal_dir=str(tmp_path)).load(repair=False)
+    assert loaded.get("page:0") is None
+    assert loaded.is_complete("context")
+    assert os.path.getsize(journal.path) == size
+
+
+@pytest.mark.parametrize("status", ["error", "Error", "Failed", "Not checked"])
+def test_failed_units_are_not_complete(tmp_path, status):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("page:3", {"status": status})
+    assert not journal.is_complete("page:3")
+    assert not journal.is_complete("page:4")
+
+
+def test_pages_with_not_checked_claims_are_not_complete(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("page:0", {"status": "Analyzed", "validation_results": {"validation_results": [
+        {"claim": "ARR is $2M", "conclusion": "SUPPORTED"}, {"claim": "50 customers", "conclusion": "NOT_CHECKED"}
+    ]}})
+    journal.record("page:1", {"status": "Analyzed", "validation_results": [
+        {"claim": "Team of 12", "conclusion": "SUPPORTED"}
+    ]})
+    assert not journal.is_complete("page:0")
+    assert journal.is_complete("page:1")
+
+
+def test_reset_discards_previous_journal(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("context", {"document_context": "ctx"})
+    journal.reset()
+    assert not os.path.exists(journal.path)
+    assert ReportJournal("deck", journal_dir=str(tmp_path)).load().get("context") is None
+
+
+def test_assemble_orders_pages_and_marks_missing(tmp_path):
+    journal = ReportJournal("deck", journal_dir=str(tmp_path))
+    journal.record("page:1", {"page_number": 2, "status": "Analyzed"})
+    journal.record("market_insights", {"segment": "fintech"})
+    journal.record("budget", None)
+
+    report = journal.assemble(2)
+    assert [p["status"] for p in report["document_validation"]] == ["Missing", "Analyzed"]
+    assert report["market_insights"] == {"segment": "fintech"}
+    assert "budget" not in report
+
+
+def test_second_run_of_the_same_job_fails_fast(tmp_path):
+    first = ReportJournal("deck", journal_dir=str(tmp_path))
+    second = ReportJournal("deck", journal_dir=str(tmp_path))
+    with first:
+        with pytest.raises(JournalLockedError):
+            second.acquire()
+    # Released: the next run may take over
+    with second:
+        pass
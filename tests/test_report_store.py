@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+from report_store import ReportStore
+
+
+def _report(segment="FinTech", region="Europe", conclusions=("SUPPORTED", "CONTRADICTED")):
+    return {
+        "market_insights": {"status": "success", "data": {
+            "region": region,
+            "segment_analysis": {"segment": segment, "sub_segments": ["Payments"], "keywords": ["cards"]},
+        }},
+        "competitor_research": {"data": {"similar_companies": ["Acme Pay"]}},
+        "document_validation": [{
+            "page_number": 1,
+            "validation_results": [{"claim": f"Claim {i} about revenue", "conclusion": c, "summary": "s"}
+                                   for i, c in enumerate(conclusions)],
+        }],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(str(tmp_path / "index.sqlite3"))
+
+
+def test_region_is_read_from_the_market_section(store):
+    store.ingest(_report(region="Europe"), "deck_a_20250101_120000")
+    store.ingest(_report(region="United States"), "deck_b_20250102_120000")
+
+    assert [r["report_id"] for r in store.search(region="europe")] == ["deck_a_20250101_120000"]
+    assert store.search(region="europe")[0]["region"] == "Europe"
+
+
+def test_reports_without_a_region_are_not_labelled_global(store):
+    report = _report()
+    del report["market_insights"]["data"]["region"]
+    store.ingest(report, "old_deck_20240101_120000")
+    assert store.search()[0]["region"] is None
+    assert store.search(region="Global") == []
+
+
+def test_filters_and_full_text(store):
+    store.ingest(_report(conclusions=("SUPPORTED",)), "deck_a_20250101_120000")
+    store.ingest(_report(segment="HealthTech", conclusions=("CONTRADICTED",)), "deck_b_20250102_120000")
+
+    assert [r["report_id"] for r in store.search(conclusion="contradicted")] == ["deck_b_20250102_120000"]
+    assert [r["report_id"] for r in store.search(segment="fintech")] == ["deck_a_20250101_120000"]
+    assert len(store.search(competitor="acme pay")) == 2
+    hits = store.search(text="revenu")
+    assert len(hits) == 2 and all(hit["matches"] for hit in hits)
+
+
+def test_reingest_replaces_previous_version(store):
+    store.ingest(_report(conclusions=("SUPPORTED", "SUPPORTED")), "deck_20250101_120000")
+    store.ingest(_report(conclusions=("CONTRADICTED",)), "deck_20250101_120000")
+    (row,) = store.search()
+    assert (row["claims_total"], row["claims_supported"], row["claims_contradicted"]) == (1, 0, 1)
+
+
+def test_connections_are_closed(store, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *a, **kw: opened.append(connect(*a, **kw)) or opened[-1])
+
+    store.ingest(_report(), "deck_20250101_120000")
+    store.search(text="revenue")
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,20 @@
+import pytest
+
+from document_agents.slide_cache import SlideTranscriptionCache, text_hash
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SlideTranscriptionCache(str(tmp_path / "slides.sqlite3"), max_distance=3)
+
+
+def test_near_duplicate_render_hits_for_the_same_text_layer(cache):
+    cache.store(0xF0F0F0F0F0F0F0F0, text_hash("Revenue  $40M\nARR"), "m/v1", "Revenue $40M ARR")
+    assert cache.lookup(0xF0F0F0F0F0F0F0F3, text_hash("Revenue $40M ARR"), "m/v1") == "Revenue $40M ARR"
+    assert cache.lookup(0xF0F0F0F0F0F0F0F3, text_hash("Revenue $45M ARR"), "m/v1") is None
+
+
+def test_slides_without_text_need_an_exact_match(cache):
+    cache.store(0xF0F0F0F0F0F0F0F0, text_hash(""), "m/v1", "Chart: revenue $40M")
+    assert cache.lookup(0xF0F0F0F0F0F0F0F1, text_hash(None), "m/v1", max_distance=0) is None
+    assert cache.lookup(0xF0F0F0F0F0F0F0F0, text_hash(None), "m/v1", max_distance=0) == "Chart: revenue $40M"